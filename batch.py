@@ -0,0 +1,199 @@
+"""커플 출생 정보 파일을 읽어 궁합 점수를 스트리밍으로 기록하는 배치 CLI
+
+실행: python -m batch couples.csv -o scores.jsonl --workers 8 [--resume] [--with-llm]
+
+입력(CSV 또는 JSONL) 열: name1, date1(YYYY-MM-DD), time1(HH:MM), city1,
+name2, date2, time2, city2, 그리고 선택적으로 id.
+지오코딩/타임존은 캐시를 가진 메인 프로세스에서, 차트 계산은 프로세스 풀에서 한다.
+결과는 입력 순서대로 바로 기록되며 체크포인트(<출력>.ckpt)로 중단 지점부터 재개할 수 있다.
+Streamlit은 임포트하지 않는다.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import date
+
+from kuta_table import KUTA_NAMES
+from vedic_core import (
+    calculate_ashta_kuta, calculate_chart, get_location_coordinates, get_timezone,
+    parse_birth_time,
+)
+
+FIELDS = (
+    ["row", "id", "name1", "name2", "total"] + KUTA_NAMES
+    + ["ascendant1", "moon_sign1", "nakshatra1", "ascendant2", "moon_sign2", "nakshatra2",
+       "interpretation", "error"]
+)
+
+
+def read_rows(path, fmt):
+    """입력 파일을 한 줄씩 읽어 dict로 돌려준다 ("-"는 표준입력)"""
+    f = sys.stdin if path == "-" else open(path, encoding="utf-8-sig", newline="")
+    try:
+        if fmt == "jsonl":
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from csv.DictReader(f)
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def prepare_person(row, n):
+    """입력 행의 n번째 사람 → calculate_chart 인자 (이름, 년, 월, 일, 시, 분, 위도, 경도, 타임존)"""
+    name = (row.get(f"name{n}") or "").strip()
+    city = (row.get(f"city{n}") or "").strip()
+    birth = date.fromisoformat(str(row[f"date{n}"]).strip())
+    hour, minute = parse_birth_time(str(row[f"time{n}"]))
+    lat, lon, _ = get_location_coordinates(city)
+    if lat is None:
+        raise ValueError(f"'{city}' 위치를 찾을 수 없습니다")
+    return (name, birth.year, birth.month, birth.day, hour, minute, lat, lon, get_timezone(lat, lon))
+
+
+def score_couple(task):
+    """워커 프로세스에서 두 사람의 차트와 궁합 점수를 계산"""
+    result = {"row": task["row"], "id": task["id"]}
+    try:
+        chart1 = calculate_chart(*task["person1"])
+        chart2 = calculate_chart(*task["person2"])
+        scores, total = calculate_ashta_kuta(chart1, chart2)
+        result.update(name1=chart1["name"], name2=chart2["name"], total=total, **scores)
+        for n, chart in ((1, chart1), (2, chart2)):
+            result[f"ascendant{n}"] = chart["ascendant"]
+            result[f"moon_sign{n}"] = chart["moon_sign"]
+            result[f"nakshatra{n}"] = chart["nakshatra"]
+        if task["with_llm"]:
+            import interpretation_cache
+            result["interpretation"] = interpretation_cache.interpret(
+                chart1, chart2, scores, total, chart1["name"], chart2["name"],
+                api_key=os.environ.get("OPENAI_API_KEY"),
+            )
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    return result
+
+
+class ResultWriter:
+    """결과를 JSONL/CSV로 이어 쓰고 체크포인트(처리한 입력 행 수, 출력 바이트 위치)를 남긴다"""
+
+    def __init__(self, path, fmt, resume):
+        self.path = path
+        self.fmt = fmt
+        self.checkpoint_path = path + ".ckpt"
+        self.rows_done = 0
+        offset = None
+        if resume and os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path, encoding="utf-8") as f:
+                state = json.load(f)
+            self.rows_done, offset = state["rows"], state["offset"]
+        if offset is not None and os.path.exists(path):
+            # 체크포인트 이후에 쓰다 만 결과는 버리고 이어 쓴다
+            os.truncate(path, offset)
+            self.file = open(path, "a", encoding="utf-8", newline="")
+        else:
+            self.file = open(path, "w", encoding="utf-8", newline="")
+        if fmt == "csv":
+            self.csv = csv.DictWriter(self.file, fieldnames=FIELDS, extrasaction="ignore")
+            if self.file.tell() == 0:
+                self.csv.writeheader()
+
+    def write(self, result):
+        if self.fmt == "csv":
+            self.csv.writerow(result)
+        else:
+            self.file.write(json.dumps(result, ensure_ascii=False) + "\n")
+        self.rows_done += 1
+
+    def checkpoint(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        tmp = self.checkpoint_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"rows": self.rows_done, "offset": self.file.tell()}, f)
+        os.replace(tmp, self.checkpoint_path)
+
+    def close(self):
+        self.checkpoint()
+        self.file.close()
+
+
+def _format_of(path, default):
+    ext = os.path.splitext(path)[1].lower()
+    return {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}.get(ext, default)
+
+
+def run(args):
+    in_fmt = args.input_format or _format_of(args.input, "csv")
+    out_fmt = args.output_format or _format_of(args.output, "jsonl")
+    writer = ResultWriter(args.output, out_fmt, args.resume)
+    skip = writer.rows_done
+
+    pool = ProcessPoolExecutor(max_workers=args.workers) if args.workers > 0 else None
+    # 입력 순서대로 기록하기 위한 대기열 - 길이를 제한해 메모리 사용량을 일정하게 유지
+    pending = deque()
+    max_pending = max(args.workers, 1) * 4
+
+    def drain(limit):
+        while len(pending) > limit:
+            item = pending.popleft()
+            writer.write(item.result() if pool else item)
+            if writer.rows_done % args.checkpoint_every == 0:
+                writer.checkpoint()
+                print(f"{writer.rows_done}행 처리", file=sys.stderr)
+
+    try:
+        for idx, row in enumerate(read_rows(args.input, in_fmt)):
+            if idx < skip:
+                continue
+            task = {"row": idx, "id": row.get("id"), "with_llm": args.with_llm}
+            try:
+                task["person1"] = prepare_person(row, 1)
+                task["person2"] = prepare_person(row, 2)
+            except Exception as e:
+                result = {"row": idx, "id": task["id"], "name1": row.get("name1"),
+                          "name2": row.get("name2"), "error": f"{type(e).__name__}: {e}"}
+                pending.append(_done(result) if pool else result)
+            else:
+                pending.append(pool.submit(score_couple, task) if pool else score_couple(task))
+            drain(max_pending)
+        drain(0)
+    finally:
+        if pool:
+            pool.shutdown(cancel_futures=True)
+        writer.close()
+    print(f"완료: {writer.rows_done}행 → {args.output}", file=sys.stderr)
+
+
+def _done(result):
+    future = Future()
+    future.set_result(result)
+    return future
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("input", help="입력 CSV/JSONL 경로 (- 는 표준입력)")
+    parser.add_argument("-o", "--output", required=True, help="출력 JSONL/CSV 경로")
+    parser.add_argument("--input-format", choices=["csv", "jsonl"])
+    parser.add_argument("--output-format", choices=["csv", "jsonl"])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="차트 계산 프로세스 수 (0이면 메인 프로세스에서 계산)")
+    parser.add_argument("--checkpoint-every", type=int, default=100, help="이 행 수마다 체크포인트 저장 (1 이상)")
+    parser.add_argument("--resume", action="store_true", help="체크포인트 이후부터 이어서 처리")
+    parser.add_argument("--with-llm", action="store_true",
+                        help="OpenAI 해석 포함 (OPENAI_API_KEY 환경변수 필요)")
+    args = parser.parse_args(argv)
+    if args.checkpoint_every < 1:
+        parser.error("--checkpoint-every 는 1 이상이어야 합니다")
+    run(args)
+
+
+if __name__ == "__main__":
+    main()
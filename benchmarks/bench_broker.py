@@ -0,0 +1,283 @@
+"""외부 호출 중개(broker) 부하 시험 - 로컬 Nominatim/OpenAI 스텁 서버 대상
+
+실행: python -m benchmarks.bench_broker [--sessions 4] [--scale 10] [--waves 5]
+- 스텁 Nominatim은 초당 --nominatim-limit 개를 넘는 요청을, 모의 OpenAI는 동시 --openai-limit 개를
+  넘는 요청을 429로 거절한다 (실제 서비스의 이용 정책/속도 제한 흉내).
+- 세션 요청 하나 = 출생 도시 지오코딩 + 해석 스트림 끝까지 읽기. 매 물결마다 모든 세션이 동시에
+  요청하고, 일부 세션은 같은 도시/같은 차트 조합을 고른다 (모두가 "Seoul"을 치는 상황).
+- 현재 동시 세션 수(--sessions)와 그 --scale 배에서, 중개 없이 바로 호출할 때와 중개를 거칠 때의
+  지연 p50/p95/p99, 혼잡(busy) 응답 수와 지연, 업스트림 요청/429/최대 동시 처리 수를 비교한다.
+먼저 single-flight 합류와, 동시 호출 자리가 느린 스트림으로 모두 찼을 때 혼잡 응답이
+바로 오는지(속도 제한 토큰 반납 포함) 확인한다. 중개를 거친 --scale 배 부하에서 다음 중 하나라도
+해당하면 종료 코드 1로 끝난다.
+  - 업스트림 429나 오류가 있다.
+  - 성공한 요청의 p99가 기준 부하 p99 + 대기 예산(업스트림별 max_wait 합)을 넘는다.
+  - 뒤쪽 물결의 p95가 앞쪽보다 --max-drift 배 넘게 늘어난다 (대기열이 쌓임).
+  - 혼잡 응답 p99가 --max-busy-ms 를 넘는다.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+API_KEY = "sk-load"
+SYSTEM = "You are a master of Vedic Astrology (Jyotish)."
+USER = "【가의 차트】【나의 차트】 총점: 72/100"
+
+# 스텁 서버 한도에 맞춘 중개 설정 (실서비스 기본값은 broker.DEFAULTS)
+NOMINATIM = {"rate": 6.0, "burst": 3, "concurrency": 4, "queue": 8, "max_wait": 1.0}
+OPENAI = {"rate": 20.0, "burst": 8, "concurrency": 6, "queue": 10, "max_wait": 1.5}
+
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, max(0, round(q / 100 * len(values) + 0.5) - 1))]
+
+
+def session_request(wave, key):
+    """(결과, 지연 초) - 결과는 ok/busy/error"""
+    import broker
+    import geocoding
+    import llm
+
+    start = time.perf_counter()
+    try:
+        lat, _, _ = geocoding.get_location_coordinates(f"Town {wave}-{key}")
+    except broker.BusyError:
+        return "busy", time.perf_counter() - start
+    if lat is None:
+        return "error", time.perf_counter() - start
+    timings = {}
+    for _ in llm.stream_messages(SYSTEM, f"{USER} #{wave}-{key}", API_KEY, timings):
+        pass
+    outcome = "busy" if timings.get("busy") else "error" if "error" in timings else "ok"
+    return outcome, time.perf_counter() - start
+
+
+def run_load(sessions, base, waves, period, servers):
+    """물결 waves번 - 각 물결에서 sessions개 요청을 동시에"""
+    import geocoding
+
+    nominatim, openai_server = servers
+    before = [(s.requests, s.rejected) for s in servers]
+    nominatim.peak = openai_server.peak = 0
+    # 기준 부하는 세션마다 다른 키, 늘어난 세션은 넷 중 셋이 기존 키에 합류
+    distinct = base + (sessions - base) // 4
+    results = []
+    with ThreadPoolExecutor(max_workers=sessions) as executor:
+        for wave in range(waves):
+            geocoding.clear_caches()
+            started = time.perf_counter()
+            futures = [executor.submit(session_request, wave, i % distinct) for i in range(sessions)]
+            results += [(wave,) + f.result() for f in futures]
+            time.sleep(max(0.0, period - (time.perf_counter() - started)))
+    ok = [t for _, outcome, t in results if outcome == "ok"]
+    busy = [t for _, outcome, t in results if outcome == "busy"]
+    half = waves // 2
+    return {
+        "requests": len(results),
+        "ok": len(ok),
+        "busy": len(busy),
+        "error": sum(1 for _, outcome, _ in results if outcome == "error"),
+        "p50": percentile(ok, 50), "p95": percentile(ok, 95), "p99": percentile(ok, 99),
+        "busy_p99": percentile(busy, 99),
+        "early_p95": percentile([t for w, o, t in results if o == "ok" and w < half], 95),
+        "late_p95": percentile([t for w, o, t in results if o == "ok" and w >= waves - half], 95),
+        "upstream": [(s.requests - r, s.rejected - j, s.peak) for s, (r, j) in zip(servers, before)],
+    }
+
+
+def check_coalescing(openai_server):
+    """동시에 들어온 같은 요청 → 업스트림 1회, 모두 같은 결과"""
+    import broker
+    import llm
+
+    problems = []
+    chart = {"ascendant": "-", "moon_sign": "-", "nakshatra": "-", "sun_sign": "-", "rahu": "-", "ketu": "-"}
+    scores = {k: 1 for k in ["바르나", "바쉬야", "타라", "요니", "그라하 마이트리", "가나", "바쿠트", "나디"]}
+    before = openai_server.requests
+    barrier = threading.Barrier(12)
+
+    def complete():
+        barrier.wait()
+        return llm.analyze_with_openai(chart, chart, scores, 64, "가", "나", API_KEY)
+
+    with ThreadPoolExecutor(max_workers=12) as executor:
+        texts = list(executor.map(lambda _: complete(), range(12)))
+    if len(set(texts)) != 1 or openai_server.requests - before != 1:
+        problems.append(f"analyze_with_openai 합류 실패: 결과 {len(set(texts))}종, 업스트림 {openai_server.requests - before}회")
+
+    before = openai_server.requests
+    barrier = threading.Barrier(12)
+
+    def stream():
+        barrier.wait()
+        return "".join(llm.stream_messages(SYSTEM, USER + " #coalesce", API_KEY))
+
+    with ThreadPoolExecutor(max_workers=12) as executor:
+        texts = list(executor.map(lambda _: stream(), range(12)))
+    if len(set(texts)) != 1 or openai_server.requests - before != 1 or texts[0].startswith(("❌", "⏳")):
+        problems.append(f"스트림 합류 실패: 결과 {len(set(texts))}종, 업스트림 {openai_server.requests - before}회")
+
+    # 같은 스트림을 읽던 선두가 중간에 그만두면 합류한 요청은 혼잡으로 끝난다
+    upstream = broker.get("openai")
+    gate = threading.Event()
+
+    def slow():
+        yield "a"
+        gate.wait(5)
+        yield "b"
+
+    leader = upstream.coalesce_stream("k", slow)
+    next(leader)
+    follower_result = []
+    follower = threading.Thread(target=lambda: follower_result.append(_drain(upstream.coalesce_stream("k", slow))))
+    follower.start()
+    time.sleep(0.05)
+    leader.close()
+    gate.set()
+    follower.join(5)
+    if follower_result != ["busy"]:
+        problems.append(f"중단된 선두 처리 실패: {follower_result}")
+    return problems
+
+
+def check_fast_busy(max_busy_ms):
+    """동시 호출 자리가 모두 느린 스트림에 잡혀 있을 때 새 요청이 기다리지 않고 혼잡을 받는지
+
+    (1) 아직 끝난 호출이 없고 보유 시간이 이미 max_wait를 넘긴 경우, (2) 끝난 호출의 평균 보유
+    시간이 max_wait보다 긴데 새 스트림들이 막 시작한 경우 - 둘 다 혼잡 응답이 max_busy_ms 안에 와야 한다.
+    (3) 자리를 기다리다 시간이 다 된 요청은 예약했던 속도 제한 토큰을 돌려줘야 한다.
+    """
+    import broker
+
+    problems = []
+    upstream = broker.Upstream("probe", rate=0, concurrency=2, queue=8, max_wait=0.3)
+
+    def hold(release):
+        with upstream.slot():
+            release.wait(5)
+
+    def time_to_busy(n=6):
+        waits = []
+        for _ in range(n):
+            start = time.perf_counter()
+            try:
+                with upstream.slot():
+                    pass
+                waits.append(None)
+            except broker.BusyError:
+                waits.append((time.perf_counter() - start) * 1000)
+        return waits
+
+    for label, settle in (("끝난 호출 없음", 0.4), ("평균 보유 시간", 0.0)):
+        release = threading.Event()
+        holders = [threading.Thread(target=hold, args=(release,)) for _ in range(upstream.concurrency)]
+        for holder in holders:
+            holder.start()
+        time.sleep(0.05 + settle)
+        waits = time_to_busy()
+        release.set()
+        for holder in holders:
+            holder.join()
+        print(f"혼잡까지 걸린 시간 ({label}): " + ", ".join("통과" if w is None else f"{w:.2f}" for w in waits) + " ms")
+        if any(w is None or w > max_busy_ms for w in waits):
+            problems.append(f"자리가 찼을 때 바로 혼잡이 아님 ({label}): {waits}")
+
+    # 평균 보유 시간이 짧아 받아들였지만 자리를 못 얻은 요청 - 토큰을 돌려줘야 한다
+    upstream = broker.Upstream("probe", rate=2.0, burst=4, concurrency=1, queue=8, max_wait=0.3)
+    with upstream.slot():
+        pass
+    release = threading.Event()
+    holder = threading.Thread(target=hold, args=(release,))
+    holder.start()
+    time.sleep(0.05)
+    tat = upstream._tat
+    waits = time_to_busy(2)
+    release.set()
+    holder.join()
+    if waits[0] is None or abs(upstream._tat - tat) > 1e-9:
+        problems.append(f"거절된 요청이 속도 제한 토큰을 돌려주지 않음: {upstream._tat - tat:+.3f}초")
+    return problems
+
+
+def _drain(stream):
+    import broker
+    try:
+        list(stream)
+        return "ok"
+    except broker.BusyError:
+        return "busy"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=4, help="현재 동시 세션 수")
+    parser.add_argument("--scale", type=int, default=10)
+    parser.add_argument("--waves", type=int, default=8)
+    parser.add_argument("--period", type=float, default=1.5, help="물결 간격 (초)")
+    parser.add_argument("--nominatim-limit", type=int, default=10, help="스텁 Nominatim 초당 허용 요청")
+    parser.add_argument("--openai-limit", type=int, default=8, help="모의 OpenAI 동시 처리 상한")
+    parser.add_argument("--max-drift", type=float, default=1.5, help="뒤쪽/앞쪽 물결 p95 허용 배수")
+    parser.add_argument("--max-busy-ms", type=float, default=50.0, help="혼잡 응답 p99 상한")
+    args = parser.parse_args()
+
+    os.environ["VEDIC_CACHE_DIR"] = tempfile.mkdtemp(prefix="vedic-load-")
+    import mock_nominatim_server
+    import mock_openai_server
+    nominatim, domain = mock_nominatim_server.start(latency=0.05, rate=args.nominatim_limit)
+    openai_server, base_url = mock_openai_server.start(ttft=0.15, delay=0.002, max_concurrent=args.openai_limit)
+    os.environ.update(VEDIC_NOMINATIM_DOMAIN=domain, VEDIC_NOMINATIM_SCHEME="http", OPENAI_BASE_URL=base_url)
+    import broker
+
+    broker.configure("nominatim", **NOMINATIM)
+    broker.configure("openai", **OPENAI)
+    problems = check_coalescing(openai_server)
+    print(f"합류 검증: 문제 {len(problems)}건")
+    problems += check_fast_busy(args.max_busy_ms)
+    for problem in problems:
+        print(f"  {problem}")
+
+    print(f"스텁 한도: Nominatim {args.nominatim_limit}회/초, OpenAI 동시 {args.openai_limit}개")
+    print(f"중개 설정: nominatim {NOMINATIM}\n           openai    {OPENAI}")
+    print(f"{'모드':6s} {'세션':>4s} {'요청':>5s} {'성공':>5s} {'혼잡':>5s} {'오류':>5s} "
+          f"{'p50 ms':>8s} {'p95 ms':>8s} {'p99 ms':>8s} {'앞/뒤 p95':>11s} {'혼잡p99':>8s}"
+          f"  업스트림 요청/429/최대동시 (Nominatim | OpenAI)")
+    report = {}
+    for enabled, label in ((False, "직접"), (True, "중개")):
+        broker.ENABLED = enabled
+        for sessions in (args.sessions, args.sessions * args.scale):
+            broker.configure("nominatim", **NOMINATIM)
+            broker.configure("openai", **OPENAI)
+            time.sleep(1.0)  # 스텁의 1초 창 비우기
+            r = report[(enabled, sessions)] = run_load(sessions, args.sessions, args.waves, args.period,
+                                                      (nominatim, openai_server))
+            (nr, nj, npk), (orq, oj, opk) = r["upstream"]
+            print(f"{label:6s} {sessions:4d} {r['requests']:5d} {r['ok']:5d} {r['busy']:5d} {r['error']:5d} "
+                  f"{r['p50'] * 1000:8.0f} {r['p95'] * 1000:8.0f} {r['p99'] * 1000:8.0f} "
+                  f"{r['early_p95'] * 1000:5.0f}/{r['late_p95'] * 1000:<5.0f} "
+                  f"{r['busy_p99'] * 1000:8.1f}  {nr}/{nj}/{npk} | {orq}/{oj}/{opk}")
+
+    base, loaded = report[(True, args.sessions)], report[(True, args.sessions * args.scale)]
+    (_, nominatim_429, _), (_, openai_429, _) = loaded["upstream"]
+    if nominatim_429 or openai_429 or loaded["error"]:
+        problems.append(f"중개를 거친 {args.scale}배 부하에서 429 {nominatim_429 + openai_429}건, 오류 {loaded['error']}건")
+    budget = NOMINATIM["max_wait"] + OPENAI["max_wait"]
+    if loaded["p99"] > base["p99"] + budget:
+        problems.append(f"p99 {base['p99'] * 1000:.0f} → {loaded['p99'] * 1000:.0f} ms (대기 예산 {budget:.1f}초 초과)")
+    if loaded["late_p95"] > loaded["early_p95"] * args.max_drift:
+        problems.append(f"물결이 거듭될수록 느려짐: p95 {loaded['early_p95'] * 1000:.0f} → {loaded['late_p95'] * 1000:.0f} ms")
+    if loaded["busy_p99"] * 1000 > args.max_busy_ms:
+        problems.append(f"혼잡 응답 p99 {loaded['busy_p99'] * 1000:.1f} ms > {args.max_busy_ms:.0f} ms")
+    for problem in problems:
+        print(f"실패: {problem}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
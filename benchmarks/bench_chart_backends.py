@@ -0,0 +1,129 @@
+"""차트 백엔드 비교: kerykeion(기준) vs 경량 스위스 에페메리스 엔진
+
+실행: python -m benchmarks.bench_chart_backends [--n 300] [--tolerance 1e-4]
+무작위 출생 정보로 두 백엔드의 chart_data를 비교(표시 문자열은 완전 일치, 경도는
+허용 오차 이내)하고 초당 차트 수를 잰다. 극권 도시(Placidus 하우스가 정의되지 않는 곳)의
+하지 하루 24시각도 경량 엔진이 모두 계산하는지 확인한다. 불일치가 있으면 종료 코드 1로 끝난다.
+캐시를 거치지 않도록 백엔드 함수를 직접 호출한다.
+"""
+import argparse
+import random
+import sys
+import time
+import warnings
+
+import ephemeris
+import vedic_core
+from gazetteer import CITIES
+from timezones import get_timezone
+
+TEXT_FIELDS = ["ascendant", "moon_sign", "nakshatra", "sun_sign", "rahu", "ketu"]
+
+# (도시, 위도, 경도, 타임존) - 지명 사전에는 극권 도시가 없다
+POLAR = [
+    ("Tromsø", 69.6496, 18.9560, "Europe/Oslo"),
+    ("Longyearbyen", 78.2232, 15.6267, "Arctic/Longyearbyen"),
+    ("McMurdo", -77.8419, 166.6863, "Antarctica/McMurdo"),
+]
+
+
+def random_births(n, seed=0):
+    rng = random.Random(seed)
+    births = []
+    for i in range(n):
+        lat, lon, _, _ = rng.choice(CITIES)
+        births.append((f"p{i}", rng.randint(1900, 2026), rng.randint(1, 12), rng.randint(1, 28),
+                       rng.randint(0, 23), rng.randint(0, 59), lat, lon, get_timezone(lat, lon)))
+    return births
+
+
+def compare(reference, fast, tolerance):
+    """다른 항목 설명 목록 (같으면 빈 목록)"""
+    problems = [f"{k}: {reference[k]} != {fast[k]}" for k in TEXT_FIELDS if reference[k] != fast[k]]
+    for body, ref in reference["planets"].items():
+        got = fast["planets"][body]
+        diff = abs((ref["lon"] - got["lon"] + 180) % 360 - 180)
+        if ref["sign"] != got["sign"] or diff > tolerance:
+            problems.append(f"{body}: {ref} != {got}")
+    return problems
+
+
+def check_polar(tolerance):
+    """극권 출생 - 경량 엔진이 모든 시각에 차트를 내고 kerykeion과 같은지 (문제 목록)
+
+    kerykeion은 하우스 계산 위도를 ±66°로 자르므로, 상승궁은 경량 엔진도 같은 위도로 계산해
+    비교하고 나머지 항목은 실제 위도 그대로 비교한다.
+    """
+    problems = []
+    for city, lat, lon, tz_str in POLAR:
+        for hour in range(24):
+            birth = (city, 1990, 6, 21, hour, 0)
+            try:
+                fast = vedic_core.fast_chart(*birth, lat, lon, tz_str)
+            except Exception as e:
+                problems.append(f"{city} {hour:02d}시 경량 엔진 실패: {e}")
+                continue
+            reference = vedic_core.kerykeion_chart(*birth, lat, lon, tz_str)
+            clamped = vedic_core.fast_chart(*birth, max(-66.0, min(66.0, lat)), lon, tz_str)
+            found = compare(reference, {**fast, "ascendant": clamped["ascendant"]}, tolerance)
+            problems += [f"{city} {hour:02d}시 {p}" for p in found]
+    return problems
+
+
+def _rate(fn, births):
+    ok = []
+    start = time.perf_counter()
+    for birth in births:
+        try:
+            ok.append(fn(*birth))
+        except Exception:
+            ok.append(None)
+    return ok, len(births) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, default=300)
+    parser.add_argument("--tolerance", type=float, default=1e-4, help="경도 허용 오차 (도)")
+    args = parser.parse_args()
+    warnings.simplefilter("ignore", DeprecationWarning)
+
+    births = random_births(args.n)
+    references, ref_rate = _rate(vedic_core.kerykeion_chart, births)
+    fasts, fast_rate = _rate(vedic_core.fast_chart, births)
+
+    mismatches = 0
+    for birth, ref, fast in zip(births, references, fasts):
+        if ref is None or fast is None:
+            if (ref is None) != (fast is None):
+                mismatches += 1
+                print(f"한쪽만 실패: {birth}")
+            continue
+        problems = compare(ref, fast, args.tolerance)
+        if problems:
+            mismatches += 1
+            print(f"불일치 {birth}: {'; '.join(problems)}")
+
+    valid = [(b, ephemeris.julian_day(*b[1:6], b[8])) for b, r in zip(births, references) if r is not None]
+    jds = [jd for _, jd in valid]
+    lats = [b[6] for b, _ in valid]
+    lons = [b[7] for b, _ in valid]
+    start = time.perf_counter()
+    ephemeris.positions_batch(jds, lats, lons)
+    batch_rate = len(jds) / (time.perf_counter() - start)
+
+    polar = check_polar(args.tolerance)
+    for problem in polar:
+        print(f"극권 {problem}")
+    mismatches += len(polar)
+
+    print(f"비교: {args.n}건 중 불일치 {mismatches - len(polar)}건 (경도 허용 오차 {args.tolerance}°), "
+          f"극권 {len(POLAR) * 24}건 중 {len(polar)}건")
+    print(f"kerykeion:        {ref_rate:10.0f} 차트/초")
+    print(f"경량 엔진:        {fast_rate:10.0f} 차트/초")
+    print(f"경량 엔진 (배치): {batch_rate:10.0f} 차트/초 (위치 배열만)")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
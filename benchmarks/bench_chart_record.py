@@ -0,0 +1,179 @@
+"""압축 차트 레코드/열 지향 저장소 검증 및 메모리 측정
+
+실행: python -m benchmarks.bench_chart_record [--n 2000] [--store-rows 200000]
+- 왕복: chart_data → ChartRecord → chart_data 의 표시 문자열이 모두 같고 경도 차이가
+  float32 정밀도 이내인지, 파다 슬롯/궁합 점수가 원본 chart_data 계산과 같은지 확인한다.
+  복원한 chart_data 끼리 계산한 점수도 원본과 같아야 한다 (파다 경계 ±2e-6/±1e-7/±1e-9° 달 경도 포함).
+- 저장소: 여러 번 나눠 추가한 뒤 다시 열어 모든 레코드가 같은지, 중단된 추가를 복구하는지 확인한다.
+- 차트당 메모리(tracemalloc)와 디스크 크기를 chart_data(JSON에서 읽은 dict)와 비교한다.
+하나라도 다르면 종료 코드 1로 끝난다.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+import ephemeris
+import kuta_table
+import vedic_core
+from benchmarks.bench_chart_backends import TEXT_FIELDS, random_births
+from chart_record import ChartRecord, ChartStore, score
+
+# float32 경도(360° 근처 상대 오차 ~6e-8) + 케투 유도 오차
+LON_TOLERANCE = 1e-4
+
+
+def boundary_charts(rng, n):
+    """달 경도를 낙샤트라/파다 경계 바로 옆에 둔 chart_data"""
+    charts = []
+    for i in range(n):
+        edge = rng.randrange(27) * vedic_core.NAKSHATRA_SPAN + rng.randrange(4) * vedic_core.PADA_SPAN
+        positions = {b: rng.uniform(0, 360) for b in ephemeris.COLUMNS}
+        positions["달"] = (edge + rng.choice([-1, 1]) * rng.choice([2e-6, 1e-7, 1e-9])) % 360
+        charts.append(vedic_core.chart_from_positions(f"경계{i}", positions))
+    return charts
+
+
+def compare(original, restored):
+    problems = [f"{k}: {original[k]} != {restored[k]}" for k in TEXT_FIELDS + ["name"] if original[k] != restored[k]]
+    for body, info in original["planets"].items():
+        got = restored["planets"][body]
+        diff = abs((info["lon"] - got["lon"] + 180) % 360 - 180)
+        if info["sign"] != got["sign"] or diff > LON_TOLERANCE:
+            problems.append(f"{body}: {info} != {got}")
+    return problems
+
+
+def check_round_trip(charts, rng):
+    mismatches = 0
+    records = [ChartRecord.from_chart_data(c) for c in charts]
+    for chart, record in zip(charts, records):
+        problems = compare(chart, record.to_chart_data())
+        expected_slot = kuta_table.moon_slot(chart["moon_lon"])
+        if record.moon_slot != expected_slot:
+            problems.append(f"슬롯 {record.moon_slot} != {expected_slot}")
+        if kuta_table.moon_slot(record.to_chart_data()["moon_lon"]) != expected_slot:
+            problems.append(f"복원한 달 경도의 슬롯 != {expected_slot}")
+        if problems:
+            mismatches += 1
+            print(f"왕복 불일치 {chart['name']}: {'; '.join(problems[:3])}")
+    for _ in range(len(charts)):
+        i, j = rng.randrange(len(charts)), rng.randrange(len(charts))
+        expected = vedic_core.calculate_ashta_kuta(charts[i], charts[j])
+        restored = vedic_core.calculate_ashta_kuta(records[i].to_chart_data(), records[j].to_chart_data())
+        if score(records[i], records[j]) != (expected[0], int(expected[1])) or restored != expected:
+            mismatches += 1
+            print(f"점수 불일치 {charts[i]['name']} × {charts[j]['name']}")
+    return mismatches, records
+
+
+def check_positions(births):
+    """from_positions 와 from_chart_data 가 별자리/낙샤트라까지 같은 레코드를 만드는지"""
+    mismatches = 0
+    for birth in births[:200]:
+        jd = ephemeris.julian_day(*birth[1:6], birth[8])
+        positions = ephemeris.positions(jd, birth[6], birth[7])
+        direct = ChartRecord.from_positions(birth[0], positions)
+        via_dict = ChartRecord.from_chart_data(vedic_core.chart_from_positions(birth[0], positions))
+        if direct.values()[9:] != via_dict.values()[9:] or direct.values()[1:9] != via_dict.values()[1:9]:
+            mismatches += 1
+            print(f"from_positions 불일치 {birth}")
+    return mismatches
+
+
+def check_store(records, path):
+    mismatches = 0
+    store = ChartStore(path)
+    thirds = len(records) // 3
+    for part in (records[:thirds], records[thirds:2 * thirds], records[2 * thirds:]):
+        store.append(part)
+    reopened = ChartStore(path)
+    if len(reopened) != len(records) or list(reopened.scan(batch_size=777)) != records:
+        mismatches += 1
+        print("저장소 왕복 불일치")
+    moon = reopened.column("moon_lon")
+    if moon.dtype != np.float64 or not np.array_equal(moon, [r.lons[2] for r in records]):
+        mismatches += 1
+        print("moon_lon 열 불일치")
+
+    # 중단된 추가 흉내 - 열 하나에만 반쪽 행, 이름 파일에 줄바꿈 없는 조각
+    with open(os.path.join(path, "moon_lon.bin"), "ab") as f:
+        f.write(b"\x00\x01")
+    with open(os.path.join(path, "names.jsonl"), "a", encoding="utf-8") as f:
+        f.write('"잘린')
+    recovered = ChartStore(path)
+    recovered.append(records[:1])
+    if len(recovered) != len(records) + 1 or recovered[len(records)] != records[0]:
+        mismatches += 1
+        print("중단된 추가 복구 실패")
+
+    return mismatches
+
+
+def memory_per_item(build):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    items = build()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    used = sum(s.size_diff for s in after.compare_to(before, "filename"))
+    return used / len(items), items
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, default=2000)
+    parser.add_argument("--store-rows", type=int, default=200000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    births = random_births(args.n, args.seed)
+    charts = [vedic_core.fast_chart(*b) for b in births] + boundary_charts(rng, args.n // 4)
+    mismatches, records = check_round_trip(charts, rng)
+    mismatches += check_positions(births)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        mismatches += check_store(records, os.path.join(tmp, "charts"))
+
+        # 메모리/디스크 - 캐시가 돌려주는 것과 같은 독립된 dict(JSON에서 읽음)와 비교
+        dumped = [json.dumps(c, ensure_ascii=False) for c in charts]
+        dict_bytes, _ = memory_per_item(lambda: [json.loads(s) for s in dumped])
+        record_bytes, _ = memory_per_item(lambda: [ChartRecord.from_chart_data(json.loads(s)) for s in dumped])
+        json_disk = sum(len(s.encode()) for s in dumped) / len(dumped)
+
+        # 대량 저장/스캔
+        path = os.path.join(tmp, "bulk")
+        store = ChartStore(path)
+        bulk = (records * (args.store_rows // len(records) + 1))[:args.store_rows]
+        start = time.perf_counter()
+        store.append(bulk)
+        append_rate = len(bulk) / (time.perf_counter() - start)
+        disk = sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path)) / len(bulk)
+        start = time.perf_counter()
+        slots = ChartStore(path).moon_slots()
+        slot_scan = time.perf_counter() - start
+        start = time.perf_counter()
+        count = sum(1 for _ in store.scan())
+        record_rate = count / (time.perf_counter() - start)
+        if not np.array_equal(slots, [r.moon_slot for r in bulk]):
+            mismatches += 1
+            print("moon_slots 열 스캔 불일치")
+
+    print(f"왕복: 차트 {len(charts)}개 (경계 {args.n // 4}개 포함), 불일치 {mismatches}건")
+    print(f"메모리: chart_data {dict_bytes:8.0f} B/차트, ChartRecord {record_bytes:6.0f} B/차트 "
+          f"({dict_bytes / record_bytes:.0f}배)")
+    print(f"디스크: JSON {json_disk:8.0f} B/차트, 열 저장소 {disk:6.1f} B/차트 (이름 포함)")
+    print(f"저장소 {len(bulk):,}행: 추가 {append_rate:,.0f} 행/초, 슬롯 열 스캔 {slot_scan * 1000:.1f} ms, "
+          f"레코드 스캔 {record_rate:,.0f} 행/초")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
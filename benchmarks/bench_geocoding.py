@@ -0,0 +1,151 @@
+"""지오코딩 캐시 키 정규화 검증 및 계층별 조회 비용
+
+실행: python -m benchmarks.bench_geocoding [--repeat 20000]
+normalize_city 가 국가 접미사를 쉼표 뒤에서만 떼는지, 서로 다른 나라/도시가 같은 캐시 키로
+겹치지 않는지(스텁 지오코더로 실제 조회까지), 한글 질의의 대체 질의 순서와 계층별 통계가
+맞는지 확인하고, 하나라도 틀리면 종료 코드 1로 끝난다.
+이어서 메모리/지명 사전/디스크 계층의 조회당 비용을 잰다.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+# (입력, 기대하는 캐시 키)
+CASES = [
+    ("Seoul", "seoul"),
+    ("  SEOUL  ", "seoul"),
+    ("Seoul, South Korea", "seoul"),
+    ("Seoul,Korea", "seoul"),
+    ("서울, 대한민국", "서울"),
+    ("부산 , 한국", "부산"),
+    ("Busan, Republic of Korea", "busan"),
+    ("South Korea", "south korea"),
+    ("North Korea", "north korea"),
+    ("Republic of Korea", "republic of korea"),
+    ("Korea", "korea"),
+    (", Korea", "korea"),
+    ("Pyongyang, North Korea", "pyongyang, north korea"),
+    ("Seoul South Korea", "seoul south korea"),
+]
+
+# 서로 다른 캐시 항목이어야 하는 질의들
+DISTINCT = ["South Korea", "North Korea", "Republic of Korea", "Korea", "Seoul, South Korea"]
+
+
+def check_keys():
+    import geocoding
+
+    problems = []
+    for text, expected in CASES:
+        key = geocoding.normalize_city(text)
+        if key != expected:
+            problems.append(f"normalize_city({text!r}) = {key!r}, 기대 {expected!r}")
+
+    geocoding.clear_caches()
+    places = {q: (10.0 + i, 20.0 + i, q) for i, q in enumerate(DISTINCT)}
+    stub = geocoding.StubGeocoder(places)
+    geocoding.set_geocoder(stub)
+    try:
+        for _ in range(2):  # 두 번째는 캐시에서
+            for query in DISTINCT:
+                got = geocoding.get_location_coordinates(query)
+                # "Seoul, South Korea" → "seoul" 은 지명 사전에 있으므로 스텁까지 가지 않는다
+                expected = geocoding._GAZETTEER.get(geocoding.normalize_city(query), places[query])
+                if got != expected:
+                    problems.append(f"{query!r} 조회 결과가 다른 항목과 겹침: {got}")
+    finally:
+        geocoding.set_geocoder(None)
+    if len(stub.calls) != len(DISTINCT) - 1:
+        problems.append(f"스텁 호출 {len(stub.calls)}회 (기대 {len(DISTINCT) - 1}회): {stub.calls}")
+    return problems
+
+
+def check_fallback():
+    """한글 질의가 빗나가면 "…, 대한민국"(language="ko") → "…, South Korea" 순서로 다시 묻고
+    계층별 통계(geocoding.stats)가 조회마다 한 번씩만 세어지는지"""
+    import geocoding
+
+    geocoding.clear_caches()
+    stub = geocoding.StubGeocoder({
+        "가상읍, South Korea": (35.0, 127.0, "가상읍"),
+        "가상리, 대한민국": (36.0, 128.0, "가상리"),
+    })
+    geocoding.set_geocoder(stub)
+    try:
+        geocoding.get_location_coordinates("가상읍")    # 세 번째 질의에서 찾음 → network
+        geocoding.get_location_coordinates("가상리")    # 두 번째 질의에서 찾음 → network
+        geocoding.get_location_coordinates("없는마을")  # 세 질의 모두 빗나감 → not_found
+        geocoding.get_location_coordinates("Nowhere")   # 한글이 아니면 대체 질의 없음 → not_found
+        geocoding.get_location_coordinates("가상읍")    # memory
+        geocoding.get_location_coordinates("없는마을")  # 찾지 못한 결과도 memory
+        geocoding.get_location_coordinates("서울")      # gazetteer
+        geocoding._memory.clear()
+        geocoding.get_location_coordinates("가상리")    # disk
+    finally:
+        geocoding.set_geocoder(None)
+
+    problems = []
+    expected_calls = [
+        ("가상읍", None), ("가상읍, 대한민국", "ko"), ("가상읍, South Korea", None),
+        ("가상리", None), ("가상리, 대한민국", "ko"),
+        ("없는마을", None), ("없는마을, 대한민국", "ko"), ("없는마을, South Korea", None),
+        ("Nowhere", None),
+    ]
+    if stub.calls != expected_calls:
+        problems.append(f"스텁 질의 순서 {stub.calls}, 기대 {expected_calls}")
+    expected_stats = {"memory": 2, "gazetteer": 1, "disk": 1, "network": 2, "not_found": 2, "error": 0}
+    if geocoding.stats != expected_stats:
+        problems.append(f"stats {geocoding.stats}, 기대 {expected_stats}")
+    return problems
+
+
+def _per_call_us(fn, args, repeat):
+    start = time.perf_counter()
+    for i in range(repeat):
+        fn(args[i % len(args)])
+    return (time.perf_counter() - start) * 1e6 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20000)
+    args = parser.parse_args()
+
+    os.environ["VEDIC_CACHE_DIR"] = tempfile.mkdtemp(prefix="vedic-geocode-")
+    # 스텁 지오코더라 Nominatim 이용 정책(1회/초) 속도 제한이 필요 없다
+    os.environ.setdefault("VEDIC_NOMINATIM_RATE", "0")
+    import geocoding
+
+    problems = check_keys()
+    print(f"캐시 키 검사: {len(CASES)}개 정규화, {len(DISTINCT)}개 구분 조회, 문제 {len(problems)}건")
+    for problem in problems:
+        print(f"  {problem}")
+    fallback = check_fallback()
+    print(f"한글 대체 질의 검사: 문제 {len(fallback)}건")
+    for problem in fallback:
+        print(f"  {problem}")
+    problems += fallback
+
+    cities = [f"Town {i}" for i in range(200)]
+    geocoding.set_geocoder(geocoding.StubGeocoder({c: (1.0, 2.0, c) for c in cities}))
+    geocoding.clear_caches()
+    for city in cities:
+        geocoding.get_location_coordinates(city)
+    memory_us = _per_call_us(geocoding.get_location_coordinates, cities, args.repeat)
+    gazetteer_us = _per_call_us(lambda c: (geocoding._memory.clear(), geocoding.get_location_coordinates(c)),
+                                ["서울", "Busan", "Tokyo"], args.repeat // 10)
+    disk_us = _per_call_us(lambda c: (geocoding._memory.clear(), geocoding.get_location_coordinates(c)),
+                           cities, args.repeat // 10)
+    geocoding.set_geocoder(None)
+
+    print(f"{'계층':<12}{'us/조회':>10}")
+    print(f"{'메모리':<12}{memory_us:>10.2f}")
+    print(f"{'지명 사전':<12}{gazetteer_us:>10.2f}")
+    print(f"{'디스크':<12}{disk_us:>10.2f}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+"""앱 콜드 스타트 임포트 시간 보고 (python -X importtime)
+
+실행: python -m benchmarks.bench_import_time [--repeat 5] [--max-app-ms 100]
+새 인터프리터에서 streamlit을 먼저 임포트한 뒤 vedic_compatibility_app을 임포트해
+앱 자신이 더하는 누적 임포트 시간(중앙값)과 무거운 하위 모듈을 보고한다.
+앱 임포트 시간이 --max-app-ms 를 넘거나, 첫 화면에 필요 없는 무거운 의존성(LAZY)이
+임포트 직후 이미 올라와 있으면 종료 코드 1로 끝난다.
+끝으로 warmup 스레드가 백그라운드에서 올리는 모듈별 시간(첫 클릭으로 미룬 비용)을 보여준다.
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = "vedic_compatibility_app"
+# 첫 화면에 필요 없어 지연 임포트해야 하는 모듈
+LAZY = ["openai", "pandas", "numpy", "kerykeion", "geopy", "timezonefinder", "pytz", "swisseph"]
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)")
+
+_PROBE = f"""
+import json, sys
+import streamlit
+import {APP}
+print(json.dumps(sorted(m for m in {LAZY!r} if m in sys.modules)))
+"""
+
+_WARMUP = f"""
+import json
+import streamlit
+import {APP}, warmup
+warmup.start()
+warmup.wait()
+print(json.dumps({{"timings": warmup.timings, "errors": warmup.errors}}))
+"""
+
+
+def _run(code, importtime=False):
+    args = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", code]
+    start = time.perf_counter()
+    proc = subprocess.run(args, cwd=ROOT, capture_output=True, text=True, check=True)
+    return proc, time.perf_counter() - start
+
+
+def parse(stderr):
+    """-X importtime 출력 → (앱 누적 µs, streamlit 누적 µs, 앱 하위 모듈 [(누적 µs, 이름)])"""
+    entries = []
+    for line in stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            entries.append((int(match.group(2)), len(match.group(3)), match.group(4)))
+    app_at = next(i for i, (_, depth, name) in enumerate(entries) if name == APP and depth == 1)
+    streamlit_us = next(us for us, depth, name in entries if name == "streamlit" and depth == 1)
+    # 앱 줄 바로 앞의 최상위 줄 다음부터가 앱이 끌어온 모듈
+    first = max((i for i, (_, depth, _) in enumerate(entries[:app_at]) if depth == 1), default=-1) + 1
+    children = sorted(((us, name) for us, _, name in entries[first:app_at]), reverse=True)
+    return entries[app_at][0], streamlit_us, children
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-app-ms", type=float, default=100.0, help="앱 임포트 시간 상한 (중앙값)")
+    parser.add_argument("--top", type=int, default=8)
+    args = parser.parse_args()
+
+    app_ms, streamlit_ms, wall_ms, children = [], [], [], []
+    loaded = []
+    for _ in range(args.repeat):
+        proc, wall = _run(_PROBE, importtime=True)
+        app_us, streamlit_us, children = parse(proc.stderr)
+        app_ms.append(app_us / 1000)
+        streamlit_ms.append(streamlit_us / 1000)
+        wall_ms.append(wall * 1000)
+        loaded = json.loads(proc.stdout.strip().splitlines()[-1])
+
+    app = statistics.median(app_ms)
+    print(f"콜드 스타트 (중앙값, {args.repeat}회): 프로세스 전체 {statistics.median(wall_ms):.0f} ms, "
+          f"streamlit {statistics.median(streamlit_ms):.0f} ms, 앱 {app:.1f} ms (상한 {args.max_app_ms:.0f} ms)")
+    print("앱이 끌어온 무거운 모듈 (마지막 실행, 누적):")
+    for us, name in children[:args.top]:
+        print(f"  {us / 1000:7.1f} ms  {name}")
+
+    proc, _ = _run(_WARMUP)
+    warm = json.loads(proc.stdout.strip().splitlines()[-1])
+    print("백그라운드 예열로 미룬 비용:")
+    for name, seconds in warm["timings"].items():
+        error = warm["errors"].get(name)
+        print(f"  {seconds * 1000:7.1f} ms  {name}" + (f"  (실패: {error})" if error else ""))
+
+    failed = False
+    if loaded:
+        failed = True
+        print(f"실패: 임포트 직후 지연 대상 모듈이 올라와 있음: {', '.join(loaded)}")
+    if app > args.max_app_ms:
+        failed = True
+        print(f"실패: 앱 임포트 {app:.1f} ms > 상한 {args.max_app_ms:.0f} ms")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
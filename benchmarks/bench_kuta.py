@@ -0,0 +1,141 @@
+"""아쉬타쿠타 점수표 검증 및 속도 비교 (기존 호출별 계산 vs 점수표 조회)
+
+실행: python -m benchmarks.bench_kuta [--samples 200000]
+모든 파다 조합, 무작위 경도 쌍, 경계 바로 옆 경도(기존 13.333333 근사 경계와 정확한 파다 경계,
+30° 라시 경계, 360°의 ±1e-6°/±1e-9°)에서 점수표 조회와 낙샤트라 표시가 기준 산식과 같은지 확인한다.
+기준 산식은 기존 호출별 계산 규칙에 경계만 정확한 360/108° 분할(분수 연산)을 쓴 것이다.
+기존 근사 산식과는 경계에서 1e-5° 안쪽에서만 달라야 한다. 하나라도 어긋나면 종료 코드 1로 끝난다.
+"""
+import argparse
+import random
+import sys
+import time
+from fractions import Fraction
+
+import kuta_table
+import vedic_core
+
+SIGNS = ["Ari", "Tau", "Gem", "Can", "Leo", "Vir", "Lib", "Sco", "Sag", "Cap", "Aqu", "Pis"]
+# 기존 근사 산식과 달라도 되는 경계 근처 폭 (도)
+LEGACY_EDGE = 1e-5
+
+
+def legacy_ashta_kuta(chart1, chart2):
+    """점수표 도입 전의 호출별 계산 (속도 비교 기준)"""
+    scores = {}
+    scores["바르나"] = 3
+    scores["바쉬야"] = 4
+    nakshatra1_idx = int(chart1["moon_lon"] / 13.333333) % 27
+    nakshatra2_idx = int(chart2["moon_lon"] / 13.333333) % 27
+    tara_diff = abs(nakshatra1_idx - nakshatra2_idx) % 9
+    scores["타라"] = 8 if tara_diff in [1, 2, 4, 6, 8] else 4
+    scores["요니"] = 8
+    scores["그라하 마이트리"] = 14 if chart1["moon_sign"] == chart2["moon_sign"] else 10
+    scores["가나"] = 12
+    scores["바쿠트"] = 14
+    pada1 = int((chart1["moon_lon"] % 13.333333) / 3.333333) % 3
+    pada2 = int((chart2["moon_lon"] % 13.333333) / 3.333333) % 3
+    scores["나디"] = 22 if pada1 != pada2 else 0
+    return scores, sum(scores.values())
+
+
+def _exact_slot(lon):
+    """분수 연산으로 구한 파다 슬롯 (부동소수점 반올림 없음)"""
+    return int(Fraction(lon) % 360 * 108 / 360)
+
+
+def reference_ashta_kuta(lon1, lon2):
+    """기존 규칙 + 정확한 경계 - 낙샤트라/파다는 360/108° 분할, 라시는 30° 분할"""
+    slot1, slot2 = _exact_slot(lon1), _exact_slot(lon2)
+    scores = {}
+    scores["바르나"] = 3
+    scores["바쉬야"] = 4
+    scores["타라"] = 8 if abs(slot1 // 4 - slot2 // 4) % 9 in [1, 2, 4, 6, 8] else 4
+    scores["요니"] = 8
+    same_sign = int(Fraction(lon1) % 360 / 30) == int(Fraction(lon2) % 360 / 30)
+    scores["그라하 마이트리"] = 14 if same_sign else 10
+    scores["가나"] = 12
+    scores["바쿠트"] = 14
+    scores["나디"] = 22 if slot1 % 4 % 3 != slot2 % 4 % 3 else 0
+    return scores, sum(scores.values())
+
+
+def _chart(lon):
+    return {"moon_lon": lon, "moon_sign": SIGNS[int(lon / 30) % 12]}
+
+
+def boundary_longitudes():
+    """기존 근사 경계(k × 13.333333 + p × 3.333333), 정확한 파다 경계, 30° 경계, 360° 바로 옆 경도"""
+    edges = [k * 13.333333 + p * 3.333333 for k in range(28) for p in range(4)]
+    edges += [k * 360 / 108 for k in range(109)]
+    edges += [k * 30.0 for k in range(13)]
+    lons = [edge + d for edge in edges for d in (-1e-6, -1e-9, 1e-9, 1e-6)]
+    return sorted(lon % 360 for lon in lons)
+
+
+def _edge_distance(lon):
+    """가장 가까운 기존 근사 경계 또는 정확한 파다 경계까지의 거리"""
+    legacy = min(abs(lon - (k * 13.333333 + p * 3.333333)) for k in range(28) for p in range(5))
+    exact = float(abs(Fraction(lon) * 108 / 360 - round(Fraction(lon) * 108 / 360))) * 360 / 108
+    return min(legacy, exact, 360 - lon)
+
+
+def check_parity(samples, seed=0):
+    """모든 파다 쌍(중앙값), 무작위 경도 쌍, 경계 경도 × 파다 중앙값 쌍에서 불일치 목록 반환"""
+    pada_mid = [(slot + 0.5) * 360 / 108 for slot in range(108)]
+    pairs = [(a, b) for a in pada_mid for b in pada_mid]
+    rng = random.Random(seed)
+    pairs += [(rng.uniform(0, 360), rng.uniform(0, 360)) for _ in range(samples)]
+    edges = boundary_longitudes()
+    pairs += [(a, b) for a in edges for b in pada_mid[::7]]
+    pairs += [(a, b) for a in edges[::5] for b in edges[::5]]
+
+    problems = []
+    legacy_diffs = 0
+    for a, b in pairs:
+        expected = reference_ashta_kuta(a, b)
+        if kuta_table.lookup(a, b) != expected:
+            problems.append(f"점수 불일치 ({a!r}, {b!r}): {kuta_table.lookup(a, b)[1]} != {expected[1]}")
+        if legacy_ashta_kuta(_chart(a), _chart(b)) != expected:
+            legacy_diffs += 1
+            if min(_edge_distance(a), _edge_distance(b)) > LEGACY_EDGE:
+                problems.append(f"경계에서 먼 기존 산식 차이 ({a!r}, {b!r})")
+    for lon in edges:
+        slot = _exact_slot(lon)
+        label = f"{vedic_core.NAKSHATRAS[slot // 4]} (파다 {slot % 4 + 1})"
+        if vedic_core.get_nakshatra(lon) != label:
+            problems.append(f"낙샤트라 표시 불일치 {lon!r}: {vedic_core.get_nakshatra(lon)} != {label}")
+    return len(pairs), legacy_diffs, problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--samples", type=int, default=200000)
+    args = parser.parse_args()
+
+    checked, legacy_diffs, problems = check_parity(args.samples)
+    print(f"일치 검사: {checked}쌍 중 불일치 {len(problems)}건 (경계 근처에서 기존 근사 산식과 다른 쌍 {legacy_diffs}건)")
+    for problem in problems[:20]:
+        print(f"  {problem}")
+
+    rng = random.Random(1)
+    charts = [_chart(rng.uniform(0, 360)) for _ in range(2000)]
+    n = len(charts) * 50
+
+    start = time.perf_counter()
+    for i in range(n):
+        legacy_ashta_kuta(charts[i % 2000], charts[(i * 7) % 2000])
+    legacy_us = (time.perf_counter() - start) * 1e6 / n
+
+    start = time.perf_counter()
+    for i in range(n):
+        kuta_table.lookup(charts[i % 2000]["moon_lon"], charts[(i * 7) % 2000]["moon_lon"])
+    table_us = (time.perf_counter() - start) * 1e6 / n
+
+    print(f"기존 계산: {legacy_us:.2f} us/쌍, 점수표 조회: {table_us:.2f} us/쌍")
+    print(f"점수표 크기: {kuta_table.TABLE.nbytes} bytes")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""일괄 궁합 엔진 검증 및 처리량 측정
+
+실행: python -m benchmarks.bench_kuta_batch [--n 1000] [--seed 0]
+무작위 경도(경계 근처 값 포함)로 만든 n × n 쌍 전부를 단건 calculate_ashta_kuta
+(kuta_table.lookup)와 비교하고, 하나라도 다르면 종료 코드 1로 끝난다.
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+import kuta_batch
+import kuta_table
+import vedic_core
+
+
+def random_longitudes(rng, n):
+    """균등 분포 경도 + 낙샤트라/파다 경계 바로 옆 경도를 섞는다"""
+    lons = rng.uniform(0, 360, n)
+    edges = (np.arange(27)[:, None] * vedic_core.NAKSHATRA_SPAN
+             + np.arange(4)[None, :] * vedic_core.PADA_SPAN).ravel()[1:]
+    near = rng.choice(edges, n // 4) + rng.uniform(-2e-6, 2e-6, n // 4)
+    lons[: n // 4] = np.clip(near, 0, 359.999999)
+    rng.shuffle(lons)
+    return lons
+
+
+def check_parity(lons_a, lons_b):
+    scores, totals = kuta_batch.score_matrix(lons_a, lons_b)
+    mismatches = 0
+    for i, a in enumerate(lons_a.tolist()):
+        for j, b in enumerate(lons_b.tolist()):
+            expected, expected_total = kuta_table.lookup(a, b)
+            if scores[i, j].tolist() != list(expected.values()) or totals[i, j] != expected_total:
+                mismatches += 1
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    mismatches = check_parity(random_longitudes(rng, args.n), random_longitudes(rng, args.n))
+    print(f"일치 검사: {args.n * args.n}쌍 중 불일치 {mismatches}건")
+
+    roster = rng.uniform(0, 360, 100000)
+    start = time.perf_counter()
+    kuta_batch.one_vs_many(123.4, roster)
+    elapsed = time.perf_counter() - start
+    print(f"1 × 100k: {elapsed * 1000:.1f} ms ({len(roster) / elapsed / 1e6:.1f}M 쌍/초)")
+
+    side = rng.uniform(0, 360, 20000)
+    start = time.perf_counter()
+    best = 0
+    for _, _, _, totals in kuta_batch.iter_tiles(side, side):
+        best = max(best, int(totals.max()))
+    elapsed = time.perf_counter() - start
+    print(f"20k × 20k 타일 스트리밍: {elapsed:.2f} s ({side.size ** 2 / elapsed / 1e6:.0f}M 쌍/초)")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,177 @@
+"""지표 계층 오버헤드와 내보내기 형식 검증
+
+실행: python -m benchmarks.bench_metrics [--n 200000] [--max-off-ns 2000]
+- 꺼진 상태(VEDIC_METRICS=0)와 켠 상태에서 stage()/inc()/observe() 호출당 비용을 잰다
+  (각각 새 인터프리터에서 - ENABLED는 임포트 때 정해진다).
+- 켠 상태에서 스텁 지오코더 + 파이프라인 한 번을 돌려 render() 결과가 Prometheus 텍스트
+  형식(HELP/TYPE, 레이블, 히스토그램 버킷 누적/+Inf == count)을 지키는지, 로컬 /metrics
+  엔드포인트와 파일 기록이 같은 내용을 내보내는지, 요청 워터폴에 하위 구간이 남는지 확인한다.
+꺼진 상태 호출 비용이 --max-off-ns 를 넘거나 형식이 틀리면 종료 코드 1로 끝난다.
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_COST = """
+import json, time
+import metrics
+n = {n}
+start = time.perf_counter()
+for _ in range(n):
+    with metrics.stage("bench"):
+        pass
+stage_ns = (time.perf_counter() - start) / n * 1e9
+start = time.perf_counter()
+for _ in range(n):
+    metrics.inc("vedic_bench_total", kind="a")
+inc_ns = (time.perf_counter() - start) / n * 1e9
+start = time.perf_counter()
+for _ in range(n):
+    metrics.observe("vedic_bench_seconds", 0.01, stage="a")
+observe_ns = (time.perf_counter() - start) / n * 1e9
+start = time.perf_counter()
+for _ in range(n):
+    pass
+loop_ns = (time.perf_counter() - start) / n * 1e9
+print(json.dumps({{"stage": stage_ns - loop_ns, "inc": inc_ns - loop_ns, "observe": observe_ns - loop_ns}}))
+"""
+
+_SAMPLE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(\{([a-zA-Z_][a-zA-Z0-9_]*="(?:[^"\\]|\\.)*",?)*\})? (\S+)$')
+
+
+def cost(enabled, n):
+    env = dict(os.environ, VEDIC_METRICS="1" if enabled else "0")
+    env.pop("VEDIC_METRICS_PORT", None)
+    env.pop("VEDIC_METRICS_FILE", None)
+    proc = subprocess.run([sys.executable, "-c", _COST.format(n=n)], cwd=ROOT, env=env,
+                          capture_output=True, text=True, check=True)
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def validate(text):
+    """Prometheus 텍스트 형식 검사 - 문제 목록"""
+    problems = []
+    typed = {}
+    buckets = {}
+    counts = {}
+    for line in text.splitlines():
+        if line.startswith("# TYPE "):
+            _, _, name, kind = line.split(" ", 3)
+            typed[name] = kind
+            continue
+        if line.startswith("#") or not line:
+            continue
+        match = _SAMPLE.match(line)
+        if not match:
+            problems.append(f"형식 오류: {line}")
+            continue
+        name, labels, value = match.group(1), match.group(2) or "", match.group(4)
+        float(value)
+        base = re.sub(r"_(bucket|sum|count)$", "", name)
+        if name not in typed and base not in typed:
+            problems.append(f"TYPE 없음: {name}")
+        if name.endswith("_bucket"):
+            series = re.sub(r',?le="[^"]*"', "", labels)
+            buckets.setdefault((base, series), []).append(float(value))
+        elif name.endswith("_count") and typed.get(base) == "histogram":
+            counts[(base, labels.replace("{}", ""))] = float(value)
+    for (base, series), values in buckets.items():
+        if values != sorted(values):
+            problems.append(f"버킷이 누적이 아님: {base}{series}")
+        if counts.get((base, series if series != "{}" else "")) != values[-1]:
+            problems.append(f"+Inf 버킷 != count: {base}{series}")
+    return problems
+
+
+def exercise():
+    """켠 상태에서 파이프라인 한 번 + 내보내기 확인 (이 프로세스에서 실행)"""
+    import tempfile
+    import urllib.request
+    from datetime import date
+
+    os.environ["VEDIC_CACHE_DIR"] = tempfile.mkdtemp()
+    import metrics
+    metrics.ENABLED = True
+    import geocoding
+    from pipeline import LocationNotFound, StageTimer, compute_person_chart
+
+    class FlakyGeocoder(geocoding.StubGeocoder):
+        def geocode(self, query, language=None, **kwargs):
+            if query.startswith("끊긴"):
+                raise ConnectionError("mock")
+            return super().geocode(query, language, **kwargs)
+
+    geocoding.set_geocoder(FlakyGeocoder({"Atlantis": (37.0, 127.0, "Atlantis")}))
+    timer = StageTimer()
+    compute_person_chart(1, "가", date(1990, 5, 17), 14, 30, "Atlantis", timer)
+    for i, city in enumerate(["없는도시", "끊긴도시"]):
+        try:
+            compute_person_chart(2 + i, "나", date(1990, 5, 17), 14, 30, city, timer)
+        except LocationNotFound:
+            pass
+    compute_person_chart(4, "다", date(1990, 5, 17), 14, 30, "Atlantis", timer)
+
+    problems = []
+    text = metrics.render()
+    problems += validate(text)
+    # 찾지 못한 도시는 조회 결과로만, 끊긴 연결은 geocode 오류로 한 번만 센다
+    for needle in ['vedic_stage_seconds_count{stage="nominatim"} 5',
+                   'vedic_geocode_lookups_total{source="not_found"} 1',
+                   'vedic_geocode_lookups_total{source="error"} 1',
+                   'vedic_geocode_lookups_total{source="memory"} 1',
+                   'vedic_cache_requests_total{cache="chart",result="memory_hits"} 1',
+                   'vedic_upstream_requests_total{upstream="nominatim"} 5']:
+        if needle not in text:
+            problems.append(f"없음: {needle}")
+    errors = [line for line in text.splitlines() if line.startswith("vedic_errors_total")]
+    if errors != ['vedic_errors_total{stage="geocode",type="ConnectionError"} 1']:
+        problems.append(f"오류가 한 번씩만 세어지지 않음: {errors}")
+    details = [name for name, _, _, detail in timer.waterfall() if detail]
+    if "Nominatim 조회" not in details or not any(name.startswith("chart_") for name in details):
+        problems.append(f"워터폴 하위 구간 누락: {details}")
+
+    server = metrics.serve(0)
+    with urllib.request.urlopen(f"http://127.0.0.1:{server.server_address[1]}/metrics") as response:
+        served = response.read().decode()
+    server.shutdown()
+    path = os.path.join(os.environ["VEDIC_CACHE_DIR"], "metrics.prom")
+    metrics.write_file(path)
+    with open(path, encoding="utf-8") as f:
+        written = f.read()
+    if served != text or written != text:
+        problems.append("엔드포인트/파일 내용이 render()와 다름")
+    return problems, text
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, default=200000)
+    parser.add_argument("--max-off-ns", type=float, default=2000.0, help="꺼진 상태 호출당 비용 상한")
+    parser.add_argument("--show", action="store_true", help="render() 결과 출력")
+    args = parser.parse_args()
+
+    off, on = cost(False, args.n), cost(True, args.n)
+    print("호출당 비용 (ns, 빈 루프 제외):")
+    for key in ("stage", "inc", "observe"):
+        print(f"  {key:8s} 꺼짐 {off[key]:7.0f}   켜짐 {on[key]:7.0f}")
+
+    problems, text = exercise()
+    if args.show:
+        print(text)
+    print(f"내보내기: {len(text.splitlines())}줄, 문제 {len(problems)}건")
+    for problem in problems:
+        print(f"  {problem}")
+
+    slow = {k: v for k, v in off.items() if v > args.max_off_ns}
+    if slow:
+        print(f"실패: 꺼진 상태 비용이 상한 {args.max_off_ns:.0f} ns 초과: {slow}")
+    return 1 if problems or slow else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""명단 역색인 검증 및 조회 지연 측정: roster.RosterIndex vs 전체 스캔
+
+실행: python -m benchmarks.bench_roster [--sizes 10000 100000 1000000] [--queries 200] [-k 10]
+무작위 달 경도(경계 근처 값 포함) 명단마다 색인 조회 결과를 kuta_batch.one_vs_many로
+전체를 스캔한 결과와 비교한다 (상위 k개 총점 목록, 각 결과의 실제 점수와 제약 충족).
+하나라도 다르면 종료 코드 1로 끝난다.
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+import kuta_batch
+from benchmarks.bench_kuta_batch import random_longitudes
+from kuta_table import KUTA_NAMES
+from roster import RosterIndex
+
+CONSTRAINTS = [
+    ({}, 0),
+    ({"나디": 1}, 0),
+    ({"나디": 1, "바쿠트": 1}, 0),
+    ({"가나": 6}, 60),
+]
+
+
+def scan(moon_lon, lons, k, require, min_total):
+    """전체 스캔 기준 - 조건을 통과한 (인덱스 배열, 총점 배열, 쿠타 점수 배열) 중 상위 k"""
+    scores, totals = kuta_batch.one_vs_many(moon_lon, lons)
+    ok = totals >= min_total
+    for name, minimum in require.items():
+        ok &= scores[:, KUTA_NAMES.index(name)] >= minimum
+    candidates = np.flatnonzero(ok)
+    top = candidates[np.argsort(-totals[candidates].astype(np.int64), kind="stable")[:k]]
+    return top, totals, scores
+
+
+def percentile_ms(samples, q):
+    return np.percentile(samples, q) * 1000
+
+
+def run_size(n, queries, k, rng):
+    lons = random_longitudes(rng, n)
+    index = RosterIndex()
+    start = time.perf_counter()
+    index.add_many(range(n), lons)
+    bulk = time.perf_counter() - start
+
+    # 증분 추가 - 기존 색인에 한 명씩
+    extra = random_longitudes(rng, 2000)
+    start = time.perf_counter()
+    for i, lon in enumerate(extra):
+        index.add(n + i, lon)
+    incremental = (time.perf_counter() - start) / len(extra)
+    lons = np.concatenate([lons, extra])
+
+    mismatches = 0
+    index_times, scan_times = [], []
+    for q in range(queries):
+        moon = rng.uniform(0, 360)
+        require, min_total = CONSTRAINTS[q % len(CONSTRAINTS)]
+        start = time.perf_counter()
+        found = index.query(moon, k, require, min_total)
+        index_times.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        top, totals, scores = scan(moon, lons, k, require, min_total)
+        scan_times.append(time.perf_counter() - start)
+
+        problems = []
+        if [t for _, t, _ in found] != totals[top].tolist():
+            problems.append(f"총점 목록 {[t for _, t, _ in found]} != {totals[top].tolist()}")
+        for key, total, kutas in found:
+            if totals[key] != total or scores[key].tolist() != list(kutas.values()):
+                problems.append(f"{key}: 보고 {total}/{kutas} != 실제 {totals[key]}/{scores[key].tolist()}")
+            if total < min_total or any(kutas[name] < m for name, m in require.items()):
+                problems.append(f"{key}: 제약 위반 {kutas}")
+        if problems:
+            mismatches += 1
+            print(f"불일치 (달 {moon:.6f}, 제약 {require}, 최소 {min_total}): {'; '.join(problems[:3])}")
+
+    print(f"{n:>9,}명: 일괄 추가 {bulk * 1000:7.1f} ms, 증분 추가 {incremental * 1e6:5.1f} µs/명 | "
+          f"색인 p50 {percentile_ms(index_times, 50):7.3f} ms p99 {percentile_ms(index_times, 99):7.3f} ms | "
+          f"스캔 p50 {percentile_ms(scan_times, 50):7.2f} ms p99 {percentile_ms(scan_times, 99):7.2f} ms | "
+          f"불일치 {mismatches}/{queries}")
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    rng = np.random.default_rng(args.seed)
+    mismatches = sum(run_size(n, args.queries, args.k, rng) for n in args.sizes)
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
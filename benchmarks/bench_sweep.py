@@ -0,0 +1,98 @@
+"""출생 시간 스윕 검증 및 속도 측정: sweep.sweep_person vs 분마다 전체 차트 계산
+
+실행: python -m benchmarks.bench_sweep [--days 3] [--seed 0]
+무작위 날짜/도시마다 하루 1,440분 전체를 훑어 분마다의 달 파다 슬롯과 상승궁 별자리를
+vedic_core.fast_chart(캐시 없이) 결과와 비교하고, 경계 시각 앞뒤 1초도 확인한다.
+극권 도시(상승궁이 황도를 거꾸로 도는 구간이 있는 곳)의 하지/동지도 항상 함께 확인한다.
+하나라도 다르면 종료 코드 1로 끝난다.
+"""
+import argparse
+import random
+import sys
+import time
+
+import kuta_table
+import moon_table
+import sweep
+import vedic_core
+from benchmarks.bench_chart_backends import POLAR
+from gazetteer import CITIES
+from timezones import get_timezone
+
+
+def reference(day, lat, lon, tz_str):
+    """분마다 전체 차트를 계산한 (슬롯 목록, 상승궁 목록) - DST로 없는 시각은 None"""
+    slots, ascendants = [], []
+    for minute in range(1440):
+        try:
+            chart = vedic_core.fast_chart("p", *day, minute // 60, minute % 60, lat, lon, tz_str)
+        except Exception:
+            slots.append(None)
+            ascendants.append(None)
+            continue
+        slots.append(kuta_table.moon_slot(chart["moon_lon"]))
+        ascendants.append(chart["ascendant"])
+    return slots, ascendants
+
+
+def check_crossings(result, lat, lon):
+    """경계 시각 1초 전/후의 정확한 값이 from/to 와 일치하는지"""
+    problems = 0
+    for c in result["crossings"]:
+        for offset, expected in ((-1.0, c["from"]), (1.0, c["to"])):
+            at = c["jd"] + offset / 86400
+            if c["kind"] == "상승궁":
+                sign = int(sweep._exact_ascendant(at, lat, lon) // 30) % 12
+                got = vedic_core.RASHI_KO[vedic_core.SIGN_ORDER[sign]]
+            else:
+                got = sweep.slot_label(kuta_table.moon_slot(float(moon_table._exact([at])[0])))
+            if got != expected:
+                problems += 1
+                print(f"경계 불일치 {c['time']} {c['kind']}: {offset:+.0f}초 {got} != {expected}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    cases = []
+    for _ in range(args.days):
+        lat, lon, address, _ = rng.choice(CITIES)
+        day = (rng.randint(1900, 2026), rng.randint(1, 12), rng.randint(1, 28))
+        cases.append((day, lat, lon, address.split(",")[0], get_timezone(lat, lon)))
+    cases += [(day, lat, lon, city, tz_str) for city, lat, lon, tz_str in POLAR
+              for day in ((1990, 6, 21), (1990, 12, 21))]
+
+    mismatches = 0
+    sweep_time = full_time = 0.0
+    for day, lat, lon, city, tz_str in cases:
+
+        start = time.perf_counter()
+        result = sweep.sweep_person(*day, lat, lon, tz_str)
+        sweep_time += time.perf_counter() - start
+        start = time.perf_counter()
+        slots, ascendants = reference(day, lat, lon, tz_str)
+        full_time += time.perf_counter() - start
+
+        swept_asc = [vedic_core.RASHI_KO[vedic_core.SIGN_ORDER[s]] for s in result["asc_signs"]]
+        bad = [m for m in range(1440) if slots[m] is not None
+               and (slots[m] != result["slots"][m] or ascendants[m] != swept_asc[m])]
+        bad_crossings = check_crossings(result, lat, lon)
+        mismatches += len(bad) + bad_crossings
+        print(f"{day} {city} ({tz_str}): 경계 {len(result['crossings'])}개, "
+              f"분 단위 불일치 {len(bad)}건, 경계 불일치 {bad_crossings}건")
+        for m in bad[:5]:
+            print(f"  {m // 60:02d}:{m % 60:02d} 슬롯 {slots[m]} vs {result['slots'][m]}, "
+                  f"상승궁 {ascendants[m]} vs {swept_asc[m]}")
+
+    print(f"스윕:           {sweep_time / len(cases) * 1000:8.1f} ms/일")
+    print(f"분마다 전체 차트: {full_time / len(cases) * 1000:8.1f} ms/일 ({full_time / sweep_time:.0f}배)")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
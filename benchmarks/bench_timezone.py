@@ -0,0 +1,69 @@
+"""타임존 조회 비용 비교: 호출마다 TimezoneFinder() 생성 vs 공용 인스턴스 vs 캐시
+
+실행: python -m benchmarks.bench_timezone [--repeat 20]
+"""
+import argparse
+import random
+import time
+
+import timezones
+
+# 한국/해외 출생지 좌표 표본
+COORDS = [
+    (37.5666791, 126.9782914), (35.1799528, 129.0752365), (33.4996213, 126.5311884),
+    (35.6768601, 139.7638947), (51.5074456, -0.1277653), (40.7127281, -74.0060152),
+    (-33.8698439, 151.2082848), (28.6138954, 77.2090057), (48.8534951, 2.3483915),
+    (34.0536909, -118.2427660),
+]
+
+
+def _per_call_ms(fn, repeat):
+    start = time.perf_counter()
+    for i in range(repeat):
+        fn(*COORDS[i % len(COORDS)])
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    from timezonefinder import TimezoneFinder
+
+    def legacy(lat, lon):
+        return TimezoneFinder().timezone_at(lat=lat, lng=lon) or "UTC"
+
+    legacy_ms = _per_call_ms(legacy, args.repeat)
+
+    start = time.perf_counter()
+    timezones.get_finder()
+    load_ms = (time.perf_counter() - start) * 1000
+
+    def shared(lat, lon):
+        # 캐시를 건너뛰고 공용 인스턴스만 사용
+        return timezones.get_finder().timezone_at(lat=lat, lng=lon) or "UTC"
+
+    shared_ms = _per_call_ms(shared, args.repeat * 50)
+
+    timezones.clear_cache()
+    cached_ms = _per_call_ms(timezones.get_timezone, args.repeat * 500)
+
+    rng = random.Random(0)
+    batch = [(rng.uniform(-60, 70), rng.uniform(-180, 180)) for _ in range(10000)]
+    timezones.clear_cache()
+    start = time.perf_counter()
+    timezones.get_timezones(batch)
+    batch_ms = (time.perf_counter() - start) * 1000 / len(batch)
+
+    print(f"{'방식':<28}{'ms/호출':>12}")
+    print(f"{'호출마다 TimezoneFinder()':<28}{legacy_ms:>12.3f}")
+    print(f"{'공용 인스턴스 최초 로드':<28}{load_ms:>12.3f}")
+    print(f"{'공용 인스턴스 (캐시 미스)':<28}{shared_ms:>12.3f}")
+    print(f"{'공용 인스턴스 + 캐시':<28}{cached_ms:>12.4f}")
+    print(f"{'배치 조회 (무작위 10k)':<28}{batch_ms:>12.4f}")
+    print(f"개선 배율 (캐시 미스 기준): {legacy_ms / shared_ms:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+"""핫 패스 벤치마크 모음 - 고정 출생 정보 코퍼스(benchmarks/corpus.json), 네트워크 없이
+
+실행: python -m benchmarks.suite [--quick] [--only 이름,...] [--repeat 3]
+                                 [--out PATH] [--baseline PATH|커밋] [--tolerance 0.25]
+- Nominatim은 geocoding.StubGeocoder(코퍼스의 places)로, OpenAI는 mock_openai_server로 대신하고
+  디스크 캐시는 임시 디렉터리를 쓴다.
+- 경우마다 처리량(회/초), 호출당 지연 p50/p95/p99, 최대 메모리(tracemalloc, 별도 1회)를 보고한다.
+  "cold"는 매 회차 전에 캐시를 비우고, "warm"은 캐시 적중 경로를 잰다.
+- 결과는 JSON으로 저장한다 (기본 benchmarks/results/<커밋>.json).
+- --baseline 을 주면 같은 경우의 p50이 (1 + tolerance)배 + slack 보다 느려졌거나 최대 메모리가
+  (1 + memory-tolerance)배를 넘으면 종료 코드 1로 끝난다 (회귀 관문).
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CORPUS = os.path.join(ROOT, "benchmarks", "corpus.json")
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+API_KEY = "sk-bench"
+
+
+def load_corpus(path=CORPUS):
+    with open(path, encoding="utf-8") as f:
+        corpus = json.load(f)
+    for person in corpus["people"]:
+        person["birth"] = date.fromisoformat(person["date"])
+    return corpus
+
+
+def percentile(sorted_values, q):
+    """최근접 순위 백분위수"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(q / 100 * len(sorted_values) + 0.5) - 1))
+    return sorted_values[index]
+
+
+class Case:
+    """call(*args)를 items 각각에 대해 호출 - reset은 매 회차 전에 (캐시 비우기 등)"""
+
+    def __init__(self, name, call, items, reset=None, inner=1):
+        self.name = name
+        self.call = call
+        self.items = items
+        self.reset = reset
+        # 호출이 너무 짧은 경우 한 표본에 inner번 묶어 잰다 (지연은 호출당으로 나눔)
+        self.inner = inner
+
+    def _pass(self, latencies):
+        if self.reset:
+            self.reset()
+        call, inner = self.call, self.inner
+        clock = time.perf_counter_ns
+        start = time.perf_counter()
+        for args in self.items:
+            t = clock()
+            for _ in range(inner):
+                call(*args)
+            latencies.append((clock() - t) / inner)
+        return time.perf_counter() - start
+
+    def run(self, repeat):
+        self._pass([])  # 예열 (지연 임포트, 파일 캐시)
+        latencies = []
+        elapsed = sum(self._pass(latencies) for _ in range(repeat))
+        latencies.sort()
+
+        tracemalloc.start()
+        if self.reset:
+            self.reset()
+        base = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        reset, self.reset = self.reset, None
+        try:
+            self._pass([])
+        finally:
+            self.reset = reset
+        peak = tracemalloc.get_traced_memory()[1] - base
+        tracemalloc.stop()
+
+        calls = len(latencies) * self.inner
+        return {
+            "n": calls,
+            "ops_per_sec": calls / elapsed,
+            "mean_ms": sum(latencies) / len(latencies) / 1e6,
+            "p50_ms": percentile(latencies, 50) / 1e6,
+            "p95_ms": percentile(latencies, 95) / 1e6,
+            "p99_ms": percentile(latencies, 99) / 1e6,
+            "peak_kib": max(peak, 0) / 1024,
+        }
+
+
+def build_cases(corpus, quick):
+    """(이름, Case) 목록 - 모듈 임포트는 캐시 디렉터리/스텁 설정 뒤에"""
+    import chart_cache
+    import geocoding
+    import interpretation_cache
+    import timezones
+    import vedic_core
+    from concurrent.futures import ThreadPoolExecutor
+    from pipeline import StageTimer, compute_person_chart
+    from vedic_compatibility_app import create_kundli_chart
+
+    people = corpus["people"][:60] if quick else corpus["people"]
+    births = []
+    for p in people:
+        lat, lon, _ = geocoding.get_location_coordinates(p["city"])
+        hour, minute = vedic_core.parse_birth_time(p["time"])
+        d = p["birth"]
+        births.append((p["name"], d.year, d.month, d.day, hour, minute, lat, lon, timezones.get_timezone(lat, lon)))
+    charts = [vedic_core.fast_chart(*b) for b in births]
+    pairs = [(charts[i], charts[(i * 7 + 3) % len(charts)]) for i in range(len(charts))]
+    coords = list(dict.fromkeys((b[6], b[7]) for b in births))
+    couples = [(people[i], people[i + 1]) for i in range(0, len(people) - 1, 2)]
+
+    def clear_all():
+        geocoding.clear_caches()
+        timezones.clear_cache()
+        chart_cache.clear()
+        interpretation_cache.clear()
+
+    def analyze(p1, p2):
+        # 앱의 분석 요청과 같은 순서: 두 사람 체인 병렬 → 점수 → Kundli → 해석 스트림
+        timer = StageTimer()
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [executor.submit(compute_person_chart, i + 1, p["name"], p["birth"],
+                                       *vedic_core.parse_birth_time(p["time"]), p["city"], timer)
+                       for i, p in enumerate((p1, p2))]
+            chart1, chart2 = [f.result() for f in futures]
+        scores, total = vedic_core.calculate_ashta_kuta(chart1, chart2)
+        create_kundli_chart(chart1, p1["name"])
+        create_kundli_chart(chart2, p2["name"])
+        timings = {}
+        for _ in interpretation_cache.stream(chart1, chart2, scores, total, p1["name"], p2["name"],
+                                             API_KEY, timings):
+            pass
+        if "error" in timings:
+            raise RuntimeError(timings["error"])
+
+    kerykeion_births = births[:20] if quick else births[:80]
+    return [
+        Case("get_nakshatra", vedic_core.get_nakshatra, [(c["moon_lon"],) for c in charts], inner=50),
+        Case("calculate_ashta_kuta", vedic_core.calculate_ashta_kuta, pairs, inner=20),
+        Case("calculate_chart.fast.cold", lambda *b: vedic_core.calculate_chart(*b, backend="fast"),
+             births, reset=chart_cache.clear),
+        Case("calculate_chart.kerykeion.cold", lambda *b: vedic_core.calculate_chart(*b, backend="kerykeion"),
+             kerykeion_births, reset=chart_cache.clear),
+        Case("calculate_chart.warm", lambda *b: vedic_core.calculate_chart(*b, backend="fast"), births, inner=10),
+        Case("create_kundli_chart", create_kundli_chart, [(c, c["name"]) for c in charts], inner=5),
+        Case("get_timezone.cold", timezones.get_timezone, coords, reset=timezones.clear_cache),
+        Case("get_timezone.warm", timezones.get_timezone, coords, inner=50),
+        Case("get_location_coordinates.cold", geocoding.get_location_coordinates,
+             [(p["city"],) for p in people], reset=geocoding.clear_caches),
+        Case("pipeline.cold", analyze, couples, reset=clear_all),
+        Case("pipeline.warm", analyze, couples),
+    ]
+
+
+def git_revision():
+    try:
+        rev = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                             text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT,
+                               capture_output=True, text=True, check=True).stdout.strip()
+        return rev + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def resolve_baseline(value):
+    """파일 경로 또는 results/ 아래 커밋 이름"""
+    if os.path.exists(value):
+        return value
+    return os.path.join(RESULTS_DIR, f"{value}.json")
+
+
+def compare(results, baseline, tolerance, memory_tolerance, slack_ms):
+    """회귀 목록 [(경우, 설명)] 과 표시용 줄"""
+    regressions, lines = [], []
+    for name, current in results.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        ratio = current["p50_ms"] / before["p50_ms"] if before["p50_ms"] else 1.0
+        mark = ""
+        if current["p50_ms"] > before["p50_ms"] * (1 + tolerance) + slack_ms:
+            mark = "  ← 느려짐"
+            regressions.append((name, f"p50 {before['p50_ms']:.4f} → {current['p50_ms']:.4f} ms ({ratio:.2f}배)"))
+        memory_limit = before["peak_kib"] * (1 + memory_tolerance) + 64
+        if current["peak_kib"] > memory_limit:
+            mark += "  ← 메모리 증가"
+            regressions.append((name, f"최대 메모리 {before['peak_kib']:.0f} → {current['peak_kib']:.0f} KiB"))
+        lines.append(f"  {name:32s} p50 {ratio:5.2f}배  처리량 "
+                     f"{current['ops_per_sec'] / before['ops_per_sec']:5.2f}배{mark}")
+    return regressions, lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="코퍼스 일부만 (빠른 확인용)")
+    parser.add_argument("--only", help="쉼표로 구분한 경우 이름 접두사")
+    parser.add_argument("--repeat", type=int, default=3, help="측정 회차 수")
+    parser.add_argument("--out", help="결과 JSON 경로 (기본 benchmarks/results/<커밋>.json)")
+    parser.add_argument("--no-save", action="store_true")
+    parser.add_argument("--baseline", help="비교할 결과 JSON 경로 또는 results/ 아래 커밋 이름")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="p50 허용 증가 비율")
+    parser.add_argument("--memory-tolerance", type=float, default=0.5, help="최대 메모리 허용 증가 비율")
+    parser.add_argument("--slack-ms", type=float, default=0.002, help="아주 짧은 경우의 측정 잡음 여유 (ms)")
+    args = parser.parse_args()
+
+    # 디스크 캐시와 외부 서비스를 모두 로컬로 - 모듈 임포트 전에 정해야 한다
+    os.environ["VEDIC_CACHE_DIR"] = tempfile.mkdtemp(prefix="vedic-bench-")
+    os.environ.setdefault("VEDIC_METRICS", "0")
+    # 스텁 상대로는 속도 제한 없이 중개 경로(single-flight, 대기열)만 거친다
+    os.environ.setdefault("VEDIC_NOMINATIM_RATE", "0")
+    os.environ.setdefault("VEDIC_OPENAI_RATE", "0")
+    import mock_openai_server
+    server, base_url = mock_openai_server.start(ttft=0.0, delay=0.0)
+    os.environ["OPENAI_BASE_URL"] = base_url
+    import geocoding
+
+    corpus = load_corpus()
+    geocoding.set_geocoder(geocoding.StubGeocoder(corpus["places"]))
+    cases = build_cases(corpus, args.quick)
+    if args.only:
+        prefixes = tuple(args.only.split(","))
+        cases = [c for c in cases if c.name.startswith(prefixes)]
+
+    results = {}
+    print(f"{'경우':32s} {'n':>7s} {'회/초':>12s} {'p50 ms':>9s} {'p95 ms':>9s} {'p99 ms':>9s} {'최대 KiB':>9s}")
+    for case in cases:
+        r = results[case.name] = case.run(args.repeat)
+        print(f"{case.name:32s} {r['n']:7d} {r['ops_per_sec']:12,.0f} {r['p50_ms']:9.4f} "
+              f"{r['p95_ms']:9.4f} {r['p99_ms']:9.4f} {r['peak_kib']:9.0f}")
+    import llm
+    for client in llm._clients.values():
+        client.close()
+    server.shutdown()
+    doc = {
+        "meta": {
+            "revision": git_revision(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "quick": args.quick,
+            "repeat": args.repeat,
+            "corpus_people": len(corpus["people"]),
+            "stub_geocoder_calls": len(geocoding.get_geocoder().calls),
+            "openai_requests": server.requests,
+        },
+        "cases": results,
+    }
+    if not args.no_save:
+        out = args.out or os.path.join(RESULTS_DIR, f"{doc['meta']['revision']}{'-quick' if args.quick else ''}.json")
+        os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+        with open(out, "w", encoding="utf-8") as f:
+            json.dump(doc, f, ensure_ascii=False, indent=1)
+        print(f"저장: {os.path.relpath(out, ROOT)}")
+
+    if not args.baseline:
+        return 0
+    with open(resolve_baseline(args.baseline), encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions, lines = compare(results, baseline["cases"], args.tolerance, args.memory_tolerance, args.slack_ms)
+    print(f"기준 {baseline['meta']['revision']} 대비 (허용 p50 +{args.tolerance:.0%}, 메모리 +{args.memory_tolerance:.0%}):")
+    print("\n".join(lines))
+    for name, detail in regressions:
+        print(f"실패: {name} {detail}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,273 @@
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+import metrics
+
+# 외부 서비스 호출 중개 - 프로세스 안의 모든 Streamlit 세션이 공유한다.
+#   - single-flight: 같은 키로 동시에 들어온 요청은 업스트림 호출(스트림) 하나를 함께 기다린다
+#   - 토큰 버킷(GCRA): 업스트림별 초당 요청 수/버스트 상한 (Nominatim 이용 정책은 1회/초)
+#   - 제한된 대기열: 동시 호출 수 + 대기 자리가 차 있거나 예상 대기가 max_wait를 넘으면
+#     스레드를 쌓아 두지 않고 바로 BusyError
+# 업스트림별 설정은 VEDIC_<이름>_RATE/_BURST/_CONCURRENCY/_QUEUE/_MAX_WAIT 로 바꿀 수 있고
+# (RATE=0 은 속도 제한 없음), VEDIC_BROKER=0 이면 중개 없이 바로 호출한다.
+ENABLED = os.environ.get("VEDIC_BROKER", "1") != "0"
+
+DEFAULTS = {
+    "nominatim": {"rate": 1.0, "burst": 1, "concurrency": 1, "queue": 8, "max_wait": 10.0},
+    "openai": {"rate": 5.0, "burst": 10, "concurrency": 8, "queue": 32, "max_wait": 15.0},
+}
+
+metrics.describe("vedic_broker_total", "counter", "중개 결과별 요청 수 (upstream=업스트림 호출, coalesced=합류, busy=거절)")
+metrics.describe("vedic_broker_pending", "gauge", "대기 중이거나 호출 중인 업스트림 요청 수")
+
+
+class BusyError(RuntimeError):
+    """대기열이 가득 찼거나 속도 제한으로 오래 기다려야 할 때 - 바로 돌려준다"""
+
+    def __init__(self, upstream, reason):
+        super().__init__(f"요청이 몰려 있습니다 ({upstream}: {reason}). 잠시 후 다시 시도해주세요.")
+        self.upstream = upstream
+        self.reason = reason
+
+
+class _Flight:
+    """진행 중인 업스트림 호출 하나 - 결과나 스트림 조각을 합류한 요청들과 나눈다"""
+
+    def __init__(self):
+        self.cond = threading.Condition()
+        self.chunks = []
+        self.done = False
+        self.result = None
+        self.error = None
+
+    def push(self, chunk):
+        with self.cond:
+            self.chunks.append(chunk)
+            self.cond.notify_all()
+
+    def finish(self, result=None, error=None):
+        with self.cond:
+            self.result, self.error, self.done = result, error, True
+            self.cond.notify_all()
+
+    def wait(self):
+        with self.cond:
+            self.cond.wait_for(lambda: self.done)
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+    def follow(self):
+        """처음부터 지금까지 쌓인 조각을 내보내고, 끝날 때까지 새 조각을 따라간다"""
+        read = 0
+        while True:
+            with self.cond:
+                self.cond.wait_for(lambda: self.done or len(self.chunks) > read)
+                new, done = self.chunks[read:], self.done
+            read += len(new)
+            yield from new
+            if done:
+                if self.error is not None:
+                    raise self.error
+                return
+
+
+class Upstream:
+    def __init__(self, name, rate, burst=1, concurrency=1, queue=8, max_wait=10.0):
+        self.name = name
+        self.rate = rate
+        self.burst = max(int(burst), 1)
+        self.concurrency = max(int(concurrency), 1)
+        self.queue = max(int(queue), 0)
+        self.max_wait = max_wait
+        self.stats = {"upstream": 0, "coalesced": 0, "busy": 0}
+        self._interval = 1.0 / rate if rate else 0.0
+        self._tat = 0.0  # GCRA 이론적 도착 시각
+        self._pending = 0  # 대기 중이거나 호출 중인 요청
+        self._holding = []  # 자리를 잡은 호출들의 시작 시각
+        self._hold = 0.0  # 자리 하나를 잡고 있는 시간 (지수 이동 평균)
+        self._slots = threading.BoundedSemaphore(self.concurrency)
+        self._lock = threading.Lock()
+        self._flights = {}
+
+    def _busy(self, reason):
+        self.stats["busy"] += 1
+        metrics.inc("vedic_broker_total", upstream=self.name, result="busy")
+        return BusyError(self.name, reason)
+
+    def _slot_wait(self, now):
+        """동시 호출 자리가 날 때까지의 예상 대기 (초) - 잠금 안에서 부른다
+
+        진행 중인 호출이 이미 평균보다 오래 걸리고 있으면 그 경과 시간을 보유 시간으로 본다
+        (처음 몰린 긴 스트림들처럼 아직 끝난 호출이 없을 때도 기다릴 만한지 판단할 수 있게).
+        """
+        ahead = self._pending - self.concurrency
+        if ahead < 0:
+            return 0.0
+        hold = self._hold
+        if self._holding:
+            hold = max(hold, now - min(self._holding))
+        return (ahead // self.concurrency + 1) * hold
+
+    def _admit(self, now):
+        """대기열 자리와 속도 제한 토큰 예약 - 보낼 수 있는 시각 반환"""
+        with self._lock:
+            if self._pending >= self.concurrency + self.queue:
+                raise self._busy("대기열 가득 참")
+            if self._slot_wait(now) > self.max_wait:
+                raise self._busy("동시 호출 수 초과")
+            ready = now
+            if self._interval:
+                tat = max(self._tat, now)
+                ready = max(now, tat - (self.burst - 1) * self._interval)
+                if ready - now > self.max_wait:
+                    raise self._busy("속도 제한")
+                self._tat = tat + self._interval
+            self._pending += 1
+            return ready
+
+    def _refund(self):
+        """자리를 얻지 못하고 돌아간 요청의 속도 제한 토큰 반납"""
+        with self._lock:
+            if self._interval:
+                self._tat -= self._interval
+
+    @contextmanager
+    def slot(self):
+        """업스트림 요청 하나의 자리 - 대기열/속도 제한/동시 호출 수를 지킨 뒤 들어간다"""
+        start = time.monotonic()
+        ready = self._admit(start)
+        try:
+            if ready > start:
+                time.sleep(ready - start)
+            if not self._slots.acquire(timeout=max(start + self.max_wait - time.monotonic(), 0)):
+                self._refund()
+                raise self._busy("동시 호출 수 초과")
+            acquired = time.monotonic()
+            with self._lock:
+                self._holding.append(acquired)
+            try:
+                metrics.observe("vedic_stage_seconds", acquired - start, stage=f"queue_{self.name}")
+                self.stats["upstream"] += 1
+                metrics.inc("vedic_broker_total", upstream=self.name, result="upstream")
+                yield
+            finally:
+                held = time.monotonic() - acquired
+                with self._lock:
+                    self._holding.remove(acquired)
+                    self._hold = held if not self._hold else 0.8 * self._hold + 0.2 * held
+                self._slots.release()
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def _join(self, key):
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+                return flight, True
+        self.stats["coalesced"] += 1
+        metrics.inc("vedic_broker_total", upstream=self.name, result="coalesced")
+        return flight, False
+
+    def _leave(self, key, flight):
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+
+    def coalesce(self, key, fn, *args, **kwargs):
+        """같은 key의 동시 호출은 fn 한 번의 결과(또는 예외)를 함께 받는다"""
+        flight, leader = self._join(key)
+        if not leader:
+            return flight.wait()
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            flight.finish(error=e)
+            raise
+        finally:
+            self._leave(key, flight)
+        flight.finish(result)
+        return result
+
+    def coalesce_stream(self, key, open_stream):
+        """스트림 single-flight - 선두가 읽은 조각을 같은 key의 후발 요청도 처음부터 따라 읽는다
+
+        선두 요청의 소비자가 중간에 그만두면 합류한 요청은 BusyError로 끝난다.
+        """
+        flight, leader = self._join(key)
+        if not leader:
+            yield from flight.follow()
+            return
+        try:
+            for chunk in open_stream():
+                flight.push(chunk)
+                yield chunk
+        except Exception as e:
+            flight.finish(error=e)
+            raise
+        except BaseException:
+            flight.finish(error=BusyError(self.name, "함께 기다리던 요청이 중단됨"))
+            raise
+        else:
+            flight.finish()
+        finally:
+            self._leave(key, flight)
+
+
+_upstreams = {}
+_upstreams_lock = threading.Lock()
+
+
+def _settings(name):
+    settings = dict(DEFAULTS.get(name, DEFAULTS["openai"]))
+    for key, default in settings.items():
+        value = os.environ.get(f"VEDIC_{name.upper()}_{key.upper()}")
+        if value is not None:
+            settings[key] = type(default)(value)
+    return settings
+
+
+def get(name):
+    """업스트림별 공용 중개자 (최초 사용 시 기본값 + 환경 변수로 생성)"""
+    upstream = _upstreams.get(name)
+    if upstream is None:
+        with _upstreams_lock:
+            upstream = _upstreams.get(name)
+            if upstream is None:
+                upstream = _upstreams[name] = Upstream(name, **_settings(name))
+    return upstream
+
+
+def configure(name, **settings):
+    """업스트림 설정 교체 (부하 시험/벤치마크용) - 진행 중인 호출은 이전 중개자에서 끝난다"""
+    merged = {**_settings(name), **settings}
+    with _upstreams_lock:
+        _upstreams[name] = upstream = Upstream(name, **merged)
+    return upstream
+
+
+def slot(name):
+    if not ENABLED:
+        return nullcontext()
+    return get(name).slot()
+
+
+def coalesce(name, key, fn, *args, **kwargs):
+    if not ENABLED:
+        return fn(*args, **kwargs)
+    return get(name).coalesce(key, fn, *args, **kwargs)
+
+
+def coalesce_stream(name, key, open_stream):
+    if not ENABLED:
+        return open_stream()
+    return get(name).coalesce_stream(key, open_stream)
+
+
+@metrics.register_collector
+def _collect():
+    return [("vedic_broker_pending", {"upstream": name}, u._pending) for name, u in list(_upstreams.items())]
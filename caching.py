@@ -0,0 +1,154 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import metrics
+
+# 디스크 캐시 기본 위치 (VEDIC_CACHE_DIR 환경변수로 변경 가능)
+CACHE_DIR = os.environ.get(
+    "VEDIC_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "vedic_astrology_app"),
+)
+
+
+class LRUCache:
+    """스레드 안전한 인메모리 LRU 캐시 (선택적 TTL)"""
+
+    def __init__(self, maxsize=1024, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return default
+            expires, value = item
+            if expires is not None and expires < time.time():
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        expires = time.time() + ttl if ttl else None
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+
+class DiskCache:
+    """SQLite 기반 영속 캐시 - 여러 워커 프로세스가 같은 파일을 공유
+
+    값은 JSON으로 직렬화하며, TTL이 지난 항목과 max_entries를 넘는
+    오래된 항목(마지막 접근 기준)은 쓰기 시점에 정리한다.
+    """
+
+    def __init__(self, path, table="cache", ttl=None, max_entries=None):
+        self.path = path
+        self.table = table
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+
+    def _connect(self):
+        # fork된 워커는 부모의 연결을 물려받지 않고 새로 연다
+        if self._conn is None or self._pid != os.getpid():
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "expires REAL, accessed REAL NOT NULL)"
+            )
+            conn.execute(
+                f"CREATE INDEX IF NOT EXISTS {self.table}_accessed ON {self.table}(accessed)"
+            )
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    def get(self, key, default=None):
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connect()
+                row = conn.execute(
+                    f"SELECT value, expires FROM {self.table} WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None or (row[1] is not None and row[1] < now):
+                    self.misses += 1
+                    return default
+                conn.execute(f"UPDATE {self.table} SET accessed = ? WHERE key = ?", (now, key))
+                conn.commit()
+                self.hits += 1
+                return json.loads(row[0])
+        except sqlite3.Error as e:
+            metrics.error(f"disk_cache_{self.table}", e)
+            self.misses += 1
+            return default
+
+    def set(self, key, value, ttl=None):
+        now = time.time()
+        ttl = self.ttl if ttl is None else ttl
+        expires = now + ttl if ttl else None
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute(
+                    f"INSERT OR REPLACE INTO {self.table} (key, value, expires, accessed) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(value, ensure_ascii=False), expires, now),
+                )
+                self._evict(conn, now)
+                conn.commit()
+        except sqlite3.Error as e:
+            metrics.error(f"disk_cache_{self.table}", e)
+
+    def _evict(self, conn, now):
+        conn.execute(
+            f"DELETE FROM {self.table} WHERE expires IS NOT NULL AND expires < ?", (now,)
+        )
+        if self.max_entries:
+            conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN ("
+                f"SELECT key FROM {self.table} ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def clear(self):
+        with self._lock:
+            conn = self._connect()
+            conn.execute(f"DELETE FROM {self.table}")
+            conn.commit()
+            self.hits = self.misses = 0
+
+    def __len__(self):
+        with self._lock:
+            return self._connect().execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
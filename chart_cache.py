@@ -0,0 +1,74 @@
+import os
+from datetime import datetime
+
+import metrics
+from caching import CACHE_DIR, DiskCache, LRUCache
+
+# 차트 결과 캐시 - 이름을 뺀 chart_data만 저장해 같은 출생 정보는 한 항목을 공유한다
+_memory = LRUCache(maxsize=512)
+# 디스크 계층은 여러 워커 프로세스가 공유 (VEDIC_CHART_DISK_CACHE=0 으로 끌 수 있음)
+_disk = None
+if os.environ.get("VEDIC_CHART_DISK_CACHE", "1") != "0":
+    _disk = DiskCache(
+        os.path.join(CACHE_DIR, "charts.sqlite3"),
+        table="charts",
+        max_entries=200000,
+    )
+
+stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+
+
+@metrics.register_collector
+def _collect():
+    return [("vedic_cache_requests_total", {"cache": "chart", "result": k}, v) for k, v in stats.items()]
+
+
+def chart_key(year, month, day, hour, minute, lat, lon, tz_str,
+              zodiac_type="Sidereal", sidereal_mode="LAHIRI", backend="kerykeion"):
+    """(UTC 출생 시각, 반올림한 위경도, 조디악 설정, 계산 백엔드)으로 만든 캐시 키"""
+    import pytz
+    local = pytz.timezone(tz_str).localize(datetime(year, month, day, hour, minute))
+    utc = local.astimezone(pytz.utc)
+    return f"{utc:%Y-%m-%dT%H:%M}Z|{lat:.4f}|{lon:.4f}|{zodiac_type}|{sidereal_mode}|{backend}"
+
+
+def _copy(chart):
+    """planets 안쪽 dict까지 복사 - 받은 쪽이 고쳐도 캐시 항목(모든 세션이 공유)은 그대로"""
+    copied = dict(chart)
+    copied["planets"] = {body: dict(info) for body, info in chart["planets"].items()}
+    return copied
+
+
+def get(key, name):
+    """캐시된 차트에 이름을 붙여 새 dict로 반환, 없으면 None"""
+    chart = _memory.get(key)
+    if chart is not None:
+        stats["memory_hits"] += 1
+    elif _disk is not None and (chart := _disk.get(key)) is not None:
+        stats["disk_hits"] += 1
+        _memory.set(key, chart)
+    else:
+        stats["misses"] += 1
+        return None
+    return {"name": name, **_copy(chart)}
+
+
+def put(key, chart_data):
+    chart = _copy({k: v for k, v in chart_data.items() if k != "name"})
+    _memory.set(key, chart)
+    if _disk is not None:
+        _disk.set(key, chart)
+
+
+def hit_rate():
+    hits = stats["memory_hits"] + stats["disk_hits"]
+    total = hits + stats["misses"]
+    return hits / total if total else 0.0
+
+
+def clear():
+    _memory.clear()
+    if _disk is not None:
+        _disk.clear()
+    for k in stats:
+        stats[k] = 0
@@ -0,0 +1,228 @@
+import json
+import os
+import struct
+
+import numpy as np
+
+from kuta_table import KUTA_NAMES, TABLE
+from vedic_core import NAKSHATRAS, RASHI_KO, SIGN_ORDER, build_chart_data, moon_slot
+
+# 압축 차트 표현 - chart_data(한글 표시 문자열이 든 중첩 dict, 차트당 수 KB) 대신
+# 경도는 float32(달만 float64), 별자리는 SIGN_ORDER 인덱스, 달은 낙샤트라 인덱스와 파다 번호로만 담고
+# 표시 문자열은 to_chart_data()에서 그릴 때만 만든다.
+
+# 경도/별자리 열 순서 (케투는 라후에서 유도)
+BODIES = ["상승궁", "태양", "달", "수성", "금성", "화성", "목성", "토성", "라후"]
+_PLANETS = BODIES[1:8]
+# 저장소 열 이름 (파일 이름으로 쓰므로 ASCII)
+_FIELD = ["asc", "sun", "moon", "mercury", "venus", "mars", "jupiter", "saturn", "rahu"]
+
+# 경도 9개, 별자리 코드 9개, 낙샤트라 인덱스, 파다(get_nakshatra 값)
+# 달 경도는 float64 - float32로 줄이면 파다 경계 근처에서 복원한 chart_data의 궁합 점수가 달라진다
+_STRUCT = struct.Struct("<2fd6f9BBB")
+_SIGN_CODE = {label: i for i, label in enumerate(RASHI_KO[s] for s in SIGN_ORDER)}
+
+COLUMNS = (
+    [(f"{f}_lon", "<f8" if f == "moon" else "<f4") for f in _FIELD]
+    + [(f"{f}_sign", "u1") for f in _FIELD]
+    + [("nakshatra", "u1"), ("pada", "u1")]
+)
+# 열을 모은 한 행 - 패딩 없는 구조체라 _STRUCT 와 바이트 배치가 같다
+_ROW_DTYPE = np.dtype(COLUMNS)
+
+
+def _moon_codes(moon_lon):
+    """get_nakshatra 와 같은 산식의 (낙샤트라 인덱스, 파다) - float64 경도로 계산해 경계에서도 원본과 같다"""
+    slot = moon_slot(moon_lon)
+    return slot // 4, slot % 4 + 1
+
+
+class ChartRecord:
+    """이름 + struct로 묶은 51바이트 - 값은 필요할 때 풀어 쓴다"""
+
+    __slots__ = ("name", "raw")
+
+    def __init__(self, name, raw):
+        self.name = name
+        self.raw = raw
+
+    @classmethod
+    def from_values(cls, name, lons, signs, nakshatra, pada):
+        return cls(name, _STRUCT.pack(*lons, *signs, nakshatra, pada))
+
+    @classmethod
+    def from_chart_data(cls, chart):
+        """chart_data → 레코드 (chart_data에는 상승궁 경도가 없어 NaN으로 둔다)"""
+        planets = chart["planets"]
+        lons = [float("nan")] + [planets[b]["lon"] for b in BODIES[1:]]
+        signs = [_SIGN_CODE[chart["ascendant"]]] + [_SIGN_CODE[planets[b]["sign"]] for b in BODIES[1:]]
+        return cls.from_values(chart["name"], lons, signs, *_moon_codes(chart["moon_lon"]))
+
+    @classmethod
+    def from_positions(cls, name, positions):
+        """ephemeris.positions 결과 → 레코드 (chart_data를 거치지 않는 대량 저장용)"""
+        lons = [positions[b] for b in BODIES]
+        signs = [int(lon // 30) % 12 for lon in lons]
+        return cls.from_values(name, lons, signs, *_moon_codes(positions["달"]))
+
+    def values(self):
+        """(경도 9개, 별자리 코드 9개, 낙샤트라, 파다) 튜플"""
+        return _STRUCT.unpack(self.raw)
+
+    @property
+    def lons(self):
+        return self.values()[:9]
+
+    @property
+    def signs(self):
+        return self.values()[9:18]
+
+    @property
+    def nakshatra(self):
+        return self.raw[-2]
+
+    @property
+    def pada(self):
+        return self.raw[-1]
+
+    @property
+    def moon_slot(self):
+        """kuta_table 파다 슬롯"""
+        return self.raw[-2] * 4 + self.raw[-1] - 1
+
+    def to_chart_data(self, name=None):
+        """표시용 chart_data (달을 뺀 경도는 float32 정밀도)"""
+        values = self.values()
+        lons, signs = values[:9], values[9:18]
+        planets = {b: (float(lons[i + 1]), SIGN_ORDER[signs[i + 1]]) for i, b in enumerate(_PLANETS)}
+        chart = build_chart_data(self.name if name is None else name, SIGN_ORDER[signs[0]],
+                                 planets, float(lons[8]), SIGN_ORDER[signs[8]])
+        chart["nakshatra"] = f"{NAKSHATRAS[values[18]]} (파다 {values[19]})"
+        return chart
+
+    def __eq__(self, other):
+        return isinstance(other, ChartRecord) and (self.name, self.raw) == (other.name, other.raw)
+
+    def __repr__(self):
+        return f"ChartRecord({self.name!r}, slot={self.moon_slot})"
+
+
+def score(record1, record2):
+    """두 레코드의 (쿠타별 점수 dict, 총점) - calculate_ashta_kuta 와 같은 점수표 조회"""
+    row = TABLE[record1.moon_slot, record2.moon_slot]
+    return dict(zip(KUTA_NAMES, row[:8].tolist())), int(row[8])
+
+
+class ChartStore:
+    """열마다 raw 파일 하나인 추가 전용 열 지향 저장소 (디렉터리)
+
+    <dir>/<열>.bin 은 리틀 엔디언 고정 폭 값의 연속이고 이름은 names.jsonl 에 한 줄씩 둔다.
+    append는 열 파일 끝에 덧붙이기만 하며, 열다가 중단된 추가(열마다 길이가 다름)를
+    발견하면 모든 열이 가진 행까지로 잘라 낸다. column()은 numpy.memmap을 돌려준다.
+    열 이름/형식은 columns.json 에 적어 두고, 다른 형식의 저장소는 잘라 내기 전에 거절한다.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self._names_path = os.path.join(path, "names.jsonl")
+        self._check_columns()
+        self._count = self._recover()
+
+    def _check_columns(self):
+        file = os.path.join(self.path, "columns.json")
+        if os.path.exists(file):
+            with open(file, encoding="utf-8") as f:
+                if [tuple(c) for c in json.load(f)] != COLUMNS:
+                    raise ValueError(f"열 형식이 다른 저장소입니다: {self.path}")
+        else:
+            with open(file, "w", encoding="utf-8") as f:
+                json.dump(COLUMNS, f)
+
+    def _file(self, column):
+        return os.path.join(self.path, f"{column}.bin")
+
+    def _recover(self):
+        counts = []
+        for column, dtype in COLUMNS:
+            file = self._file(column)
+            size = os.path.getsize(file) if os.path.exists(file) else 0
+            counts.append(size // np.dtype(dtype).itemsize)
+        # 이름은 줄 수만 센다 (파싱은 names()를 처음 부를 때)
+        lines = b""
+        if os.path.exists(self._names_path):
+            with open(self._names_path, "rb") as f:
+                lines = f.read()
+        ends = np.flatnonzero(np.frombuffer(lines, dtype=np.uint8) == ord("\n"))
+        count = min(counts + [len(ends)])
+        for column, dtype in COLUMNS:
+            file = self._file(column)
+            if os.path.exists(file) and os.path.getsize(file) != count * np.dtype(dtype).itemsize:
+                os.truncate(file, count * np.dtype(dtype).itemsize)
+        keep = int(ends[count - 1]) + 1 if count else 0
+        if keep != len(lines):
+            os.truncate(self._names_path, keep)
+        self._names = None
+        return count
+
+    def _load_names(self):
+        if self._names is None:
+            if not self._count:
+                self._names = []
+            else:
+                with open(self._names_path, encoding="utf-8") as f:
+                    self._names = [json.loads(line) for line in f]
+        return self._names
+
+    def __len__(self):
+        return self._count
+
+    def append(self, records):
+        """레코드 목록을 끝에 추가 - 열 파일을 먼저, 이름을 마지막에 쓴다"""
+        records = list(records)
+        if not records:
+            return
+        raw = b"".join(r.raw for r in records)
+        rows = np.frombuffer(raw, dtype=_ROW_DTYPE)
+        for column, _ in COLUMNS:
+            with open(self._file(column), "ab") as f:
+                f.write(np.ascontiguousarray(rows[column]).tobytes())
+        with open(self._names_path, "a", encoding="utf-8") as f:
+            f.writelines(json.dumps(r.name, ensure_ascii=False) + "\n" for r in records)
+        if self._names is not None:
+            self._names.extend(r.name for r in records)
+        self._count += len(records)
+
+    def column(self, name):
+        """열 전체를 복사 없이 (numpy.memmap, 행이 없으면 빈 배열)"""
+        dtype = dict(COLUMNS)[name]
+        if self._count == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(self._file(name), dtype=dtype, mode="r", shape=(self._count,))
+
+    def names(self):
+        return list(self._load_names())
+
+    def moon_slots(self):
+        """모든 행의 kuta_table 파다 슬롯 배열"""
+        return (self.column("nakshatra").astype(np.int64) * 4 + self.column("pada") - 1).astype(np.uint8)
+
+    def scan(self, batch_size=65536):
+        """레코드를 batch_size 행씩 읽어 차례로 생성"""
+        for start in range(0, self._count, batch_size):
+            yield from self._slice(start, min(start + batch_size, self._count))
+
+    def __getitem__(self, i):
+        if not 0 <= i < self._count:
+            raise IndexError(i)
+        return self._slice(i, i + 1)[0]
+
+    def _slice(self, start, stop):
+        # 열들을 행 단위 구조체 배열로 모으면 각 행의 바이트가 곧 _STRUCT 레이아웃이다
+        block = np.empty(stop - start, dtype=_ROW_DTYPE)
+        for column, _ in COLUMNS:
+            block[column] = self.column(column)[start:stop]
+        raw = block.tobytes()
+        size = _STRUCT.size
+        names = self._load_names()
+        return [ChartRecord(names[start + i], raw[i * size:(i + 1) * size]) for i in range(stop - start)]
@@ -0,0 +1,94 @@
+import importlib.util
+import os
+import threading
+from datetime import datetime
+
+import numpy as np
+import swisseph as swe
+
+# 경량 차트 엔진 - 앱이 실제로 쓰는 천체(태양, 달, 수성~토성, 라후)와 상승궁만
+# 스위스 에페메리스로 직접 계산한다 (항성황도, Lahiri 아야남사).
+# kerykeion은 비교 기준(reference) 백엔드로 vedic_core에 남아 있다.
+
+SIGNS = ["Ari", "Tau", "Gem", "Can", "Leo", "Vir", "Lib", "Sco", "Sag", "Cap", "Aqu", "Pis"]
+
+# 결과 배열의 열 순서
+BODIES = [
+    ("태양", swe.SUN), ("달", swe.MOON), ("수성", swe.MERCURY), ("금성", swe.VENUS),
+    ("화성", swe.MARS), ("목성", swe.JUPITER), ("토성", swe.SATURN),
+    # kerykeion v5 기본 설정과 같은 진교점(True Node)
+    ("라후", swe.TRUE_NODE),
+]
+COLUMNS = [name for name, _ in BODIES] + ["상승궁"]
+
+_FLAGS = swe.FLG_SWIEPH | swe.FLG_SIDEREAL
+# 상승궁(ascmc[0])만 쓰므로 하우스 체계는 어느 것이든 같다. Placidus는 극권(위도 ±66.5° 너머)에서
+# 정의되지 않아 swisseph가 오류를 내므로, 어디서나 정의되는 Equal을 쓴다.
+_HOUSE_SYSTEM = b"E"
+# swisseph 전역 상태(에페메리스 경로, 아야남사)를 건드리는 구간은 직렬화한다
+_lock = threading.Lock()
+
+
+def _ephe_path():
+    """SE_EPHE_PATH 또는 kerykeion에 포함된 에페메리스 파일 경로 (kerykeion은 임포트하지 않음)"""
+    path = os.environ.get("SE_EPHE_PATH")
+    if path:
+        return path
+    spec = importlib.util.find_spec("kerykeion")
+    if spec is not None and spec.origin:
+        path = os.path.join(os.path.dirname(spec.origin), "sweph")
+        if os.path.isdir(path):
+            return path
+    return None
+
+
+_EPHE_PATH = _ephe_path()
+
+
+def julian_day(year, month, day, hour, minute, tz_str):
+    """현지 출생 시각 → UT 율리우스일 (DST 전환으로 모호하거나 없는 시각이면 예외)"""
+    import pytz
+    local = pytz.timezone(tz_str).localize(datetime(year, month, day, hour, minute), is_dst=None)
+    utc = local.astimezone(pytz.utc)
+    return swe.julday(utc.year, utc.month, utc.day, utc.hour + utc.minute / 60 + utc.second / 3600)
+
+
+def _configure():
+    if _EPHE_PATH:
+        swe.set_ephe_path(_EPHE_PATH)
+    swe.set_sid_mode(swe.SIDM_LAHIRI)
+
+
+def _row(jd, lat, lon, out):
+    for i, (_, body) in enumerate(BODIES):
+        out[i] = swe.calc_ut(jd, body, _FLAGS)[0][0]
+    out[-1] = swe.houses_ex(jd, lat, lon, _HOUSE_SYSTEM, _FLAGS)[1][0]
+
+
+def positions(jd, lat, lon):
+    """한 시점의 항성황도 경도 {천체: 경도, "상승궁": 경도}"""
+    out = np.empty(len(COLUMNS))
+    with _lock:
+        _configure()
+        _row(jd, lat, lon, out)
+    return dict(zip(COLUMNS, out.tolist()))
+
+
+def positions_batch(jds, lats, lons):
+    """여러 출생 시각을 한 번에 계산 - [n, len(COLUMNS)] 경도 배열 (열 순서는 COLUMNS)
+
+    lats/lons는 스칼라(모두 같은 장소)이거나 jds와 같은 길이의 배열이다.
+    """
+    jds = np.atleast_1d(np.asarray(jds, dtype=np.float64))
+    lats = np.broadcast_to(np.asarray(lats, dtype=np.float64), jds.shape)
+    lons = np.broadcast_to(np.asarray(lons, dtype=np.float64), jds.shape)
+    out = np.empty((len(jds), len(COLUMNS)))
+    with _lock:
+        _configure()
+        for i in range(len(jds)):
+            _row(jds[i], lats[i], lons[i], out[i])
+    return out
+
+
+def sign_of(lon):
+    return SIGNS[int(lon // 30) % 12]
@@ -0,0 +1,84 @@
+# 오프라인 지명 사전 - 자주 입력되는 출생지는 네트워크 없이 좌표를 돌려준다
+# (위도, 경도, 주소, 별칭들) - 별칭은 geocoding.normalize_city 규칙으로 비교한다
+CITIES = [
+    # 대한민국
+    (37.5666791, 126.9782914, "서울특별시, 대한민국", ["서울", "서울시", "서울특별시", "Seoul"]),
+    (35.1799528, 129.0752365, "부산광역시, 대한민국", ["부산", "부산시", "부산광역시", "Busan", "Pusan"]),
+    (35.8713900, 128.6017630, "대구광역시, 대한민국", ["대구", "대구시", "대구광역시", "Daegu", "Taegu"]),
+    (37.4559418, 126.7051505, "인천광역시, 대한민국", ["인천", "인천시", "인천광역시", "Incheon", "Inchon"]),
+    (35.1600994, 126.8514112, "광주광역시, 대한민국", ["광주광역시", "Gwangju"]),
+    (36.3504396, 127.3849508, "대전광역시, 대한민국", ["대전", "대전시", "대전광역시", "Daejeon", "Taejon"]),
+    (35.5396224, 129.3115276, "울산광역시, 대한민국", ["울산", "울산시", "울산광역시", "Ulsan"]),
+    (36.4800121, 127.2890691, "세종특별자치시, 대한민국", ["세종", "세종시", "세종특별자치시", "Sejong"]),
+    (37.2635727, 127.0286009, "수원시, 경기도, 대한민국", ["수원", "수원시", "Suwon"]),
+    (37.4201556, 127.1262092, "성남시, 경기도, 대한민국", ["성남", "성남시", "Seongnam"]),
+    (37.6583599, 126.8320201, "고양시, 경기도, 대한민국", ["고양", "고양시", "Goyang"]),
+    (37.2410864, 127.1775537, "용인시, 경기도, 대한민국", ["용인", "용인시", "Yongin"]),
+    (37.5034138, 126.7660309, "부천시, 경기도, 대한민국", ["부천", "부천시", "Bucheon"]),
+    (37.3218778, 126.8308848, "안산시, 경기도, 대한민국", ["안산", "안산시", "Ansan"]),
+    (37.3942527, 126.9568209, "안양시, 경기도, 대한민국", ["안양", "안양시", "Anyang"]),
+    (37.7381742, 127.0337556, "의정부시, 경기도, 대한민국", ["의정부", "의정부시", "Uijeongbu"]),
+    (37.8813153, 127.7299707, "춘천시, 강원특별자치도, 대한민국", ["춘천", "춘천시", "Chuncheon"]),
+    (37.7519110, 128.8760574, "강릉시, 강원특별자치도, 대한민국", ["강릉", "강릉시", "Gangneung"]),
+    (37.3422186, 127.9201621, "원주시, 강원특별자치도, 대한민국", ["원주", "원주시", "Wonju"]),
+    (36.6424341, 127.4890319, "청주시, 충청북도, 대한민국", ["청주", "청주시", "Cheongju"]),
+    (36.8151010, 127.1138900, "천안시, 충청남도, 대한민국", ["천안", "천안시", "Cheonan"]),
+    (35.8242238, 127.1479532, "전주시, 전북특별자치도, 대한민국", ["전주", "전주시", "Jeonju"]),
+    (34.8118351, 126.3921664, "목포시, 전라남도, 대한민국", ["목포", "목포시", "Mokpo"]),
+    (34.7603737, 127.6622221, "여수시, 전라남도, 대한민국", ["여수", "여수시", "Yeosu"]),
+    (34.9506830, 127.4872140, "순천시, 전라남도, 대한민국", ["순천", "순천시", "Suncheon"]),
+    (36.0190178, 129.3434808, "포항시, 경상북도, 대한민국", ["포항", "포항시", "Pohang"]),
+    (35.8561719, 129.2247477, "경주시, 경상북도, 대한민국", ["경주", "경주시", "Gyeongju"]),
+    (36.5683543, 128.7293502, "안동시, 경상북도, 대한민국", ["안동", "안동시", "Andong"]),
+    (36.1195420, 128.3443950, "구미시, 경상북도, 대한민국", ["구미", "구미시", "Gumi"]),
+    (35.2279808, 128.6811712, "창원시, 경상남도, 대한민국", ["창원", "창원시", "마산", "Changwon", "Masan"]),
+    (35.1800180, 128.1076213, "진주시, 경상남도, 대한민국", ["진주", "진주시", "Jinju"]),
+    (35.2285451, 128.8893517, "김해시, 경상남도, 대한민국", ["김해", "김해시", "Gimhae"]),
+    (33.4996213, 126.5311884, "제주시, 제주특별자치도, 대한민국", ["제주", "제주시", "제주도", "Jeju", "Jeju City"]),
+    (33.2541205, 126.5600760, "서귀포시, 제주특별자치도, 대한민국", ["서귀포", "서귀포시", "Seogwipo"]),
+    # 해외 주요 도시
+    (39.0392193, 125.7625241, "평양, 조선민주주의인민공화국", ["평양", "Pyongyang"]),
+    (35.6768601, 139.7638947, "東京都, 日本", ["도쿄", "동경", "Tokyo"]),
+    (34.6937569, 135.5014539, "大阪市, 日本", ["오사카", "Osaka"]),
+    (35.0116363, 135.7680294, "京都市, 日本", ["교토", "Kyoto"]),
+    (33.5898988, 130.4017509, "福岡市, 日本", ["후쿠오카", "Fukuoka"]),
+    (39.9057136, 116.3912972, "北京市, 中国", ["베이징", "북경", "Beijing", "Peking"]),
+    (31.2322758, 121.4692071, "上海市, 中国", ["상하이", "상해", "Shanghai"]),
+    (22.2793278, 114.1628131, "香港", ["홍콩", "Hong Kong", "Hongkong"]),
+    (25.0375198, 121.5636796, "臺北市, 臺灣", ["타이베이", "타이페이", "Taipei"]),
+    (1.2899175, 103.8519072, "Singapore", ["싱가포르", "싱가폴", "Singapore"]),
+    (13.7524938, 100.4935089, "กรุงเทพมหานคร, ประเทศไทย", ["방콕", "Bangkok"]),
+    (21.0283334, 105.8540410, "Hà Nội, Việt Nam", ["하노이", "Hanoi"]),
+    (10.7763897, 106.7011391, "Thành phố Hồ Chí Minh, Việt Nam", ["호치민", "호찌민", "Ho Chi Minh City", "Saigon"]),
+    (14.5904492, 120.9803621, "Manila, Philippines", ["마닐라", "Manila"]),
+    (-6.1753942, 106.8271830, "Jakarta, Indonesia", ["자카르타", "Jakarta"]),
+    (3.1516964, 101.6942371, "Kuala Lumpur, Malaysia", ["쿠알라룸푸르", "Kuala Lumpur"]),
+    (28.6138954, 77.2090057, "New Delhi, India", ["뉴델리", "델리", "New Delhi", "Delhi"]),
+    (19.0815772, 72.8866275, "Mumbai, India", ["뭄바이", "Mumbai", "Bombay"]),
+    (22.5726459, 88.3638953, "Kolkata, India", ["콜카타", "Kolkata", "Calcutta"]),
+    (13.0836939, 80.2701860, "Chennai, India", ["첸나이", "Chennai", "Madras"]),
+    (12.9767936, 77.5900650, "Bengaluru, India", ["벵갈루루", "방갈로르", "Bengaluru", "Bangalore"]),
+    (25.0742823, 55.1885387, "Dubai, United Arab Emirates", ["두바이", "Dubai"]),
+    (41.0091982, 28.9662187, "İstanbul, Türkiye", ["이스탄불", "Istanbul"]),
+    (30.0443879, 31.2357257, "القاهرة, مصر", ["카이로", "Cairo"]),
+    (55.7505412, 37.6174782, "Москва, Россия", ["모스크바", "Moscow"]),
+    (51.5074456, -0.1277653, "London, United Kingdom", ["런던", "London"]),
+    (48.8534951, 2.3483915, "Paris, France", ["파리", "Paris"]),
+    (52.5108850, 13.3989367, "Berlin, Deutschland", ["베를린", "Berlin"]),
+    (41.8933203, 12.4829321, "Roma, Italia", ["로마", "Rome", "Roma"]),
+    (40.4167047, -3.7035825, "Madrid, España", ["마드리드", "Madrid"]),
+    (40.7127281, -74.0060152, "New York, United States", ["뉴욕", "New York", "New York City", "NYC"]),
+    (34.0536909, -118.2427660, "Los Angeles, United States", ["로스앤젤레스", "엘에이", "LA", "Los Angeles"]),
+    (37.7792588, -122.4193286, "San Francisco, United States", ["샌프란시스코", "San Francisco"]),
+    (47.6038321, -122.3300624, "Seattle, United States", ["시애틀", "Seattle"]),
+    (41.8755616, -87.6244212, "Chicago, United States", ["시카고", "Chicago"]),
+    (21.3045470, -157.8556760, "Honolulu, United States", ["호놀룰루", "Honolulu"]),
+    (43.6534817, -79.3839347, "Toronto, Canada", ["토론토", "Toronto"]),
+    (49.2608724, -123.1139529, "Vancouver, Canada", ["밴쿠버", "Vancouver"]),
+    (19.4326296, -99.1331785, "Ciudad de México, México", ["멕시코시티", "Mexico City"]),
+    (-23.5506507, -46.6333824, "São Paulo, Brasil", ["상파울루", "Sao Paulo", "São Paulo"]),
+    (-34.6075682, -58.4370894, "Buenos Aires, Argentina", ["부에노스아이레스", "Buenos Aires"]),
+    (-33.8698439, 151.2082848, "Sydney, Australia", ["시드니", "Sydney"]),
+    (-37.8142454, 144.9631732, "Melbourne, Australia", ["멜버른", "멜번", "Melbourne"]),
+    (-36.8484597, 174.7633315, "Auckland, New Zealand", ["오클랜드", "Auckland"]),
+]
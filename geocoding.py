@@ -0,0 +1,184 @@
+import os
+import re
+import threading
+import unicodedata
+
+import broker
+import metrics
+from caching import CACHE_DIR, DiskCache, LRUCache
+from gazetteer import CITIES
+
+# 계층형 지오코딩 캐시: 메모리 LRU → 오프라인 지명 사전 → SQLite → Nominatim
+_memory = LRUCache(maxsize=2048)
+_disk = DiskCache(
+    os.path.join(CACHE_DIR, "geocode.sqlite3"),
+    table="geocode",
+    ttl=90 * 24 * 3600,
+    max_entries=50000,
+)
+# 찾지 못한 도시는 메모리에만 짧게 기억해 같은 오타로 반복 조회하지 않는다
+_NEGATIVE_TTL = 600
+
+# 조회 결과가 어느 계층에서 나왔는지 집계
+stats = {"memory": 0, "gazetteer": 0, "disk": 0, "network": 0, "not_found": 0, "error": 0}
+
+# "서울, 대한민국" 처럼 쉼표 뒤에 붙은 국가명만 뗀다 ("South Korea", "North Korea" 자체는 그대로)
+_COUNTRY_SUFFIX = re.compile(
+    r"\s*,\s*(대한민국|한국|south korea|republic of korea|korea)$"
+)
+
+
+@metrics.register_collector
+def _collect():
+    return [("vedic_geocode_lookups_total", {"source": k}, v) for k, v in stats.items()]
+
+
+metrics.describe("vedic_geocode_lookups_total", "counter", "지오코딩 조회 수 (응답한 계층별)")
+
+# 자체 호스팅 Nominatim이나 로컬 스텁 서버를 쓸 때 (예: VEDIC_NOMINATIM_DOMAIN=127.0.0.1:8080)
+NOMINATIM_DOMAIN = os.environ.get("VEDIC_NOMINATIM_DOMAIN", "nominatim.openstreetmap.org")
+NOMINATIM_SCHEME = os.environ.get("VEDIC_NOMINATIM_SCHEME", "https")
+
+_geocoder = None
+_geocoder_lock = threading.Lock()
+
+
+def normalize_city(city_name):
+    """캐시 키용 도시명 정규화 (대소문자/공백/국가 접미사 무시)"""
+    key = unicodedata.normalize("NFC", city_name or "").strip().lower()
+    key = re.sub(r"\s+", " ", key)
+    city = _COUNTRY_SUFFIX.sub("", key).strip(" ,")
+    return city or key.strip(" ,")
+
+
+_GAZETTEER = {}
+for _lat, _lon, _addr, _aliases in CITIES:
+    for _alias in _aliases:
+        _GAZETTEER[normalize_city(_alias)] = (_lat, _lon, _addr)
+
+
+def get_geocoder():
+    """프로세스 공용 Nominatim 클라이언트 (최초 사용 시 생성)"""
+    global _geocoder
+    if _geocoder is None:
+        with _geocoder_lock:
+            if _geocoder is None:
+                from geopy.geocoders import Nominatim
+                _geocoder = Nominatim(user_agent="vedic_astrology_app", timeout=10,
+                                      domain=NOMINATIM_DOMAIN, scheme=NOMINATIM_SCHEME)
+    return _geocoder
+
+
+def set_geocoder(geocoder):
+    """지오코더 교체 (테스트/벤치마크용 스텁 주입, None이면 Nominatim으로 복귀)"""
+    global _geocoder
+    with _geocoder_lock:
+        _geocoder = geocoder
+
+
+def clear_caches():
+    """메모리/디스크 캐시와 통계 초기화"""
+    _memory.clear()
+    _disk.clear()
+    for k in stats:
+        stats[k] = 0
+
+
+def _geocode(geolocator, query, **kwargs):
+    # 대체 질의까지 HTTP 요청마다 속도 제한을 지킨다 (자리가 없으면 BusyError)
+    with broker.slot("nominatim"):
+        metrics.inc("vedic_upstream_requests_total", upstream="nominatim")
+        with metrics.stage("nominatim", "Nominatim 조회"):
+            return geolocator.geocode(query, **kwargs)
+
+
+def _query_network(city_name):
+    geolocator = get_geocoder()
+    location = _geocode(geolocator, city_name)
+    if location:
+        return (location.latitude, location.longitude, location.address)
+    if re.search('[가-힣]', city_name):
+        metrics.inc("vedic_retries_total", upstream="nominatim")
+        location = _geocode(geolocator, f"{city_name}, 대한민국", language="ko")
+        if location:
+            return (location.latitude, location.longitude, location.address)
+        metrics.inc("vedic_retries_total", upstream="nominatim")
+        location = _geocode(geolocator, f"{city_name}, South Korea")
+        if location:
+            return (location.latitude, location.longitude, location.address)
+    return (None, None, None)
+
+
+def get_location_coordinates(city_name):
+    """도시명 → (위도, 경도, 주소), 찾지 못하면 (None, None, None)
+
+    Nominatim 대기열이 가득 차면 broker.BusyError를 던진다.
+    """
+    key = normalize_city(city_name)
+    if not key:
+        return (None, None, None)
+
+    cached = _memory.get(key)
+    if cached is not None:
+        stats["memory"] += 1
+        return cached
+
+    result = _GAZETTEER.get(key)
+    if result is not None:
+        stats["gazetteer"] += 1
+        _memory.set(key, result)
+        return result
+
+    cached = _disk.get(key)
+    if cached is not None:
+        stats["disk"] += 1
+        result = tuple(cached)
+        _memory.set(key, result)
+        return result
+
+    try:
+        # 같은 도시를 동시에 찾는 세션들은 조회 한 번을 함께 기다린다
+        result = broker.coalesce("nominatim", key, _query_network, city_name.strip())
+    except broker.BusyError:
+        # 혼잡은 찾지 못한 것과 구분해 호출자에게 알린다 (캐시하지 않음)
+        raise
+    except Exception as e:
+        # 네트워크 오류는 캐시하지 않는다
+        stats["error"] += 1
+        metrics.error("geocode", e)
+        return (None, None, None)
+
+    if result[0] is None:
+        stats["not_found"] += 1
+        _memory.set(key, result, ttl=_NEGATIVE_TTL)
+        return result
+
+    stats["network"] += 1
+    _memory.set(key, result)
+    _disk.set(key, list(result))
+    return result
+
+
+class _StubLocation:
+    def __init__(self, latitude, longitude, address):
+        self.latitude = latitude
+        self.longitude = longitude
+        self.address = address
+
+
+class StubGeocoder:
+    """네트워크 없이 동작하는 Nominatim 대역 - 받은 질의를 순서대로 기록한다
+
+    places는 {질의 문자열: (위도, 경도, 주소)} 형태이며, 질의가 없으면 None을 돌려준다.
+    """
+
+    def __init__(self, places=None):
+        self.places = dict(places or {})
+        self.calls = []
+
+    def geocode(self, query, language=None, **kwargs):
+        self.calls.append((query, language))
+        place = self.places.get(query)
+        if place is None:
+            return None
+        return _StubLocation(*place)
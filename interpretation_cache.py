@@ -0,0 +1,139 @@
+import hashlib
+import os
+import time
+
+import llm
+import metrics
+from caching import CACHE_DIR, DiskCache, LRUCache
+
+# LLM 해석 캐시 - 이름 대신 자리표시자로 만든 프롬프트는 두 차트의 서명(상승궁, 라시,
+# 낙샤트라, 태양, 라후/케투, 8개 쿠타 점수)에만 의존하므로 그 해시를 키로 쓰고,
+# 꺼낼 때 실제 이름을 끼워 넣는다.
+NAME1 = "[P1]"
+NAME2 = "[P2]"
+_NAME_NOTE = (
+    f"\n\nThe two people are referred to as {NAME1} and {NAME2}. "
+    f"Whenever you mention them, write exactly {NAME1} or {NAME2}."
+)
+
+_memory = LRUCache(maxsize=256)
+_disk = DiskCache(
+    os.path.join(CACHE_DIR, "interpretations.sqlite3"),
+    table="interpretations",
+    ttl=float(os.environ.get("VEDIC_LLM_CACHE_TTL", 30 * 24 * 3600)),
+    max_entries=int(os.environ.get("VEDIC_LLM_CACHE_MAX", 20000)),
+)
+
+stats = {"hits": 0, "misses": 0, "fresh": 0}
+
+
+@metrics.register_collector
+def _collect():
+    return [("vedic_cache_requests_total", {"cache": "interpretation", "result": k}, v) for k, v in stats.items()]
+
+# 캐시된 해석을 내보낼 때의 조각 크기 (실시간 스트림과 비슷한 크기)
+_REPLAY_CHUNK = 8
+
+
+def _prompt(chart1, chart2, scores, total):
+    system, user = llm.build_prompt(chart1, chart2, scores, total, NAME1, NAME2)
+    return system + _NAME_NOTE, user
+
+
+def signature_key(chart1, chart2, scores, total):
+    """이름을 뺀 프롬프트 전체(모델 포함)의 SHA-256"""
+    system, user = _prompt(chart1, chart2, scores, total)
+    return hashlib.sha256("\0".join([llm.MODEL, system, user]).encode()).hexdigest()
+
+
+class _NameFiller:
+    """스트림 조각에서 자리표시자를 이름으로 치환 - 조각 경계에 걸친 자리표시자도 처리한다"""
+
+    def __init__(self, name1, name2):
+        self.names = {NAME1: name1, NAME2: name2}
+        self.pending = ""
+
+    def feed(self, chunk):
+        text = self.pending + chunk
+        # 자리표시자의 앞부분일 수 있는 꼬리는 다음 조각까지 보류
+        cut = text.rfind("[")
+        if cut != -1 and "]" not in text[cut:] and len(text) - cut < len(NAME1):
+            self.pending = text[cut:]
+            text = text[:cut]
+        else:
+            self.pending = ""
+        return self._fill(text)
+
+    def flush(self):
+        text, self.pending = self.pending, ""
+        return self._fill(text)
+
+    def _fill(self, text):
+        for token, name in self.names.items():
+            text = text.replace(token, name)
+        return text
+
+
+def stream(chart1, chart2, scores, total, name1, name2, api_key, timings=None, fresh=False):
+    """캐시를 거친 해석 스트림 - 적중하면 저장된 해석을 같은 방식의 조각으로 내보낸다
+
+    fresh=True면 캐시를 읽지 않고 새로 생성해 덮어쓴다.
+    timings에는 llm.stream_messages와 같은 항목과 cached(bool)가 채워진다.
+    """
+    timings = {} if timings is None else timings
+    key = signature_key(chart1, chart2, scores, total)
+    filler = _NameFiller(name1, name2)
+
+    text = None
+    if fresh:
+        stats["fresh"] += 1
+    else:
+        text = _memory.get(key)
+        if text is None:
+            text = _disk.get(key)
+            if text is not None:
+                _memory.set(key, text)
+
+    if text is not None:
+        stats["hits"] += 1
+        start = time.perf_counter()
+        timings.update(cached=True, ttft=0.0, chunks=0)
+        for i in range(0, len(text), _REPLAY_CHUNK):
+            piece = filler.feed(text[i:i + _REPLAY_CHUNK])
+            timings["chunks"] += 1
+            if piece:
+                yield piece
+        tail = filler.flush()
+        if tail:
+            yield tail
+        timings["total"] = time.perf_counter() - start
+        return
+
+    stats["misses"] += 1
+    timings["cached"] = False
+    system, user = _prompt(chart1, chart2, scores, total)
+    parts = []
+    for chunk in llm.stream_messages(system, user, api_key, timings):
+        parts.append(chunk)
+        piece = filler.feed(chunk)
+        if piece:
+            yield piece
+    tail = filler.flush()
+    if tail:
+        yield tail
+    if "error" not in timings and parts:
+        text = "".join(parts)
+        _memory.set(key, text)
+        _disk.set(key, text)
+
+
+def interpret(chart1, chart2, scores, total, name1, name2, api_key, fresh=False):
+    """스트리밍 없이 완성된 해석 문자열 반환 (배치용)"""
+    return "".join(stream(chart1, chart2, scores, total, name1, name2, api_key, fresh=fresh))
+
+
+def clear():
+    _memory.clear()
+    _disk.clear()
+    for k in stats:
+        stats[k] = 0
@@ -0,0 +1,46 @@
+import numpy as np
+
+from kuta_table import N_SLOTS, TABLE
+
+# 일대다/다대다 궁합 일괄 계산 - 달의 경도 배열을 파다 슬롯으로 바꾼 뒤
+# 점수표(TABLE)를 브로드캐스팅 인덱싱해 쿠타별 점수 행렬을 만든다.
+# 라시는 파다 슬롯에서 결정되므로 별도 입력이 필요 없다.
+_FLAT = TABLE.reshape(-1, TABLE.shape[-1])
+
+
+def moon_slots(moon_lons):
+    """달의 경도 배열 → 파다 슬롯 배열 (kuta_table.moon_slot 과 같은 산식)"""
+    lons = np.asarray(moon_lons, dtype=np.float64)
+    return ((lons % 360.0 * 108 / 360.0).astype(np.int64) % N_SLOTS).astype(np.int32)
+
+
+def _gather(slots_a, slots_b):
+    # 2차원 팬시 인덱싱보다 평탄화한 표에서 np.take 하는 편이 약 2배 빠르다
+    return np.take(_FLAT, slots_a[:, None] * N_SLOTS + slots_b[None, :], axis=0)
+
+
+def score_matrix(moon_lons_a, moon_lons_b):
+    """a × b 쌍의 (쿠타별 점수 [len(a), len(b), 8], 총점 [len(a), len(b)])"""
+    block = _gather(moon_slots(moon_lons_a), moon_slots(moon_lons_b))
+    return block[..., :8], block[..., 8]
+
+
+def one_vs_many(moon_lon, moon_lons):
+    """한 사람 대 여러 사람의 (쿠타별 점수 [n, 8], 총점 [n])"""
+    block = np.take(_FLAT, moon_slots([moon_lon])[0] * N_SLOTS + moon_slots(moon_lons), axis=0)
+    return block[:, :8], block[:, 8]
+
+
+def iter_tiles(moon_lons_a, moon_lons_b, tile_size=2048):
+    """다대다 점수를 타일 단위로 생성 - 전체 행렬을 메모리에 올리지 않는다
+
+    (a 시작 인덱스, b 시작 인덱스, 쿠타별 점수 타일, 총점 타일)을 차례로 돌려준다.
+    슬롯 변환은 처음에 한 번만 하므로 입력 배열은 numpy.memmap 이어도 된다.
+    """
+    slots_a = moon_slots(moon_lons_a)
+    slots_b = moon_slots(moon_lons_b)
+    for i in range(0, len(slots_a), tile_size):
+        rows = slots_a[i:i + tile_size]
+        for j in range(0, len(slots_b), tile_size):
+            block = _gather(rows, slots_b[j:j + tile_size])
+            yield i, j, block[..., :8], block[..., 8]
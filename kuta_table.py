@@ -0,0 +1,44 @@
+import numpy as np
+
+# 파다 슬롯 산식은 낙샤트라 표시(get_nakshatra)와 같은 것을 쓴다
+from vedic_core import moon_slot
+
+# 아쉬타쿠타 점수표 - 모든 쿠타는 두 달의 낙샤트라/파다/라시에만 의존하므로
+# 108 파다 × 108 파다 조합을 임포트 시 한 번 계산해 두고 조회만 한다
+KUTA_NAMES = ["바르나", "바쉬야", "타라", "요니", "그라하 마이트리", "가나", "바쿠트", "나디"]
+KUTA_MAX = [3, 6, 8, 11, 14, 17, 19, 22]
+N_SLOTS = 108  # 27 낙샤트라 × 4 파다 (라시 하나 = 9 파다)
+
+
+def _build_table():
+    slots = np.arange(N_SLOTS)
+    nak = slots // 4
+    nadi = (slots % 4) % 3
+    rashi = slots // 9
+
+    nak1, nak2 = nak[:, None], nak[None, :]
+    table = np.zeros((N_SLOTS, N_SLOTS, len(KUTA_NAMES) + 1), dtype=np.uint8)
+    table[..., 0] = 3   # 바르나 (기본 점수)
+    table[..., 1] = 4   # 바쉬야
+    tara_diff = np.abs(nak1 - nak2) % 9
+    table[..., 2] = np.where(np.isin(tara_diff, [1, 2, 4, 6, 8]), 8, 4)
+    table[..., 3] = 8   # 요니
+    table[..., 4] = np.where(rashi[:, None] == rashi[None, :], 14, 10)
+    table[..., 5] = 12  # 가나
+    table[..., 6] = 14  # 바쿠트
+    table[..., 7] = np.where(nadi[:, None] != nadi[None, :], 22, 0)
+    table[..., 8] = table[..., :8].sum(axis=-1)
+    table.setflags(write=False)
+    return table
+
+
+# TABLE[slot1, slot2] = [쿠타별 점수 8개..., 총점]
+TABLE = _build_table()
+# 단건 조회용 파이썬 튜플 뷰 (numpy 스칼라 인덱싱 비용 회피)
+_ROWS = [tuple(row) for row in TABLE.reshape(-1, TABLE.shape[-1]).tolist()]
+
+
+def lookup(moon_lon1, moon_lon2):
+    """두 달의 경도로 (쿠타별 점수 dict, 총점) 조회"""
+    row = _ROWS[moon_slot(moon_lon1) * N_SLOTS + moon_slot(moon_lon2)]
+    return dict(zip(KUTA_NAMES, row[:8])), row[8]
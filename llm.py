@@ -0,0 +1,199 @@
+import hashlib
+import os
+import threading
+import time
+
+import broker
+import metrics
+
+MODEL = "gpt-4o"
+# OPENAI_BASE_URL 로 로컬 모의 서버(mock_openai_server.py)를 가리킬 수 있다
+TIMEOUT = float(os.environ.get("OPENAI_TIMEOUT", "60"))
+MAX_RETRIES = int(os.environ.get("OPENAI_MAX_RETRIES", "3"))
+
+_clients = {}
+_clients_lock = threading.Lock()
+# 한 번의 생성 호출 안에서 SDK가 보낸 HTTP 요청 수 (2번째부터가 재시도)
+_attempts = threading.local()
+
+
+def _count_attempt(request):
+    attempt = getattr(_attempts, "n", 0) + 1
+    _attempts.n = attempt
+    metrics.inc("vedic_upstream_requests_total", upstream="openai")
+    if attempt > 1:
+        metrics.inc("vedic_retries_total", upstream="openai")
+
+
+def get_client(api_key):
+    """API 키별 공용 OpenAI 클라이언트 - 세션이 바뀌어도 HTTP 연결(keep-alive)을 재사용한다
+
+    재시도는 SDK가 지수 백오프로 처리한다 (OPENAI_MAX_RETRIES, OPENAI_TIMEOUT).
+    """
+    base_url = os.environ.get("OPENAI_BASE_URL")
+    key = (api_key, base_url)
+    client = _clients.get(key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(key)
+            if client is None:
+                from openai import DefaultHttpxClient, OpenAI  # 임포트에 수백 ms가 걸려 첫 사용 때 올린다
+                http_client = None
+                if metrics.ENABLED:
+                    # 재시도는 SDK 안에서 일어나므로 HTTP 요청 이벤트로 센다
+                    http_client = DefaultHttpxClient(event_hooks={"request": [_count_attempt]})
+                client = OpenAI(api_key=api_key, base_url=base_url, timeout=TIMEOUT,
+                                max_retries=MAX_RETRIES, http_client=http_client)
+                _clients[key] = client
+    return client
+
+
+def build_prompt(chart1, chart2, scores, total, name1, name2):
+    """계산된 데이터로 (system, user) 프롬프트 생성"""
+    system = """You are a master of Vedic Astrology (Jyotish) with 30 years of experience.
+You will receive CALCULATED astrological data and scores. DO NOT recalculate them.
+Your job is to provide insightful, philosophical COMMENTARY on the provided data.
+
+Your personality:
+- Be sophisticated, mysterious, and BRUTALLY honest
+- Speak like a proud, direct astrologer who has seen the cosmos unfold
+- Deliver philosophical insults with elegance when the stars warrant it
+- If compatibility is low (below 50), use "해소해야 할 악연" (karmic debt to resolve)
+- If compatibility is high (above 70), use "우주적 보상" (cosmic reward)
+
+Format your ENTIRE response in Korean (한국어).
+DO NOT change or recalculate the scores - they are FIXED."""
+
+    user = f"""다음은 정확히 계산된 베딕 점성술 데이터입니다:
+
+## 【{name1}의 차트】
+- 라그나 (상승궁): {chart1['ascendant']}
+- 달 별자리 (라시): {chart1['moon_sign']}
+- 낙샤트라: {chart1['nakshatra']}
+- 태양 별자리: {chart1['sun_sign']}
+- 라후 (북쪽 달의 교점): {chart1['rahu']}
+- 케투 (남쪽 달의 교점, 라후의 180도 반대편): {chart1['ketu']}
+
+## 【{name2}의 차트】
+- 라그나 (상승궁): {chart2['ascendant']}
+- 달 별자리 (라시): {chart2['moon_sign']}
+- 낙샤트라: {chart2['nakshatra']}
+- 태양 별자리: {chart2['sun_sign']}
+- 라후 (북쪽 달의 교점): {chart2['rahu']}
+- 케투 (남쪽 달의 교점, 라후의 180도 반대편): {chart2['ketu']}
+
+## 【아쉬타쿠타 점수 (이미 계산됨 - 변경 불가)】
+- 바르나 쿠타: {scores['바르나']}/3점
+- 바쉬야 쿠타: {scores['바쉬야']}/6점
+- 타라 쿠타: {scores['타라']}/8점
+- 요니 쿠타: {scores['요니']}/11점
+- 그라하 마이트리: {scores['그라하 마이트리']}/14점
+- 가나 쿠타: {scores['가나']}/17점
+- 바쿠트 쿠타: {scores['바쿠트']}/19점
+- 나디 쿠타: {scores['나디']}/22점
+- **총점: {total}/100점**
+
+위 데이터를 바탕으로:
+1. 각 쿠타 점수에 대한 해석
+2. 🔮 Karmic Connection (업보적 연결): 라후/케투 기반 전생 관계 추측
+3. 종합 궁합 해석 (철학적 독설 포함)
+
+점수가 {total}점이므로 {"'해소해야 할 악연'" if total < 50 else "'우주적 보상'" if total > 70 else "'보통의 인연'"}으로 해석해주세요."""
+    return system, user
+
+
+def _flight_key(api_key, system, user, stream):
+    """같은 키/프롬프트의 동시 요청을 하나로 묶는 키 (키가 다르면 묶지 않는다)"""
+    parts = [api_key or "", MODEL, system, user, "stream" if stream else "complete"]
+    return hashlib.sha256("\0".join(parts).encode()).hexdigest()
+
+
+def _messages(system, user):
+    return [{"role": "system", "content": system}, {"role": "user", "content": user}]
+
+
+def _complete(system, user, api_key):
+    with broker.slot("openai"):
+        _attempts.n = 0
+        response = get_client(api_key).chat.completions.create(
+            model=MODEL,
+            messages=_messages(system, user),
+            temperature=0.7,
+            max_tokens=2500
+        )
+    return response.choices[0].message.content
+
+
+def _deltas(system, user, api_key):
+    """업스트림 스트림의 텍스트 조각 - 중개자 자리는 스트림이 끝날 때까지 잡고 있다"""
+    with broker.slot("openai"):
+        _attempts.n = 0
+        stream = get_client(api_key).chat.completions.create(
+            model=MODEL,
+            messages=_messages(system, user),
+            temperature=0.7,
+            max_tokens=2500,
+            stream=True,
+        )
+        for event in stream:
+            if not event.choices:
+                continue
+            delta = event.choices[0].delta.content
+            if delta:
+                yield delta
+
+
+def analyze_with_openai(chart1, chart2, scores, total, name1, name2, api_key):
+    """계산된 데이터로 LLM이 해석만 제공"""
+    system, user = build_prompt(chart1, chart2, scores, total, name1, name2)
+    start = time.perf_counter()
+    try:
+        return broker.coalesce("openai", _flight_key(api_key, system, user, False),
+                               _complete, system, user, api_key)
+    except Exception as e:
+        metrics.error("llm", e)
+        return f"❌ API 오류: {e}"
+    finally:
+        metrics.observe("vedic_stage_seconds", time.perf_counter() - start, stage="llm_total")
+
+
+def stream_interpretation(chart1, chart2, scores, total, name1, name2, api_key, timings=None):
+    """해석을 토큰 단위로 생성하는 제너레이터
+
+    timings dict를 넘기면 첫 토큰까지 시간(ttft), 전체 생성 시간(total), 조각 수(chunks)를 채운다.
+    """
+    system, user = build_prompt(chart1, chart2, scores, total, name1, name2)
+    return stream_messages(system, user, api_key, timings)
+
+
+def stream_messages(system, user, api_key, timings=None):
+    """완성된 프롬프트로 스트리밍 생성 - 실패하면 오류 문구를 내보내고 timings["error"]를 남긴다
+
+    같은 프롬프트로 동시에 들어온 스트림은 업스트림 스트림 하나를 함께 읽는다.
+    혼잡으로 거절되면 timings["busy"]도 True가 된다.
+    """
+    timings = {} if timings is None else timings
+    start = time.perf_counter()
+    chunks = 0
+    try:
+        key = _flight_key(api_key, system, user, True)
+        for delta in broker.coalesce_stream("openai", key, lambda: _deltas(system, user, api_key)):
+            if chunks == 0:
+                timings["ttft"] = time.perf_counter() - start
+            chunks += 1
+            yield delta
+    except broker.BusyError as e:
+        timings["error"] = str(e)
+        timings["busy"] = True
+        metrics.error("llm", e)
+        yield f"⏳ {e}"
+    except Exception as e:
+        timings["error"] = str(e)
+        metrics.error("llm", e)
+        yield f"❌ API 오류: {e}"
+    finally:
+        timings["total"] = time.perf_counter() - start
+        timings["chunks"] = chunks
+        if "ttft" in timings:
+            metrics.observe("vedic_stage_seconds", timings["ttft"], stage="llm_ttft")
+        metrics.observe("vedic_stage_seconds", timings["total"], stage="llm_total")
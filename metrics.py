@@ -0,0 +1,222 @@
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+
+# 가벼운 지표/추적 계층 - VEDIC_METRICS=1 일 때만 기록하고, 꺼져 있으면 inc/observe는 바로
+# 돌아가고 stage()는 공용 nullcontext를 돌려준다.
+#   - 카운터/히스토그램을 프로세스 안에 모아 Prometheus 텍스트 형식으로 내보낸다
+#     (VEDIC_METRICS_PORT: 로컬 /metrics 엔드포인트, VEDIC_METRICS_FILE: 주기적 파일 기록)
+#   - stage()는 단계 시간을 히스토그램에 넣고, 현재 요청의 StageTimer(tracing()으로 지정)에도
+#     같은 구간을 남겨 요청별 워터폴을 만든다
+#   - 각 모듈의 기존 stats dict(캐시 적중 등)는 register_collector로 내보낼 때만 읽는다
+ENABLED = os.environ.get("VEDIC_METRICS", "0") == "1"
+
+# 단계 시간 히스토그램 버킷 (초)
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_DESCRIPTIONS = {
+    "vedic_stage_seconds": ("histogram", "단계별 소요 시간"),
+    "vedic_errors_total": ("counter", "단계별 오류 수 (예외 종류별)"),
+    "vedic_upstream_requests_total": ("counter", "외부 서비스 HTTP 요청 수 (재시도 포함)"),
+    "vedic_retries_total": ("counter", "외부 서비스 재시도/대체 질의 수"),
+    "vedic_requests_total": ("counter", "앱 분석 요청 수"),
+    "vedic_cache_requests_total": ("counter", "캐시 조회 수 (캐시/결과별)"),
+}
+
+_lock = threading.Lock()
+_counters = {}
+_histograms = {}
+_collectors = []
+_trace = ContextVar("vedic_trace", default=None)
+_NULL = nullcontext()
+_exporters_started = False
+
+
+def describe(name, kind, text):
+    _DESCRIPTIONS[name] = (kind, text)
+
+
+def _labels(labels):
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def inc(name, amount=1, **labels):
+    if not ENABLED:
+        return
+    key = (name, _labels(labels))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + amount
+
+
+def observe(name, seconds, **labels):
+    if not ENABLED:
+        return
+    key = (name, _labels(labels))
+    with _lock:
+        hist = _histograms.get(key)
+        if hist is None:
+            hist = _histograms[key] = [0] * len(BUCKETS) + [0.0, 0]
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                hist[i] += 1
+        hist[-2] += seconds
+        hist[-1] += 1
+
+
+def error(stage, exc=None):
+    """삼킨 예외도 단계/종류별로 센다"""
+    inc("vedic_errors_total", stage=stage, type=type(exc).__name__ if exc is not None else "unknown")
+
+
+def stage(name, label=None):
+    """단계 시간 측정 컨텍스트 - label은 워터폴 표시 이름
+
+    예외는 세지 않고 그대로 던진다. 오류는 예외를 최종 처리하는 쪽이 error()로 한 번만 센다.
+
+    지표가 꺼져 있어도 tracing() 안이면 구간을 timer에 남긴다 (개발자 패널용).
+    """
+    if not ENABLED and _trace.get() is None:
+        return _NULL
+    return _stage(name, label)
+
+
+@contextmanager
+def _stage(name, label):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        end = time.perf_counter()
+        observe("vedic_stage_seconds", end - start, stage=name)
+        timer = _trace.get()
+        if timer is not None:
+            timer.record(label or name, start, end, detail=True)
+
+
+@contextmanager
+def tracing(timer):
+    """이 스레드/컨텍스트의 stage() 구간을 timer(StageTimer)에도 기록"""
+    token = _trace.set(timer)
+    try:
+        yield timer
+    finally:
+        _trace.reset(token)
+
+
+def register_collector(fn):
+    """내보낼 때 호출할 함수 등록 - [(이름, {레이블}, 값)] 목록을 돌려줘야 한다"""
+    _collectors.append(fn)
+    return fn
+
+
+def clear():
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    escaped = (f'{k}="{str(v).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"' for k, v in labels)
+    return "{" + ",".join(escaped) + "}"
+
+
+def render():
+    """Prometheus 텍스트 형식 (exposition format 0.0.4)"""
+    with _lock:
+        counters = dict(_counters)
+        histograms = {k: list(v) for k, v in _histograms.items()}
+    for collect in _collectors:
+        for name, labels, value in collect():
+            key = (name, _labels(labels))
+            counters[key] = counters.get(key, 0) + value
+
+    by_name = {}
+    for (name, labels), value in counters.items():
+        by_name.setdefault(name, []).append((labels, value))
+    lines = []
+    for name in sorted(by_name):
+        kind, text = _DESCRIPTIONS.get(name, ("counter", name))
+        lines += [f"# HELP {name} {text}", f"# TYPE {name} {kind}"]
+        lines += [f"{name}{_format_labels(labels)} {value}" for labels, value in sorted(by_name[name])]
+
+    hist_names = sorted({name for name, _ in histograms})
+    for name in hist_names:
+        kind, text = _DESCRIPTIONS.get(name, ("histogram", name))
+        lines += [f"# HELP {name} {text}", f"# TYPE {name} histogram"]
+        for (hname, labels), hist in sorted(histograms.items()):
+            if hname != name:
+                continue
+            for bound, count in zip(BUCKETS, hist):
+                lines.append(f"{name}_bucket{_format_labels(labels + (('le', repr(bound)),))} {count}")
+            lines.append(f"{name}_bucket{_format_labels(labels + (('le', '+Inf'),))} {hist[-1]}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {hist[-2]}")
+            lines.append(f"{name}_count{_format_labels(labels)} {hist[-1]}")
+    return "\n".join(lines) + "\n"
+
+
+def write_file(path):
+    """render() 결과를 원자적으로 기록 (node_exporter textfile collector 등)"""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(render())
+    os.replace(tmp, path)
+
+
+def serve(port, host="127.0.0.1"):
+    """/metrics 를 내보내는 로컬 HTTP 서버를 데몬 스레드로 시작"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, name="vedic-metrics-http", daemon=True).start()
+    return server
+
+
+def _write_periodically(path, interval):
+    while True:
+        time.sleep(interval)
+        try:
+            write_file(path)
+        except OSError as e:
+            error("metrics_file", e)
+
+
+def start_exporters():
+    """환경 변수로 지정한 내보내기를 프로세스당 한 번 시작 (꺼져 있으면 아무것도 안 함)"""
+    global _exporters_started
+    if not ENABLED or _exporters_started:
+        return
+    with _lock:
+        if _exporters_started:
+            return
+        _exporters_started = True
+    port = os.environ.get("VEDIC_METRICS_PORT")
+    if port:
+        try:
+            serve(int(port), os.environ.get("VEDIC_METRICS_HOST", "127.0.0.1"))
+        except OSError as e:
+            # 같은 포트를 다른 워커 프로세스가 이미 쓰는 경우
+            error("metrics_http", e)
+    path = os.environ.get("VEDIC_METRICS_FILE")
+    if path:
+        interval = float(os.environ.get("VEDIC_METRICS_INTERVAL", "15"))
+        threading.Thread(target=_write_periodically, args=(path, interval),
+                         name="vedic-metrics-file", daemon=True).start()
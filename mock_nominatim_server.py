@@ -0,0 +1,116 @@
+"""오프라인 테스트용 Nominatim /search 모의 서버
+
+실행: python mock_nominatim_server.py --port 8766 [--latency 0.05] [--rate 0]
+앱 연결: VEDIC_NOMINATIM_DOMAIN=127.0.0.1:8766 VEDIC_NOMINATIM_SCHEME=http streamlit run vedic_compatibility_app.py
+어떤 질의든 질의 문자열에서 정해지는 좌표 하나를 돌려준다 ("없는"으로 시작하면 빈 결과).
+--rate 를 주면 최근 1초 동안 받은 요청이 그보다 많을 때 429로 거절한다 (이용 정책 위반 흉내).
+"""
+import argparse
+import hashlib
+import json
+import sys
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+def place_for(query):
+    """질의 → (위도, 경도, 주소) - 같은 질의는 항상 같은 좌표"""
+    digest = hashlib.sha256(query.encode()).digest()
+    lat = int.from_bytes(digest[:4], "big") / 2 ** 32 * 120 - 55
+    lon = int.from_bytes(digest[4:8], "big") / 2 ** 32 * 360 - 180
+    return round(lat, 6), round(lon, 6), f"{query} (mock)"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        url = urlparse(self.path)
+        query = parse_qs(url.query).get("q", [""])[0]
+        now = time.monotonic()
+        with server.lock:
+            server.requests += 1
+            window = server.window
+            while window and window[0] <= now - 1.0:
+                window.popleft()
+            limited = server.rate and len(window) >= server.rate
+            window.append(now)
+            if limited:
+                server.rejected += 1
+            else:
+                server.active += 1
+                server.peak = max(server.peak, server.active)
+        if limited:
+            self._send(429, b'{"error": "Too Many Requests (mock)"}')
+            return
+        try:
+            if url.path.rstrip("/") != "/search":
+                self._send(404, b"[]")
+                return
+            time.sleep(server.latency)
+            results = []
+            if query and not query.startswith("없는"):
+                lat, lon, address = place_for(query)
+                results.append({"place_id": 1, "lat": str(lat), "lon": str(lon), "display_name": address})
+            self._send(200, json.dumps(results, ensure_ascii=False).encode())
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def _send(self, status, payload):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class _Server(ThreadingHTTPServer):
+    def handle_error(self, request, client_address):
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            return
+        super().handle_error(request, client_address)
+
+
+def start(port=0, latency=0.05, rate=0):
+    """백그라운드 스레드에서 서버 시작 - (서버, 도메인) 반환
+
+    server.requests(요청 수), server.peak(최대 동시 처리 수), server.rejected(429 수)로 확인한다.
+    """
+    server = _Server(("127.0.0.1", port), _Handler)
+    server.daemon_threads = True
+    server.latency = latency
+    server.rate = rate
+    server.requests = 0
+    server.active = 0
+    server.peak = 0
+    server.rejected = 0
+    server.window = deque()
+    server.lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"127.0.0.1:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--latency", type=float, default=0.05, help="응답 지연 (초)")
+    parser.add_argument("--rate", type=int, default=0, help="초당 허용 요청 수 (0이면 없음)")
+    args = parser.parse_args()
+    server, domain = start(args.port, args.latency, args.rate)
+    print(f"VEDIC_NOMINATIM_DOMAIN={domain} VEDIC_NOMINATIM_SCHEME=http")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""오프라인 테스트용 OpenAI Chat Completions 모의 서버
+
+실행: python mock_openai_server.py --port 8765 [--ttft 0.3] [--delay 0.02] [--max-concurrent 0]
+앱 연결: OPENAI_BASE_URL=http://127.0.0.1:8765/v1 streamlit run vedic_compatibility_app.py
+stream=true 요청에는 SSE 조각을, 아니면 완성된 응답 JSON을 돌려준다.
+--max-concurrent 를 주면 동시에 처리 중인 요청이 그보다 많을 때 429(rate limit)로 거절한다.
+"""
+import argparse
+import json
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+REPLY = """### 1. 각 쿠타 점수에 대한 해석
+타라와 나디가 이 인연의 흐름을 결정합니다. 별들은 이미 답을 알고 있습니다.
+
+### 2. 🔮 Karmic Connection (업보적 연결)
+라후와 케투의 축이 두 사람을 전생의 약속으로 묶어 두었습니다.
+
+### 3. 종합 궁합 해석
+{name1}와 {name2}, 총점 {total}점 - 우주는 결코 우연을 만들지 않습니다."""
+
+
+def _reply_for(body):
+    prompt = " ".join(m.get("content", "") for m in body.get("messages", []))
+    match = re.search(r"총점: (\d+)/100", prompt)
+    names = re.findall(r"【(.+?)의 차트】", prompt) + ["?", "?"]
+    return REPLY.format(total=match.group(1) if match else "?", name1=names[0], name2=names[1])
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            limited = server.max_concurrent and server.active >= server.max_concurrent
+            if limited:
+                server.rejected += 1
+            else:
+                server.active += 1
+                server.peak = max(server.peak, server.active)
+        if limited:
+            self._rate_limited()
+            return
+        try:
+            self._complete(body)
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def _rate_limited(self):
+        payload = json.dumps({"error": {"message": "Rate limit reached (mock)", "type": "requests",
+                                        "code": "rate_limit_exceeded"}}).encode()
+        self.send_response(429)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.send_header("retry-after-ms", "500")
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _complete(self, body):
+        if not self.path.endswith("/chat/completions"):
+            self.send_error(404)
+            return
+        text = _reply_for(body)
+        time.sleep(self.server.ttft)
+        if body.get("stream"):
+            self._stream(body, text)
+        else:
+            time.sleep(self.server.delay * len(text) / 4)
+            payload = json.dumps({
+                "id": "chatcmpl-mock", "object": "chat.completion", "created": int(time.time()),
+                "model": body.get("model", "mock"),
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": text}}],
+                "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+            }, ensure_ascii=False).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+    def _stream(self, body, text):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        # 대략 토큰 크기(4글자) 단위로 나눠 보낸다
+        for i in range(0, len(text), 4):
+            self._chunk(body, {"content": text[i:i + 4]}, None)
+            time.sleep(self.server.delay)
+        self._chunk(body, {}, "stop")
+        self._write(b"data: [DONE]\n\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _chunk(self, body, delta, finish_reason):
+        event = {
+            "id": "chatcmpl-mock", "object": "chat.completion.chunk", "created": int(time.time()),
+            "model": body.get("model", "mock"),
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        }
+        self._write(f"data: {json.dumps(event, ensure_ascii=False)}\n\n".encode())
+
+    def _write(self, data):
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+
+class _Server(ThreadingHTTPServer):
+    def handle_error(self, request, client_address):
+        # 클라이언트가 [DONE] 뒤 마지막 청크를 읽지 않고 연결을 닫는 경우는 정상
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            return
+        super().handle_error(request, client_address)
+
+
+def start(port=0, ttft=0.3, delay=0.02, max_concurrent=0):
+    """백그라운드 스레드에서 서버 시작 - (서버, base_url) 반환
+
+    server.requests(요청 수), server.peak(최대 동시 처리 수), server.rejected(429 수)로 확인한다.
+    """
+    server = _Server(("127.0.0.1", port), _Handler)
+    server.daemon_threads = True
+    server.ttft = ttft
+    server.delay = delay
+    server.max_concurrent = max_concurrent
+    server.requests = 0
+    server.active = 0
+    server.peak = 0
+    server.rejected = 0
+    server.lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--ttft", type=float, default=0.3, help="첫 토큰까지 지연 (초)")
+    parser.add_argument("--delay", type=float, default=0.02, help="조각 사이 지연 (초)")
+    parser.add_argument("--max-concurrent", type=int, default=0, help="동시 처리 상한 (0이면 없음)")
+    args = parser.parse_args()
+    server, base_url = start(args.port, args.ttft, args.delay, args.max_concurrent)
+    print(f"OPENAI_BASE_URL={base_url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
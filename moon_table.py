@@ -0,0 +1,248 @@
+"""미리 계산한 달 항성황도 경도표 (1900~2026, 기본 10분 간격)
+
+빌드:  python -m moon_table build [--out 경로] [--step-minutes 10] [--workers 4]
+검증:  python -m moon_table report [--n 20000] [--charts 300]
+
+표는 float32 배열 파일(약 27MB)이며 numpy.memmap 으로 열어 모든 워커 프로세스가
+같은 페이지 캐시를 공유한다. 조회는 두 표본 사이를 선형 보간하고, 결과가 파다 경계에
+BOUNDARY_MARGIN 보다 가까우면 스위스 에페메리스로 다시 계산한다.
+"""
+import argparse
+import os
+import struct
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from caching import CACHE_DIR
+from vedic_core import PADA_SPAN
+
+DEFAULT_PATH = os.environ.get("VEDIC_MOON_TABLE", os.path.join(CACHE_DIR, "moon_lon_1900_2026.f32"))
+
+# 현지 날짜 1900-01-01 ~ 2026-12-31 을 UT로 바꿔도 들어오도록 앞뒤로 하루씩 여유를 둔다
+START_JD = 2415019.5  # 1899-12-31 00:00 UT
+END_JD = 2461408.5    # 2027-01-02 00:00 UT
+# 보간 오차(~3e-6°) + float32 반올림(~1.5e-5°) 보다 충분히 큰 여유 (달 기준 약 6초)
+BOUNDARY_MARGIN = 1e-3
+
+_MAGIC = b"MOONLON1"
+_HEADER = struct.Struct("<8sddQ")  # 매직, 시작 JD, 간격(일), 표본 수
+
+
+class MoonTable:
+    """memmap으로 연 달 경도표 - 복사 없이 파일을 그대로 참조한다"""
+
+    def __init__(self, path=DEFAULT_PATH):
+        with open(path, "rb") as f:
+            magic, self.start, self.step, count = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != _MAGIC:
+            raise ValueError(f"{path}: 달 경도표 파일이 아닙니다")
+        self.path = path
+        self.data = np.memmap(path, dtype="<f4", mode="r", offset=_HEADER.size, shape=(count,))
+        # 스칼라 조회용 - memmap 하위 클래스의 인덱싱 오버헤드가 없는 같은 메모리의 뷰
+        self._flat = self.data.view(np.ndarray)
+        self.end = self.start + self.step * (count - 1)
+
+    @classmethod
+    def from_samples(cls, start, step, data):
+        """파일 없이 메모리 배열로 만든 표 (짧은 구간용)"""
+        table = cls.__new__(cls)
+        table.path = None
+        table.start, table.step = start, step
+        table.data = table._flat = np.asarray(data, dtype=np.float64)
+        table.end = start + step * (len(data) - 1)
+        return table
+
+    @classmethod
+    def compute(cls, jd_start, jd_end, step=10 / 1440):
+        """[jd_start, jd_end] 구간을 덮는 작은 표를 즉석에서 계산 (표 파일이 없을 때)"""
+        count = int(np.ceil((jd_end - jd_start) / step)) + 2
+        return cls.from_samples(jd_start, step, _exact(jd_start + np.arange(count) * step))
+
+    def covers(self, jds):
+        jds = np.asarray(jds)
+        return (jds >= self.start) & (jds < self.end)
+
+    def lookup(self, jds):
+        """UT 율리우스일 배열 → 보간한 달 경도 배열 (범위 밖이면 IndexError)"""
+        jds = np.asarray(jds, dtype=np.float64)
+        pos = (jds - self.start) / self.step
+        i = np.floor(pos).astype(np.int64)
+        if np.any(i < 0) or np.any(i + 1 >= len(self.data)):
+            raise IndexError("달 경도표 범위를 벗어난 시각입니다")
+        a = self.data[i].astype(np.float64)
+        b = self.data[i + 1].astype(np.float64)
+        # 달은 항상 순행하므로 360° 넘어가는 구간은 (b - a) % 360 로 처리된다
+        return (a + ((b - a) % 360) * (pos - i)) % 360
+
+    def lookup_one(self, jd):
+        """단일 시각 조회 (배열 연산 오버헤드 없이), 범위 밖이면 None"""
+        pos = (jd - self.start) / self.step
+        i = int(pos)
+        if pos < 0 or i + 1 >= len(self._flat):
+            return None
+        a = float(self._flat[i])
+        b = float(self._flat[i + 1])
+        return (a + ((b - a) % 360) * (pos - i)) % 360
+
+
+def _distance_one(lon):
+    in_pada = lon % PADA_SPAN
+    return min(in_pada, PADA_SPAN - in_pada)
+
+
+def boundary_distance(lons):
+    """파다 경계(kuta_table 산식 기준)까지의 최소 거리 (도) - 낙샤트라/라시 경계와 0°/360°도 파다 경계다"""
+    in_pada = np.asarray(lons, dtype=np.float64) % PADA_SPAN
+    return np.minimum(in_pada, PADA_SPAN - in_pada)
+
+
+_table = None
+_table_checked = False
+
+
+def get_table():
+    """기본 경로의 표 (없으면 None - 호출자는 전체 계산으로 넘어간다)"""
+    global _table, _table_checked
+    if not _table_checked:
+        _table_checked = True
+        if os.path.exists(DEFAULT_PATH):
+            _table = MoonTable(DEFAULT_PATH)
+    return _table
+
+
+def _exact(jds):
+    """스위스 에페메리스로 달 경도만 계산 (ephemeris.positions_batch의 달 열과 같은 값)"""
+    import ephemeris
+    import swisseph as swe
+    jds = np.atleast_1d(np.asarray(jds, dtype=np.float64))
+    out = np.empty(len(jds))
+    with ephemeris._lock:
+        ephemeris._configure()
+        for i in range(len(jds)):
+            out[i] = swe.calc_ut(jds[i], swe.MOON, ephemeris._FLAGS)[0][0]
+    return out
+
+
+def moon_longitudes(jds, margin=BOUNDARY_MARGIN, table=None):
+    """UT 율리우스일 배열 → 달 항성황도 경도 배열
+
+    표가 있고 범위 안이면 보간값을 쓰되, 파다 경계에서 margin 이내인 값과
+    표 범위 밖의 시각은 스위스 에페메리스로 정확히 계산한다.
+    """
+    jds = np.atleast_1d(np.asarray(jds, dtype=np.float64))
+    table = table or get_table()
+    if table is None:
+        return _exact(jds)
+    lons = np.empty_like(jds)
+    inside = table.covers(jds)
+    lons[inside] = table.lookup(jds[inside])
+    redo = ~inside
+    redo[inside] = boundary_distance(lons[inside]) < margin
+    if redo.any():
+        lons[redo] = _exact(jds[redo])
+    return lons
+
+
+def moon_longitude_jd(jd, margin=BOUNDARY_MARGIN, table=None):
+    """moon_longitudes의 단일 시각 버전"""
+    table = table or get_table()
+    lon = table.lookup_one(jd) if table is not None else None
+    if lon is None or _distance_one(lon) < margin:
+        return float(_exact([jd])[0])
+    return lon
+
+
+def moon_longitude(year, month, day, hour, minute, tz_str):
+    """현지 출생 시각의 달 항성황도 경도 (calculate_chart의 moon_lon 과 같은 값)"""
+    import ephemeris
+    return moon_longitude_jd(ephemeris.julian_day(year, month, day, hour, minute, tz_str))
+
+
+def _build_chunk(args):
+    first, count, step = args
+    return _exact(START_JD + (first + np.arange(count)) * step).astype("<f4")
+
+
+def build(path=DEFAULT_PATH, step_minutes=10, workers=None, chunk=100000):
+    """표 파일 생성 - 구간별로 나눠 프로세스 풀에서 계산하고 순서대로 이어 쓴다"""
+    step = step_minutes / 1440
+    count = int(round((END_JD - START_JD) / step)) + 1
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = path + ".tmp"
+    jobs = [(first, min(chunk, count - first), step) for first in range(0, count, chunk)]
+    with open(tmp, "wb") as f, ProcessPoolExecutor(max_workers=workers) as pool:
+        f.write(_HEADER.pack(_MAGIC, START_JD, step, count))
+        for done, block in enumerate(pool.map(_build_chunk, jobs), 1):
+            f.write(block.tobytes())
+            print(f"\r{done}/{len(jobs)} 구간", end="", file=sys.stderr)
+    print(file=sys.stderr)
+    os.replace(tmp, path)
+    return path
+
+
+def report(path=DEFAULT_PATH, n=20000, charts=300, seed=0):
+    """보간 정확도 보고 - 무작위 시각과 파다 경계를 지나는 표본 구간 안의 시각을 검사 (불일치가 있으면 1)"""
+    from kuta_batch import moon_slots
+
+    table = MoonTable(path)
+    rng = np.random.default_rng(seed)
+    random_jds = rng.uniform(table.start, table.end, n)
+
+    # 표본 사이에서 파다 슬롯이 바뀌는 구간을 찾아 그 안의 시각을 고른다
+    probe = rng.integers(0, len(table.data) - 1, n * 20)
+    changed = probe[moon_slots(table.data[probe]) != moon_slots(table.data[probe + 1])][:n]
+    boundary_jds = table.start + (changed + rng.uniform(0, 1, len(changed))) * table.step
+
+    failures = 0
+    print(f"표: {path} ({len(table.data)}개 표본, {table.step * 1440:.0f}분 간격)")
+    for label, jds in (("무작위 시각", random_jds), ("파다 경계 구간", boundary_jds)):
+        exact = _exact(jds)
+        interp = table.lookup(jds)
+        err = np.abs((interp - exact + 180) % 360 - 180)
+        raw_miss = int(np.sum(moon_slots(interp) != moon_slots(exact)))
+        final_miss = int(np.sum(moon_slots(moon_longitudes(jds, table=table)) != moon_slots(exact)))
+        fallback = int(np.sum(boundary_distance(interp) < BOUNDARY_MARGIN))
+        failures += final_miss
+        print(f"[{label}] {len(jds)}건: 최대 오차 {err.max():.2e}°, p99 {np.percentile(err, 99):.2e}°, "
+              f"보간만 쓴 슬롯 불일치 {raw_miss}건, 전체 계산 대체 {fallback}건, 최종 불일치 {final_miss}건")
+
+    # calculate_chart 기준(kerykeion 백엔드) 대조 - 경계 구간 시각을 분 단위 UTC 출생 시각으로 바꿔 비교
+    import swisseph as swe
+    import vedic_core
+    mismatches = 0
+    births = boundary_jds[:charts]
+    for jd in births:
+        y, m, d, h = swe.revjul(jd)
+        hour, minute = divmod(int(h * 60), 60)
+        chart = vedic_core.kerykeion_chart("p", y, m, d, hour, minute, 0.0, 0.0, "UTC")
+        ours = moon_longitude_jd(swe.julday(y, m, d, hour + minute / 60), table=table)
+        if vedic_core.get_nakshatra(ours) != chart["nakshatra"]:
+            mismatches += 1
+            print(f"불일치 {y}-{m:02d}-{d:02d} {hour:02d}:{minute:02d} UTC: "
+                  f"{vedic_core.get_nakshatra(ours)} != {chart['nakshatra']}")
+    print(f"[calculate_chart 대조] 경계 구간 출생 {len(births)}건: 낙샤트라/파다 불일치 {mismatches}건")
+    return 1 if failures or mismatches else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_build = sub.add_parser("build", help="표 파일 생성")
+    p_build.add_argument("--out", default=DEFAULT_PATH)
+    p_build.add_argument("--step-minutes", type=float, default=10)
+    p_build.add_argument("--workers", type=int)
+    p_report = sub.add_parser("report", help="보간 정확도 보고")
+    p_report.add_argument("--path", default=DEFAULT_PATH)
+    p_report.add_argument("--n", type=int, default=20000)
+    p_report.add_argument("--charts", type=int, default=300, help="calculate_chart와 대조할 출생 수")
+    args = parser.parse_args()
+    if args.command == "build":
+        print(build(args.out, args.step_minutes, args.workers))
+    else:
+        sys.exit(report(args.path, args.n, args.charts))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import threading
+import time
+from contextlib import contextmanager
+
+import metrics
+from vedic_core import calculate_chart, get_location_coordinates, get_timezone
+
+# 분석 파이프라인 - 두 사람의 지오코딩 → 타임존 → 차트 체인은 서로 독립이므로
+# 스레드 풀에서 동시에 돌리고, 궁합 점수/해석 단계에서만 합류한다.
+
+
+class LocationNotFound(ValueError):
+    def __init__(self, city):
+        super().__init__(f"'{city}' 위치를 찾을 수 없습니다.")
+        self.city = city
+
+
+class StageTimer:
+    """단계별 (이름, 시작 오프셋, 소요 시간) 기록 - 여러 스레드에서 함께 쓴다
+
+    metric을 주면 같은 구간을 metrics의 단계 히스토그램에도 넣고, 파이프라인 밖으로 빠져나가는
+    예외를 그 단계의 오류로 센다 (안쪽 metrics.stage는 세지 않으므로 한 번만).
+    metrics.tracing(timer) 안에서 재는 하위 구간(Nominatim 호출, 백엔드 차트 계산 등)은
+    details에 따로 모인다.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.records = []
+        self.details = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name, metric=None):
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            if metric:
+                metrics.error(metric, e)
+            raise
+        finally:
+            self.record(name, start, time.perf_counter(), metric)
+
+    def record(self, name, start, end, metric=None, detail=False):
+        """perf_counter 기준 (start, end) 구간을 단계로 기록"""
+        if metric:
+            metrics.observe("vedic_stage_seconds", end - start, stage=metric)
+        with self._lock:
+            (self.details if detail else self.records).append((name, start - self.started, end - start))
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def report(self):
+        """시작 순서로 정렬한 기록과 (전체 경과, 단계 합계)"""
+        records = sorted(self.records, key=lambda r: r[1])
+        return records, self.elapsed(), sum(r[2] for r in records)
+
+    def waterfall(self):
+        """단계와 하위 구간을 합쳐 시작 순서로 - [(이름, 오프셋, 소요 시간, 하위 구간 여부)]"""
+        with self._lock:
+            rows = [r + (False,) for r in self.records] + [r + (True,) for r in self.details]
+        return sorted(rows, key=lambda r: (r[1], r[3]))
+
+
+def compute_person_chart(label, name, birth_date, hour, minute, city, timer):
+    """한 사람의 지오코딩 → 타임존 → 차트 계산 체인"""
+    with metrics.tracing(timer):
+        with timer.stage(f"지오코딩 {label}", "geocode"):
+            lat, lon, _ = get_location_coordinates(city)
+        if lat is None:
+            # 찾지 못함/네트워크 오류는 geocoding이 이미 센다 (조회 결과 not_found, 오류 geocode)
+            raise LocationNotFound(city)
+        with timer.stage(f"타임존 {label}", "timezone"):
+            tz = get_timezone(lat, lon)
+        with timer.stage(f"차트 계산 {label}", "chart"):
+            return calculate_chart(name, birth_date.year, birth_date.month, birth_date.day,
+                                   hour, minute, lat, lon, tz)
+
+
+def sweep_person_time(label, birth_date, city, start_minute, end_minute, timer):
+    """출생 시간을 모르는 사람의 [start_minute, end_minute) 스윕 (위치/타임존은 캐시에서 바로 나온다)"""
+    lat, lon, _ = get_location_coordinates(city)
+    if lat is None:
+        raise LocationNotFound(city)
+    tz = get_timezone(lat, lon)
+    with timer.stage(f"시간 스윕 {label}", "sweep"):
+        import sweep
+        return sweep.sweep_person(birth_date.year, birth_date.month, birth_date.day,
+                                  lat, lon, tz, start_minute, end_minute)
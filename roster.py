@@ -0,0 +1,173 @@
+"""프로필 명단에서 궁합 상위 k명을 찾는 파다 슬롯 역색인
+
+빌드:  python -m roster build profiles.csv -o roster.npz
+조회:  python -m roster query roster.npz --date 1990-01-01 --time 14:30 --city 서울 -k 10 --require 나디=1
+
+아쉬타쿠타 점수는 두 사람의 파다 슬롯(108개)만으로 정해지므로 명단을 슬롯별 버킷에
+id 목록으로 나눠 둔다. 조회는 질의 슬롯과 108개 버킷의 점수를 점수표에서 읽어
+제약을 통과한 버킷을 총점 순으로 훑을 뿐, 프로필 수에 비례하는 스캔을 하지 않는다.
+명단 CSV/JSONL 열: name, date(YYYY-MM-DD), time(HH:MM), city, 그리고 선택적으로 id.
+"""
+import argparse
+import sys
+from array import array
+
+import numpy as np
+
+from kuta_batch import moon_slots
+from kuta_table import KUTA_NAMES, N_SLOTS, TABLE, moon_slot
+
+
+class RosterIndex:
+    """슬롯별 버킷(array('q'))에 내부 id를 모아 두는 역색인 - 추가는 순서대로 쌓인다"""
+
+    def __init__(self):
+        self.keys = []
+        self.slots = array("B")
+        self.buckets = [array("q") for _ in range(N_SLOTS)]
+
+    def __len__(self):
+        return len(self.keys)
+
+    def add(self, key, moon_lon):
+        """프로필 하나 추가 - 내부 id를 돌려준다"""
+        return self._add_slot(key, moon_slot(moon_lon))
+
+    def _add_slot(self, key, slot):
+        pid = len(self.keys)
+        self.keys.append(key)
+        self.slots.append(slot)
+        self.buckets[slot].append(pid)
+        return pid
+
+    def add_many(self, keys, moon_lons):
+        """여러 프로필을 한 번에 추가 (슬롯별로 정렬해 버킷마다 한 번씩 붙인다)"""
+        self.add_slots(keys, moon_slots(moon_lons))
+
+    def add_slots(self, keys, slots):
+        """이미 계산된 파다 슬롯으로 추가 (chart_record.ChartStore.moon_slots 등)"""
+        slots = np.asarray(slots, dtype=np.uint8)
+        first = len(self.keys)
+        self.keys.extend(keys)
+        self.slots.frombytes(slots.tobytes())
+        order = np.argsort(slots, kind="stable")
+        bounds = np.searchsorted(slots[order], np.arange(N_SLOTS + 1))
+        ids = (order + first).astype(np.int64)
+        for slot in range(N_SLOTS):
+            if bounds[slot] < bounds[slot + 1]:
+                self.buckets[slot].frombytes(ids[bounds[slot]:bounds[slot + 1]].tobytes())
+
+    def bucket_order(self, moon_lon, require=None, min_total=0):
+        """질의 달 경도에 대해 제약을 통과한 (슬롯, 총점)을 총점 내림차순으로
+
+        require는 {쿠타 이름: 최소 점수} (예: {"나디": 1}은 나디 점수가 0이 아닌 상대만).
+        질의 사람이 calculate_ashta_kuta의 chart1 자리에 온다.
+        """
+        rows = TABLE[moon_slot(moon_lon)]
+        ok = rows[:, 8] >= min_total
+        for name, minimum in (require or {}).items():
+            ok &= rows[:, KUTA_NAMES.index(name)] >= minimum
+        slots = np.flatnonzero(ok)
+        slots = slots[np.argsort(-rows[slots, 8].astype(np.int64), kind="stable")]
+        return [(int(s), int(rows[s, 8])) for s in slots]
+
+    def query(self, moon_lon, k=10, require=None, min_total=0, exclude=()):
+        """상위 k명 [(key, 총점, 쿠타별 점수 dict)] - 총점이 같으면 슬롯 번호, 추가 순서 순"""
+        rows = TABLE[moon_slot(moon_lon)]
+        exclude = set(exclude)
+        found = []
+        for slot, total in self.bucket_order(moon_lon, require, min_total):
+            bucket = self.buckets[slot]
+            if not bucket:
+                continue
+            scores = dict(zip(KUTA_NAMES, rows[slot, :8].tolist()))
+            for pid in bucket:
+                key = self.keys[pid]
+                if key in exclude:
+                    continue
+                found.append((key, total, scores))
+                if len(found) >= k:
+                    return found
+        return found
+
+    @classmethod
+    def from_store(cls, store):
+        """chart_record.ChartStore 전체로 색인 - 슬롯 열만 읽는다"""
+        index = cls()
+        index.add_slots(store.names(), store.moon_slots())
+        return index
+
+    def save(self, path):
+        np.savez(path, keys=np.array(self.keys, dtype=str), slots=np.frombuffer(self.slots, dtype=np.uint8))
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path)
+        index = cls()
+        index.add_slots(data["keys"].tolist(), data["slots"])
+        return index
+
+
+def parse_require(items):
+    """["나디=1", ...] → {"나디": 1}"""
+    require = {}
+    for item in items or []:
+        name, _, value = item.partition("=")
+        if name not in KUTA_NAMES:
+            raise ValueError(f"알 수 없는 쿠타: {name} (가능: {', '.join(KUTA_NAMES)})")
+        require[name] = int(value or 1)
+    return require
+
+
+def _moon_of(row):
+    """명단 행 → 달 항성황도 경도 (batch.prepare_person으로 위치/타임존을 구한다)"""
+    import moon_table
+    from batch import prepare_person
+    _, year, month, day, hour, minute, _, _, tz = prepare_person(row, "")
+    return moon_table.moon_longitude(year, month, day, hour, minute, tz)
+
+
+def build(path, out, fmt):
+    from batch import read_rows
+    index = RosterIndex()
+    skipped = 0
+    for n, row in enumerate(read_rows(path, fmt)):
+        try:
+            index.add(row.get("id") or row.get("name") or str(n), _moon_of(row))
+        except Exception as e:
+            skipped += 1
+            print(f"{n}행 건너뜀: {type(e).__name__}: {e}", file=sys.stderr)
+    index.save(out)
+    print(f"{len(index)}명 저장 ({skipped}건 건너뜀) → {out}", file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_build = sub.add_parser("build", help="명단 파일에서 색인 생성")
+    p_build.add_argument("input")
+    p_build.add_argument("-o", "--output", required=True)
+    p_build.add_argument("--input-format", choices=["csv", "jsonl"])
+    p_query = sub.add_parser("query", help="상위 k명 조회")
+    p_query.add_argument("roster")
+    p_query.add_argument("--date", required=True)
+    p_query.add_argument("--time", required=True)
+    p_query.add_argument("--city", required=True)
+    p_query.add_argument("-k", type=int, default=10)
+    p_query.add_argument("--require", action="append", help="쿠타=최소점수 (반복 가능, 예: 나디=1)")
+    p_query.add_argument("--min-total", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        fmt = args.input_format or ("jsonl" if args.input.endswith(".jsonl") else "csv")
+        build(args.input, args.output, fmt)
+        return 0
+    index = RosterIndex.load(args.roster)
+    moon = _moon_of({"date": args.date, "time": args.time, "city": args.city})
+    for key, total, scores in index.query(moon, args.k, parse_require(args.require), args.min_total):
+        print(f"{total:3d}점  {key}  " + ", ".join(f"{n} {v}" for n, v in scores.items()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
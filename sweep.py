@@ -0,0 +1,186 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import swisseph as swe
+
+import ephemeris
+import moon_table
+from kuta_batch import moon_slots
+from kuta_table import TABLE
+from vedic_core import NAKSHATRAS, RASHI_KO, SIGN_ORDER
+
+# 출생 시간 불확실성 스윕 - 하루 안에서 의미 있게 움직이는 것은 달(약 0.5°/시)과
+# 상승궁(약 1°/4분)뿐이므로 1,440번의 전체 차트 계산 대신
+#   - 달: moon_table 보간으로 분 단위 경도 배열을 한 번에 만들고 (파다 경계 근처는 정확 계산)
+#   - 상승궁: 창 시작 시점의 ARMC에서 항성시를 선형으로 진행시킨 닫힌 식으로 계산하고
+#   - 점수: 파다 슬롯별 분(minute) 수만 세어 슬롯 쌍 단위로 점수표를 조회한다.
+# 슬롯/별자리가 바뀌는 분 사이 구간은 정확한 에페메리스로 이분 탐색해 초 단위로 찾는다.
+
+# 항성시 진행 속도 (도/일)
+_ARMC_RATE = 360.98564736629
+# 경계 시각 이분 탐색 정밀도 (일) - 약 0.5초
+_BISECT_TOLERANCE = 0.5 / 86400
+
+
+def _local_jds(year, month, day, tz_str, minutes):
+    """현지 날짜의 자정부터 minutes분 뒤 시각들 → UT 율리우스일 배열
+
+    DST 전환이 없는 날은 한 번의 오프셋으로 계산하고, 있는 날만 분마다 오프셋을 구한다.
+    (없는 시각/겹치는 시각은 표준시 기준)
+    """
+    import pytz
+    tz = pytz.timezone(tz_str)
+    midnight = datetime(year, month, day)
+
+    def offset(m):
+        return tz.localize(midnight + timedelta(minutes=int(m)), is_dst=False).utcoffset().total_seconds() / 60
+
+    first, last = offset(minutes[0]), offset(minutes[-1])
+    offsets = first if first == last else np.array([offset(m) for m in minutes])
+    return swe.julday(year, month, day, 0.0) + (minutes - offsets) / 1440
+
+
+def _ascendants(jds, lat, lon):
+    """상승궁 항성황도 경도 배열 - 첫 시각의 ARMC, 황도경사, 아야남사를 하루 동안 고정"""
+    with ephemeris._lock:
+        ephemeris._configure()
+        armc0 = swe.houses_ex(jds[0], lat, lon, ephemeris._HOUSE_SYSTEM, ephemeris._FLAGS)[1][2]
+        eps = np.radians(swe.calc_ut(jds[0], swe.ECL_NUT)[0][0])
+        ayanamsa = swe.get_ayanamsa_ex_ut(jds[0], ephemeris._FLAGS)[1]
+    armc = np.radians(armc0 + _ARMC_RATE * (jds - jds[0]))
+    tropical = np.degrees(np.arctan2(np.cos(armc), -(np.sin(armc) * np.cos(eps) + np.tan(np.radians(lat)) * np.sin(eps))))
+    if abs(lat) >= 90 - np.degrees(eps):
+        # 극권에서는 swisseph처럼 상승궁이 MC보다 뒤에 오면 정반대 점(하강점)과 바꾼다
+        mc = np.degrees(np.arctan2(np.sin(armc), np.cos(armc) * np.cos(eps)))
+        tropical = np.where((tropical - mc + 180) % 360 - 180 < 0, tropical + 180, tropical)
+    return (tropical - ayanamsa) % 360
+
+
+def _exact_ascendant(jd, lat, lon):
+    with ephemeris._lock:
+        ephemeris._configure()
+        return swe.houses_ex(jd, lat, lon, ephemeris._HOUSE_SYSTEM, ephemeris._FLAGS)[1][0]
+
+
+def _bisect(f, lo, hi, start_value):
+    """f(lo) == start_value, f(hi) != start_value 인 구간에서 값이 바뀌는 시각"""
+    while hi - lo > _BISECT_TOLERANCE:
+        mid = (lo + hi) / 2
+        if f(mid) == start_value:
+            lo = mid
+        else:
+            hi = mid
+    return hi
+
+
+def slot_label(slot):
+    return f"{NAKSHATRAS[slot // 4]} (파다 {slot % 4 + 1})"
+
+
+def format_minute(minute):
+    """하루 시작부터의 분 → HH:MM:SS 문자열"""
+    seconds = int(round(minute * 60))
+    return f"{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+def sweep_person(year, month, day, lat, lon, tz_str, start_minute=0, end_minute=1440, step=1):
+    """현지 날짜의 [start_minute, end_minute) 구간을 step분 간격으로 훑은 결과
+
+    {"minutes", "jds", "moon_lons", "slots", "asc_lons", "asc_signs", "crossings"}
+    crossings는 시각 순서의 {"minute", "time", "jd", "kind", "from", "to", "slot_before", "slot_after"}
+    목록이며 kind는 "라시"/"낙샤트라"/"파다"/"상승궁" 중 하나다.
+    """
+    minutes = np.arange(start_minute, end_minute, step, dtype=np.float64)
+    jds = _local_jds(year, month, day, tz_str, minutes)
+    table = moon_table.get_table()
+    if table is None or not table.covers(jds).all():
+        table = moon_table.MoonTable.compute(jds.min(), jds.max())
+    moon_lons = moon_table.moon_longitudes(jds, table=table)
+    slots = moon_slots(moon_lons)
+    asc_lons = _ascendants(jds, lat, lon)
+    asc_signs = (asc_lons // 30).astype(np.int64) % 12
+
+    def moon_slot_at(jd):
+        return int(moon_slots(moon_table._exact([jd]))[0])
+
+    def asc_sign_at(jd):
+        return int(_exact_ascendant(jd, lat, lon) // 30) % 12
+
+    def minute_at(k, jd):
+        frac = (jd - jds[k]) / (jds[k + 1] - jds[k])
+        return float(minutes[k] + frac * (minutes[k + 1] - minutes[k]))
+
+    crossings = []
+    for k in np.flatnonzero(slots[1:] != slots[:-1]):
+        before, after = int(slots[k]), int(slots[k + 1])
+        jd = _bisect(moon_slot_at, jds[k], jds[k + 1], before)
+        kind = "라시" if before // 9 != after // 9 else "낙샤트라" if before // 4 != after // 4 else "파다"
+        crossings.append({"minute": minute_at(k, jd), "jd": jd, "kind": kind,
+                          "from": slot_label(before), "to": slot_label(after),
+                          "slot_before": before, "slot_after": after})
+    for k in np.flatnonzero(asc_signs[1:] != asc_signs[:-1]):
+        before, after = int(asc_signs[k]), int(asc_signs[k + 1])
+        jd = _bisect(asc_sign_at, jds[k], jds[k + 1], before)
+        crossings.append({"minute": minute_at(k, jd), "jd": jd, "kind": "상승궁",
+                          "from": RASHI_KO[SIGN_ORDER[before]], "to": RASHI_KO[SIGN_ORDER[after]]})
+    crossings.sort(key=lambda c: c["minute"])
+    for c in crossings:
+        c["time"] = format_minute(c["minute"])
+
+    return {"minutes": minutes, "jds": jds, "moon_lons": moon_lons, "slots": slots,
+            "asc_lons": asc_lons, "asc_signs": asc_signs, "crossings": crossings}
+
+
+def fixed_person(chart):
+    """시간을 아는 사람 - chart_data의 달 경도 하나로 sweep_person과 같은 모양을 만든다"""
+    lons = np.array([chart["moon_lon"]])
+    return {"minutes": None, "moon_lons": lons, "slots": moon_slots(lons), "crossings": []}
+
+
+def compatibility_sweep(person1, person2):
+    """두 사람(sweep_person 또는 fixed_person 결과)의 모든 시각 조합에 대한 점수 분포
+
+    {"distribution": {총점: 비율}, "min", "max", "mean", "segments1", "segments2",
+     "totals1"/"totals2": 상대가 고정일 때 분마다의 총점 배열, "crossings1"/"crossings2"}
+    각 crossing에는 상대가 고정일 때 경계 전후 총점(score_before/score_after)이 붙는다.
+    """
+    slots1, counts1 = np.unique(person1["slots"], return_counts=True)
+    slots2, counts2 = np.unique(person2["slots"], return_counts=True)
+    totals = TABLE[slots1[:, None], slots2[None, :], 8].astype(np.int64)
+    weights = counts1[:, None] * counts2[None, :]
+    weights = weights / weights.sum()
+
+    distribution = {}
+    for total, weight in zip(totals.ravel().tolist(), weights.ravel().tolist()):
+        distribution[total] = distribution.get(total, 0.0) + weight
+    result = {
+        "distribution": dict(sorted(distribution.items())),
+        "min": int(totals.min()),
+        "max": int(totals.max()),
+        "mean": float((totals * weights).sum()),
+    }
+
+    for n, person, partner in ((1, person1, person2), (2, person2, person1)):
+        result[f"segments{n}"] = _segments(person)
+        crossings = [dict(c) for c in person["crossings"]]
+        if len(partner["slots"]) == 1:
+            other = int(partner["slots"][0])
+            rows = TABLE[:, other, 8] if n == 1 else TABLE[other, :, 8]
+            result[f"totals{n}"] = rows[person["slots"]]
+            for c in crossings:
+                if "slot_before" in c:
+                    c["score_before"] = int(rows[c["slot_before"]])
+                    c["score_after"] = int(rows[c["slot_after"]])
+        result[f"crossings{n}"] = crossings
+    return result
+
+
+def _segments(person):
+    """같은 파다 슬롯이 이어지는 구간 목록 [(시작 분, 끝 분, 슬롯)]"""
+    minutes = person["minutes"]
+    if minutes is None:
+        return []
+    slots = person["slots"]
+    edges = [0] + (np.flatnonzero(slots[1:] != slots[:-1]) + 1).tolist() + [len(slots)]
+    step = minutes[1] - minutes[0] if len(minutes) > 1 else 1
+    return [(float(minutes[a]), float(minutes[b - 1] + step), int(slots[a])) for a, b in zip(edges, edges[1:])]
@@ -0,0 +1,94 @@
+import threading
+
+import metrics
+from caching import LRUCache
+
+# 좌표 → 타임존 조회 결과 캐시 (소수점 4자리 ≈ 11m 단위로 양자화)
+_QUANT = 4
+_cache = LRUCache(maxsize=8192)
+
+stats = {"hits": 0, "misses": 0}
+
+
+@metrics.register_collector
+def _collect():
+    return [("vedic_cache_requests_total", {"cache": "timezone", "result": k}, v) for k, v in stats.items()]
+
+
+_finder = None
+_finder_lock = threading.Lock()
+
+
+def get_finder():
+    """프로세스 공용 TimezoneFinder (폴리곤 데이터는 최초 사용 시 한 번만 로드)"""
+    global _finder
+    if _finder is None:
+        with _finder_lock:
+            if _finder is None:
+                with metrics.stage("timezonefinder_load", "TimezoneFinder 로드"):
+                    from timezonefinder import TimezoneFinder
+                    _finder = TimezoneFinder()
+    return _finder
+
+
+def _key(lat, lon):
+    return (round(float(lat), _QUANT), round(float(lon), _QUANT))
+
+
+def _lookup(finder, key):
+    try:
+        return finder.timezone_at(lat=key[0], lng=key[1]) or "UTC"
+    except Exception as e:
+        metrics.error("timezone", e)
+        return "UTC"
+
+
+def get_timezone(lat, lon):
+    """좌표의 IANA 타임존 이름, 찾지 못하면 "UTC" """
+    try:
+        key = _key(lat, lon)
+    except (TypeError, ValueError) as e:
+        metrics.error("timezone", e)
+        return "UTC"
+    tz = _cache.get(key)
+    if tz is None:
+        stats["misses"] += 1
+        finder = get_finder()
+        with _finder_lock:
+            tz = _lookup(finder, key)
+        _cache.set(key, tz)
+    else:
+        stats["hits"] += 1
+    return tz
+
+
+def get_timezones(coords):
+    """(위도, 경도) 목록을 한 번에 조회 - 중복 좌표는 한 번만 계산한다"""
+    keys = [_key(lat, lon) for lat, lon in coords]
+    resolved = {}
+    missing = []
+    for key in keys:
+        if key in resolved:
+            continue
+        tz = _cache.get(key)
+        if tz is None:
+            missing.append(key)
+            resolved[key] = None
+        else:
+            resolved[key] = tz
+    stats["hits"] += len(keys) - len(missing)
+    stats["misses"] += len(missing)
+    if missing:
+        finder = get_finder()
+        with _finder_lock:
+            for key in missing:
+                resolved[key] = _lookup(finder, key)
+        for key in missing:
+            _cache.set(key, resolved[key])
+    return [resolved[key] for key in keys]
+
+
+def clear_cache():
+    _cache.clear()
+    for k in stats:
+        stats[k] = 0
@@ -1,182 +1,19 @@
 import streamlit as st
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, date, time
-from openai import OpenAI
-from geopy.geocoders import Nominatim
-from timezonefinder import TimezoneFinder
-import pytz
-from kerykeion import AstrologicalSubject
-import re
-
-# 낙샤트라 정보 (한글/영문)
-NAKSHATRAS = [
-    "아쉬위니", "바라니", "크리티카", "로히니", "므리가시라", "아르드라",
-    "푸나르바수", "푸시야", "아슬레샤", "마가", "푸르바 팔구니", "우타라 팔구니",
-    "하스타", "치트라", "스와티", "비샤카", "아누라다", "제쉬타",
-    "물라", "푸르바샤다", "우타라샤다", "스라바나", "다니쉬타", "샤타비샤",
-    "푸르바 바드라파다", "우타라 바드라파다", "레바티"
-]
-
-# 라시 한글 매핑
-RASHI_KO = {
-    "Ari": "메샤 (양자리)", "Tau": "브리샤바 (황소자리)", "Gem": "미투나 (쌍둥이자리)",
-    "Can": "카르카 (게자리)", "Leo": "심하 (사자자리)", "Vir": "칸야 (처녀자리)",
-    "Lib": "툴라 (천칭자리)", "Sco": "브리쉬치카 (전갈자리)", "Sag": "다누 (사수자리)",
-    "Cap": "마카라 (염소자리)", "Aqu": "쿰바 (물병자리)", "Pis": "미나 (물고기자리)"
-}
-
-def get_location_coordinates(city_name):
-    try:
-        geolocator = Nominatim(user_agent="vedic_astrology_app", timeout=10)
-        location = geolocator.geocode(city_name)
-        if location:
-            return (location.latitude, location.longitude, location.address)
-        if re.search('[가-힣]', city_name):
-            location = geolocator.geocode(f"{city_name}, 대한민국", language="ko")
-            if location:
-                return (location.latitude, location.longitude, location.address)
-            location = geolocator.geocode(f"{city_name}, South Korea")
-            if location:
-                return (location.latitude, location.longitude, location.address)
-        return (None, None, None)
-    except:
-        return None, None, None
-
-def get_timezone(lat, lon):
-    try:
-        return TimezoneFinder().timezone_at(lat=lat, lng=lon) or "UTC"
-    except:
-        return "UTC"
-
-def get_nakshatra(moon_lon):
-    """달의 경도로 낙샤트라 계산"""
-    index = int(moon_lon / 13.333333) % 27
-    pada = int((moon_lon % 13.333333) / 3.333333) + 1
-    return f"{NAKSHATRAS[index]} (파다 {pada})"
-
-def calculate_chart(name, year, month, day, hour, minute, lat, lon, tz_str):
-    """Kerykeion으로 차트 계산"""
-    try:
-        subject = AstrologicalSubject(
-            name, year, month, day, hour, minute,
-            lat=lat, lng=lon, tz_str=tz_str,
-            zodiac_type="Sidereal", sidereal_mode="LAHIRI"
-        )
-        
-        # 안전한 속성 접근 헬퍼 함수
-        def get_lon(obj):
-            if obj is None:
-                return 0
-            # 다양한 속성명 시도
-            for attr in ['abs_pos', 'position', 'lon', 'longitude']:
-                if hasattr(obj, attr):
-                    val = getattr(obj, attr)
-                    if val is not None:
-                        return val
-            return 0
-        
-        def get_sign(obj):
-            if obj is None:
-                return "Ari"
-            if hasattr(obj, 'sign') and obj.sign:
-                return obj.sign
-            return "Ari"
-        
-        # 행성 정보 추출
-        moon_lon = get_lon(subject.moon)
-        sun_lon = get_lon(subject.sun)
-        rahu_lon = get_lon(subject.mean_node) if hasattr(subject, 'mean_node') else get_lon(subject.true_node) if hasattr(subject, 'true_node') else 0
-        
-        # Ketu는 Rahu의 정반대 (180도)
-        ketu_lon = (rahu_lon + 180) % 360
-        rahu_sign = get_sign(subject.mean_node) if hasattr(subject, 'mean_node') else get_sign(subject.true_node) if hasattr(subject, 'true_node') else "Ari"
-        
-        # Ketu 별자리 계산
-        sign_order = ["Ari", "Tau", "Gem", "Can", "Leo", "Vir", "Lib", "Sco", "Sag", "Cap", "Aqu", "Pis"]
-        rahu_idx = sign_order.index(rahu_sign) if rahu_sign in sign_order else 0
-        ketu_sign = sign_order[(rahu_idx + 6) % 12]
-        
-        chart_data = {
-            "name": name,
-            "ascendant": RASHI_KO.get(get_sign(subject.first_house), get_sign(subject.first_house)),
-            "moon_sign": RASHI_KO.get(get_sign(subject.moon), get_sign(subject.moon)),
-            "moon_lon": moon_lon,
-            "nakshatra": get_nakshatra(moon_lon),
-            "sun_sign": RASHI_KO.get(get_sign(subject.sun), get_sign(subject.sun)),
-            "rahu": RASHI_KO.get(rahu_sign, rahu_sign),
-            "rahu_lon": rahu_lon,
-            "ketu": RASHI_KO.get(ketu_sign, ketu_sign),
-            "ketu_lon": ketu_lon,
-            "planets": {
-                "태양": {"sign": RASHI_KO.get(get_sign(subject.sun), ""), "lon": get_lon(subject.sun)},
-                "달": {"sign": RASHI_KO.get(get_sign(subject.moon), ""), "lon": get_lon(subject.moon)},
-                "수성": {"sign": RASHI_KO.get(get_sign(subject.mercury), ""), "lon": get_lon(subject.mercury)},
-                "금성": {"sign": RASHI_KO.get(get_sign(subject.venus), ""), "lon": get_lon(subject.venus)},
-                "화성": {"sign": RASHI_KO.get(get_sign(subject.mars), ""), "lon": get_lon(subject.mars)},
-                "목성": {"sign": RASHI_KO.get(get_sign(subject.jupiter), ""), "lon": get_lon(subject.jupiter)},
-                "토성": {"sign": RASHI_KO.get(get_sign(subject.saturn), ""), "lon": get_lon(subject.saturn)},
-                "라후": {"sign": RASHI_KO.get(rahu_sign, ""), "lon": rahu_lon},
-                "케투": {"sign": RASHI_KO.get(ketu_sign, ""), "lon": ketu_lon},
-            }
-        }
-        return chart_data
-    except Exception as e:
-        st.error(f"차트 계산 오류: {e}")
-        import traceback
-        st.error(traceback.format_exc())
-        return None
-
-def calculate_ashta_kuta(chart1, chart2):
-    """아쉬타쿠타 점수 계산 (기본 알고리즘)"""
-    scores = {}
-    
-    # 1. 바르나 쿠타 (최대 1점 → 3점으로 환산)
-    varna_order = ["brahmin", "kshatriya", "vaishya", "shudra"]
-    sign_varna = {
-        "Can": 0, "Sco": 0, "Pis": 0,  # Brahmin
-        "Ari": 1, "Leo": 1, "Sag": 1,  # Kshatriya
-        "Tau": 2, "Vir": 2, "Cap": 2,  # Vaishya
-        "Gem": 3, "Lib": 3, "Aqu": 3   # Shudra
-    }
-    # 간단한 점수 부여
-    scores["바르나"] = 3  # 기본 점수
-    
-    # 2. 바쉬야 쿠타 (최대 2점 → 6점)
-    scores["바쉬야"] = 4
-    
-    # 3. 타라 쿠타 (최대 3점 → 8점)
-    nakshatra1_idx = int(chart1["moon_lon"] / 13.333333) % 27
-    nakshatra2_idx = int(chart2["moon_lon"] / 13.333333) % 27
-    tara_diff = abs(nakshatra1_idx - nakshatra2_idx) % 9
-    if tara_diff in [1, 2, 4, 6, 8]:
-        scores["타라"] = 8
-    else:
-        scores["타라"] = 4
-    
-    # 4. 요니 쿠타 (최대 4점 → 11점)
-    scores["요니"] = 8
-    
-    # 5. 그라하 마이트리 (최대 5점 → 14점)
-    if chart1["moon_sign"] == chart2["moon_sign"]:
-        scores["그라하 마이트리"] = 14
-    else:
-        scores["그라하 마이트리"] = 10
-    
-    # 6. 가나 쿠타 (최대 6점 → 17점)
-    scores["가나"] = 12
-    
-    # 7. 바쿠트 쿠타 (최대 7점 → 19점)
-    scores["바쿠트"] = 14
-    
-    # 8. 나디 쿠타 (최대 8점 → 22점)
-    pada1 = int((chart1["moon_lon"] % 13.333333) / 3.333333) % 3
-    pada2 = int((chart2["moon_lon"] % 13.333333) / 3.333333) % 3
-    if pada1 != pada2:
-        scores["나디"] = 22
-    else:
-        scores["나디"] = 0
-    
-    total = sum(scores.values())
-    return scores, total
+from time import perf_counter
+import os
+import interpretation_cache
+import metrics
+import warmup
+from vedic_core import RASHI_KO, calculate_ashta_kuta, parse_birth_time
+from broker import BusyError
+from pipeline import LocationNotFound, StageTimer, compute_person_chart, sweep_person_time
+
+# 출생 시간을 모를 때 살펴볼 범위 (입력 시각 기준 ±분, None은 하루 전체)
+SWEEP_WINDOWS = {"하루 전체": None, "입력 시각 ±3시간": 180, "입력 시각 ±1시간": 60}
+# 사이드바에 현재 요청의 단계 워터폴 표시 (개발용)
+DEV_PANEL = os.environ.get("VEDIC_DEV_PANEL", "0") == "1"
 
 def create_kundli_chart(chart_data, name):
     """South Indian 스타일 Kundli 차트 생성"""
@@ -253,69 +90,109 @@ def create_kundli_chart(chart_data, name):
     '''
     return html
 
-def analyze_with_openai(chart1, chart2, scores, total, name1, name2):
-    """계산된 데이터로 LLM이 해석만 제공"""
-    system = """You are a master of Vedic Astrology (Jyotish) with 30 years of experience.
-You will receive CALCULATED astrological data and scores. DO NOT recalculate them.
-Your job is to provide insightful, philosophical COMMENTARY on the provided data.
-
-Your personality:
-- Be sophisticated, mysterious, and BRUTALLY honest
-- Speak like a proud, direct astrologer who has seen the cosmos unfold
-- Deliver philosophical insults with elegance when the stars warrant it
-- If compatibility is low (below 50), use "해소해야 할 악연" (karmic debt to resolve)
-- If compatibility is high (above 70), use "우주적 보상" (cosmic reward)
-
-Format your ENTIRE response in Korean (한국어).
-DO NOT change or recalculate the scores - they are FIXED."""
-
-    user = f"""다음은 정확히 계산된 베딕 점성술 데이터입니다:
-
-## 【{name1}의 차트】
-- 라그나 (상승궁): {chart1['ascendant']}
-- 달 별자리 (라시): {chart1['moon_sign']}
-- 낙샤트라: {chart1['nakshatra']}
-- 태양 별자리: {chart1['sun_sign']}
-- 라후 (북쪽 달의 교점): {chart1['rahu']}
-- 케투 (남쪽 달의 교점, 라후의 180도 반대편): {chart1['ketu']}
-
-## 【{name2}의 차트】
-- 라그나 (상승궁): {chart2['ascendant']}
-- 달 별자리 (라시): {chart2['moon_sign']}
-- 낙샤트라: {chart2['nakshatra']}
-- 태양 별자리: {chart2['sun_sign']}
-- 라후 (북쪽 달의 교점): {chart2['rahu']}
-- 케투 (남쪽 달의 교점, 라후의 180도 반대편): {chart2['ketu']}
-
-## 【아쉬타쿠타 점수 (이미 계산됨 - 변경 불가)】
-- 바르나 쿠타: {scores['바르나']}/3점
-- 바쉬야 쿠타: {scores['바쉬야']}/6점
-- 타라 쿠타: {scores['타라']}/8점
-- 요니 쿠타: {scores['요니']}/11점
-- 그라하 마이트리: {scores['그라하 마이트리']}/14점
-- 가나 쿠타: {scores['가나']}/17점
-- 바쿠트 쿠타: {scores['바쿠트']}/19점
-- 나디 쿠타: {scores['나디']}/22점
-- **총점: {total}/100점**
-
-위 데이터를 바탕으로:
-1. 각 쿠타 점수에 대한 해석
-2. 🔮 Karmic Connection (업보적 연결): 라후/케투 기반 전생 관계 추측
-3. 종합 궁합 해석 (철학적 독설 포함)
-
-점수가 {total}점이므로 {"'해소해야 할 악연'" if total < 50 else "'우주적 보상'" if total > 70 else "'보통의 인연'"}으로 해석해주세요."""
-
-    try:
-        client = OpenAI(api_key=st.secrets["OPENAI_API_KEY"])
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[{"role": "system", "content": system}, {"role": "user", "content": user}],
-            temperature=0.7,
-            max_tokens=2500
+def stream_analysis(chart1, chart2, scores, total, name1, name2, timings, fresh=False):
+    """계산된 데이터로 LLM 해석을 토큰 단위로 스트리밍 (같은 차트 서명은 저장된 해석 재사용)"""
+    return interpretation_cache.stream(chart1, chart2, scores, total, name1, name2,
+                                       api_key=st.secrets["OPENAI_API_KEY"], timings=timings, fresh=fresh)
+
+def render_stream(chunks, placeholder, interval=0.05):
+    """조각을 이어 붙이며 placeholder를 갱신 (너무 잦은 갱신은 interval로 묶는다)"""
+    text = ""
+    last = 0.0
+    for chunk in chunks:
+        text += chunk
+        now = perf_counter()
+        if now - last >= interval:
+            placeholder.markdown(text + " ▌")
+            last = now
+    placeholder.markdown(text)
+    return text
+
+def chart_summary(chart, name, icon):
+    """차트 요약 마크다운"""
+    return f"""
+**{icon} {name}**
+- 🏠 라그나: {chart['ascendant']}
+- 🌙 라시: {chart['moon_sign']}
+- ⭐ 낙샤트라: {chart['nakshatra']}
+- ☀️ 태양: {chart['sun_sign']}
+- 🐉 라후: {chart['rahu']}
+- 🔮 케투: {chart['ketu']}
+                """
+
+def score_table(scores):
+    """쿠타별 획득 점수/만점 마크다운 표"""
+    from kuta_table import KUTA_MAX
+    rows = ["| 쿠타 | 획득 점수 | 만점 |", "|---|---|---|"]
+    rows += [f"| {name} | {value}점 | {maximum}점 |" for (name, value), maximum in zip(scores.items(), KUTA_MAX)]
+    return "\n".join(rows)
+
+def sweep_range(hour, minute, window, has_time):
+    """스윕할 (시작 분, 끝 분) - 시각을 입력하지 않았으면 하루 전체"""
+    if window is None or not has_time:
+        return 0, 1440
+    center = hour * 60 + minute
+    return max(0, center - window), min(1440, center + window + 1)
+
+def show_time_sweep(result, names, total, ranges):
+    """출생 시간 불확실성 분석 - 점수 분포와 경계 통과 시각"""
+    import sweep
+    st.markdown("---")
+    st.markdown("## 🕐 출생 시간 불확실성 분석")
+    scope = " · ".join(f"{name}: {sweep.format_minute(a)[:5]}~{sweep.format_minute(b)[:5]}"
+                       for name, (a, b) in zip(names, ranges) if (a, b) != (None, None))
+    st.caption(f"가능한 출생 시각을 1분 간격으로 모두 계산했습니다 ({scope})")
+    c1, c2, c3 = st.columns(3)
+    c1.metric("최저 총점", f"{result['min']}점")
+    c2.metric("평균 총점", f"{result['mean']:.1f}점")
+    c3.metric("최고 총점", f"{result['max']}점")
+    share = result["distribution"].get(total, 0.0)
+    st.markdown(f"입력한 시각의 총점 **{total}점**은 가능한 시각 조합의 **{share:.0%}**에서 나옵니다.")
+    rows = ["| 총점 | 비율 | |", "|---|---|---|"]
+    rows += [f"| {t}점 | {w:.1%} | {'█' * max(1, round(w * 30))} |" for t, w in result["distribution"].items()]
+    st.markdown("\n".join(rows))
+
+    for n, name in enumerate(names, 1):
+        crossings = result[f"crossings{n}"]
+        if ranges[n - 1] == (None, None):
+            continue
+        st.markdown(f"#### {name}님의 경계 통과 시각")
+        if not crossings:
+            st.markdown("이 범위 안에서는 달의 파다와 라그나가 바뀌지 않습니다.")
+            continue
+        rows = ["| 시각 | 바뀌는 것 | 이전 → 이후 | 총점 |", "|---|---|---|---|"]
+        for c in crossings:
+            kind = "라그나" if c["kind"] == "상승궁" else f"달 {c['kind']}"
+            change = f"{c['score_before']} → {c['score_after']}점" if "score_before" in c else "-"
+            rows.append(f"| {c['time']} | {kind} | {c['from']} → {c['to']} | {change} |")
+        st.markdown("\n".join(rows))
+
+def show_stage_timings(timer):
+    """단계별 소요 시간 (병렬 실행으로 줄어든 시간 확인용)"""
+    records, elapsed, busy = timer.report()
+    with st.expander("⏱️ 단계별 소요 시간", expanded=False):
+        lines = [f"- {name}: {duration * 1000:.0f}ms (시작 +{offset * 1000:.0f}ms)"
+                 for name, offset, duration in records]
+        lines.append(f"\n**전체 {elapsed * 1000:.0f}ms** / 단계 합계 {busy * 1000:.0f}ms")
+        st.markdown("\n".join(lines))
+
+def show_waterfall(timer):
+    """개발자 패널 - 단계(굵게)와 하위 구간을 요청 시작 기준 막대로"""
+    rows = timer.waterfall()
+    span = max([timer.elapsed()] + [offset + duration for _, offset, duration, _ in rows]) or 1
+    bars = []
+    for name, offset, duration, detail in rows:
+        left, width = offset / span * 100, max(duration / span * 100, 0.5)
+        color = "#8ab4f8" if detail else "#ffd700"
+        label = f"{'└ ' if detail else ''}{name} {duration * 1000:.0f}ms"
+        bars.append(
+            f'<div style="font-size:11px;color:#fff;{"" if detail else "font-weight:bold;"}">{label}</div>'
+            f'<div style="position:relative;height:6px;margin-bottom:4px;background:#333;">'
+            f'<div style="position:absolute;left:{left:.1f}%;width:{width:.1f}%;height:6px;background:{color};"></div></div>'
         )
-        return response.choices[0].message.content
-    except Exception as e:
-        return f"❌ API 오류: {e}"
+    with st.sidebar:
+        st.markdown(f"#### 🛠️ 요청 워터폴 ({span * 1000:.0f}ms)")
+        st.markdown("".join(bars), unsafe_allow_html=True)
 
 def apply_custom_css():
     st.markdown("""<style>
@@ -360,109 +237,127 @@ def main():
         name1 = st.text_input("이름", key="n1", placeholder="이름")
         date1 = st.date_input("생년월일", key="d1", value=date(1990,1,1), min_value=date(1900,1,1), max_value=date(2026,12,31))
         time1 = st.text_input("출생 시간", key="t1", placeholder="예: 14:30")
+        unsure1 = st.checkbox("🕐 출생 시간을 정확히 모름", key="u1")
         city1 = st.text_input("출생 도시", key="c1", placeholder="예: Seoul 또는 서울")
     with col2:
         st.markdown("### ⭐ 두 번째 사람")
         name2 = st.text_input("이름", key="n2", placeholder="이름")
         date2 = st.date_input("생년월일", key="d2", value=date(1990,1,1), min_value=date(1900,1,1), max_value=date(2026,12,31))
         time2 = st.text_input("출생 시간", key="t2", placeholder="예: 09:15")
+        unsure2 = st.checkbox("🕐 출생 시간을 정확히 모름", key="u2")
         city2 = st.text_input("출생 도시", key="c2", placeholder="예: Busan 또는 부산")
 
     st.markdown("---")
     _, btn_col, _ = st.columns([1,2,1])
     with btn_col:
+        fresh = st.checkbox("🔄 저장된 해석 대신 새로 해석 받기", key="fresh")
+        window = SWEEP_WINDOWS[st.selectbox("⏳ 출생 시간을 모를 때 살펴볼 범위", list(SWEEP_WINDOWS), key="sweep")]
         if st.button("🔮 운명의 궁합 분석하기 🔮", use_container_width=True):
-            if not all([name1, name2, city1, city2, time1, time2]):
+            metrics.inc("vedic_requests_total")
+            if not all([name1, name2, city1, city2, time1 or unsure1, time2 or unsure2]):
                 st.error("❌ 모든 필드를 입력해주세요!")
                 return
 
-            # 시간 파싱
+            # 시간 파싱 (시간을 모르고 비워 두면 정오 차트를 기준으로 보여준다)
             try:
-                t1_parts = time1.replace(":", " ").split()
-                hour1, min1 = int(t1_parts[0]), int(t1_parts[1]) if len(t1_parts) > 1 else 0
-                t2_parts = time2.replace(":", " ").split()
-                hour2, min2 = int(t2_parts[0]), int(t2_parts[1]) if len(t2_parts) > 1 else 0
-            except:
+                hour1, min1 = parse_birth_time(time1) if time1 else (12, 0)
+                hour2, min2 = parse_birth_time(time2) if time2 else (12, 0)
+            except ValueError as e:
+                metrics.error("parse_time", e)
                 st.error("❌ 시간 형식을 확인해주세요 (예: 14:30)")
                 return
 
-            with st.spinner("🌌 출생 장소 확인 중..."):
-                lat1, lon1, addr1 = get_location_coordinates(city1)
-                lat2, lon2, addr2 = get_location_coordinates(city2)
-                if not lat1:
-                    st.error(f"❌ '{city1}' 위치를 찾을 수 없습니다.")
-                    return
-                if not lat2:
-                    st.error(f"❌ '{city2}' 위치를 찾을 수 없습니다.")
-                    return
-                tz1 = get_timezone(lat1, lon1)
-                tz2 = get_timezone(lat2, lon2)
-
-            with st.spinner("🔮 Kerykeion 엔진으로 차트 계산 중..."):
-                chart1 = calculate_chart(name1, date1.year, date1.month, date1.day, hour1, min1, lat1, lon1, tz1)
-                chart2 = calculate_chart(name2, date2.year, date2.month, date2.day, hour2, min2, lat2, lon2, tz2)
-                if not chart1 or not chart2:
-                    return
-
-            # 아쉬타쿠타 점수 계산
-            scores, total = calculate_ashta_kuta(chart1, chart2)
-
-            # 결과 표시
+            # 두 사람의 지오코딩 → 타임존 → 차트 체인을 동시에 실행하고,
+            # 먼저 끝난 사람의 차트부터 바로 그린다
+            timer = StageTimer()
             st.markdown("## 🌠 베딕 차트 분석 결과")
             c1, c2 = st.columns(2)
-            with c1:
-                st.markdown(f"""
-**🌙 {name1}**
-- 🏠 라그나: {chart1['ascendant']}
-- 🌙 라시: {chart1['moon_sign']}
-- ⭐ 낙샤트라: {chart1['nakshatra']}
-- ☀️ 태양: {chart1['sun_sign']}
-- 🐉 라후: {chart1['rahu']}
-- 🔮 케투: {chart1['ketu']}
-                """)
-            with c2:
-                st.markdown(f"""
-**⭐ {name2}**
-- 🏠 라그나: {chart2['ascendant']}
-- 🌙 라시: {chart2['moon_sign']}
-- ⭐ 낙샤트라: {chart2['nakshatra']}
-- ☀️ 태양: {chart2['sun_sign']}
-- 🐉 라후: {chart2['rahu']}
-- 🔮 케투: {chart2['ketu']}
-                """)
-
-            # Kundli 차트 표시
+            summary_slots = [c1.empty(), c2.empty()]
             st.markdown("### 🔮 Kundli 차트 (South Indian Style)")
             k1, k2 = st.columns(2)
-            with k1:
-                st.markdown(create_kundli_chart(chart1, name1), unsafe_allow_html=True)
-            with k2:
-                st.markdown(create_kundli_chart(chart2, name2), unsafe_allow_html=True)
+            kundli_slots = [k1.empty(), k2.empty()]
+            people = [(name1, date1, hour1, min1, city1, "🌙"), (name2, date2, hour2, min2, city2, "⭐")]
+            charts = [None, None]
+
+            with st.spinner("🔮 출생 장소 확인 및 차트 계산 중..."):
+                with ThreadPoolExecutor(max_workers=2) as executor:
+                    futures = {
+                        executor.submit(compute_person_chart, i + 1, name, birth, hour, minute, city, timer): i
+                        for i, (name, birth, hour, minute, city, _) in enumerate(people)
+                    }
+                    for future in as_completed(futures):
+                        i = futures[future]
+                        name, icon = people[i][0], people[i][5]
+                        try:
+                            charts[i] = future.result()
+                        except LocationNotFound as e:
+                            st.error(f"❌ {e}")
+                            return
+                        except BusyError as e:
+                            # 지오코딩 대기열이 가득 참 - 바로 알려 주고 스레드를 붙잡지 않는다
+                            st.warning(f"⏳ {e}")
+                            return
+                        except Exception as e:
+                            st.error(f"차트 계산 오류: {e}")
+                            import traceback
+                            st.error(traceback.format_exc())
+                            return
+                        summary_slots[i].markdown(chart_summary(charts[i], name, icon))
+                        with timer.stage(f"Kundli 렌더링 {i + 1}", "kundli_html"):
+                            kundli_slots[i].markdown(create_kundli_chart(charts[i], name), unsafe_allow_html=True)
+            chart1, chart2 = charts
+
+            # 아쉬타쿠타 점수 계산
+            with timer.stage("아쉬타쿠타", "ashta_kuta"):
+                scores, total = calculate_ashta_kuta(chart1, chart2)
 
             st.markdown("---")
             st.markdown("## � 아쉬타쿠타 점수 (정밀 계산)")
             
-            # 점수 테이블
-            import pandas as pd
-            score_df = pd.DataFrame({
-                "쿠타": list(scores.keys()),
-                "획득 점수": [f"{v}점" for v in scores.values()],
-                "만점": ["3점", "6점", "8점", "11점", "14점", "17점", "19점", "22점"]
-            })
-            st.dataframe(score_df, hide_index=True, use_container_width=True)
+            # 점수 테이블 (8행이라 pandas 없이 마크다운 표로)
+            st.markdown(score_table(scores))
             
             # 총점 강조
             color = "#00ff00" if total >= 70 else "#ffd700" if total >= 50 else "#ff4444"
             st.markdown(f'<h2 style="text-align:center;color:{color};">💯 총점: {total}/100점</h2>', unsafe_allow_html=True)
 
+            # 출생 시간 불확실성 스윕 - 모르는 사람만 훑고, 아는 사람은 계산된 차트를 그대로 쓴다
+            if unsure1 or unsure2:
+                import sweep
+                ranges = [
+                    sweep_range(hour1, min1, window, bool(time1)) if unsure1 else (None, None),
+                    sweep_range(hour2, min2, window, bool(time2)) if unsure2 else (None, None),
+                ]
+                swept = []
+                for i, (birth, city, chart, (start, end)) in enumerate(zip((date1, date2), (city1, city2), charts, ranges)):
+                    if start is None:
+                        swept.append(sweep.fixed_person(chart))
+                    else:
+                        swept.append(sweep_person_time(i + 1, birth, city, start, end, timer))
+                show_time_sweep(sweep.compatibility_sweep(*swept), (name1, name2), total, ranges)
+
             st.markdown("---")
             st.markdown("## 🔮 AI 점성술사의 해석")
             
-            with st.spinner("✨ 우주의 신비를 해석 중..."):
-                analysis = analyze_with_openai(chart1, chart2, scores, total, name1, name2)
-            
-            st.markdown(analysis)
+            placeholder = st.empty()
+            placeholder.markdown("✨ 우주의 신비를 해석 중...")
+            timings = {}
+            llm_start = perf_counter()
+            render_stream(stream_analysis(chart1, chart2, scores, total, name1, name2, timings, fresh), placeholder)
+            if "ttft" in timings:
+                timer.record("AI 첫 토큰", llm_start, llm_start + timings["ttft"])
+            timer.record("AI 해석", llm_start, perf_counter())
+            source = "저장된 해석" if timings.get("cached") else "새 해석"
+            st.caption(f"⏱️ {source} · 첫 토큰 {timings.get('ttft', 0):.1f}초 · 전체 생성 {timings.get('total', 0):.1f}초")
             st.caption("⚠️ 이 분석은 오락 목적입니다. 실제 관계는 상호 이해와 존중이 기반입니다.")
+            show_stage_timings(timer)
+            if DEV_PANEL:
+                show_waterfall(timer)
+
+    # 첫 화면을 보낸 뒤 첫 클릭에 필요한 무거운 모듈을 백그라운드에서 올린다
+    warmup.start()
+    # VEDIC_METRICS=1 일 때 /metrics 엔드포인트나 지표 파일 기록을 한 번 시작
+    metrics.start_exporters()
 
 if __name__ == "__main__":
     main()
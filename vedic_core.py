@@ -0,0 +1,151 @@
+import os
+
+import chart_cache
+import metrics
+from geocoding import get_location_coordinates
+from timezones import get_timezone
+
+# Streamlit 없이 쓸 수 있는 계산 로직 (앱과 배치 CLI가 공유)
+
+# 차트 계산 백엔드: "fast"(스위스 에페메리스 직접 계산, 기본) 또는 "kerykeion"(비교 기준)
+CHART_BACKEND = os.environ.get("VEDIC_CHART_BACKEND", "fast")
+
+# 낙샤트라 정보 (한글/영문)
+NAKSHATRAS = [
+    "아쉬위니", "바라니", "크리티카", "로히니", "므리가시라", "아르드라",
+    "푸나르바수", "푸시야", "아슬레샤", "마가", "푸르바 팔구니", "우타라 팔구니",
+    "하스타", "치트라", "스와티", "비샤카", "아누라다", "제쉬타",
+    "물라", "푸르바샤다", "우타라샤다", "스라바나", "다니쉬타", "샤타비샤",
+    "푸르바 바드라파다", "우타라 바드라파다", "레바티"
+]
+
+# 라시 한글 매핑
+RASHI_KO = {
+    "Ari": "메샤 (양자리)", "Tau": "브리샤바 (황소자리)", "Gem": "미투나 (쌍둥이자리)",
+    "Can": "카르카 (게자리)", "Leo": "심하 (사자자리)", "Vir": "칸야 (처녀자리)",
+    "Lib": "툴라 (천칭자리)", "Sco": "브리쉬치카 (전갈자리)", "Sag": "다누 (사수자리)",
+    "Cap": "마카라 (염소자리)", "Aqu": "쿰바 (물병자리)", "Pis": "미나 (물고기자리)"
+}
+
+SIGN_ORDER = ["Ari", "Tau", "Gem", "Can", "Leo", "Vir", "Lib", "Sco", "Sag", "Cap", "Aqu", "Pis"]
+PLANETS = ["태양", "달", "수성", "금성", "화성", "목성", "토성"]
+
+# 낙샤트라 27개 × 파다 4개가 황도 360°를 똑같이 나눈다 (라시 하나 = 파다 9개)
+NAKSHATRA_SPAN = 360 / 27
+PADA_SPAN = 360 / 108
+
+def moon_slot(moon_lon):
+    """달의 경도 → 파다 슬롯 (낙샤트라 × 4 + 파다-1) - 낙샤트라 표시와 궁합 점수표가 함께 쓴다
+
+    경도 × 108 / 360 으로 나누어 30° 라시 경계와 360° 가 정확히 슬롯 경계에 놓인다.
+    """
+    return int(moon_lon % 360.0 * 108 / 360.0) % 108
+
+def get_nakshatra(moon_lon):
+    """달의 경도로 낙샤트라 계산"""
+    slot = moon_slot(moon_lon)
+    return f"{NAKSHATRAS[slot // 4]} (파다 {slot % 4 + 1})"
+
+def build_chart_data(name, asc_sign, planets, rahu_lon, rahu_sign):
+    """행성별 (경도, 별자리)로 chart_data 구성 - 두 백엔드가 같은 모양을 돌려주도록 공유"""
+    # Ketu는 Rahu의 정반대 (180도)
+    ketu_lon = (rahu_lon + 180) % 360
+    rahu_idx = SIGN_ORDER.index(rahu_sign) if rahu_sign in SIGN_ORDER else 0
+    ketu_sign = SIGN_ORDER[(rahu_idx + 6) % 12]
+
+    moon_lon, moon_sign = planets["달"]
+    sun_sign = planets["태양"][1]
+    chart_data = {
+        "name": name,
+        "ascendant": RASHI_KO.get(asc_sign, asc_sign),
+        "moon_sign": RASHI_KO.get(moon_sign, moon_sign),
+        "moon_lon": moon_lon,
+        "nakshatra": get_nakshatra(moon_lon),
+        "sun_sign": RASHI_KO.get(sun_sign, sun_sign),
+        "rahu": RASHI_KO.get(rahu_sign, rahu_sign),
+        "rahu_lon": rahu_lon,
+        "ketu": RASHI_KO.get(ketu_sign, ketu_sign),
+        "ketu_lon": ketu_lon,
+        "planets": {
+            **{ko: {"sign": RASHI_KO.get(sign, ""), "lon": lon} for ko, (lon, sign) in planets.items()},
+            "라후": {"sign": RASHI_KO.get(rahu_sign, ""), "lon": rahu_lon},
+            "케투": {"sign": RASHI_KO.get(ketu_sign, ""), "lon": ketu_lon},
+        }
+    }
+    return chart_data
+
+def kerykeion_chart(name, year, month, day, hour, minute, lat, lon, tz_str):
+    """Kerykeion AstrologicalSubject로 차트 계산 (비교 기준 백엔드)"""
+    from kerykeion import AstrologicalSubject
+    subject = AstrologicalSubject(
+        name, year, month, day, hour, minute,
+        lat=lat, lng=lon, tz_str=tz_str,
+        zodiac_type="Sidereal", sidereal_mode="LAHIRI"
+    )
+
+    # 안전한 속성 접근 헬퍼 함수
+    def get_lon(obj):
+        if obj is None:
+            return 0
+        # 다양한 속성명 시도
+        for attr in ['abs_pos', 'position', 'lon', 'longitude']:
+            if hasattr(obj, attr):
+                val = getattr(obj, attr)
+                if val is not None:
+                    return val
+        return 0
+
+    def get_sign(obj):
+        if obj is None:
+            return "Ari"
+        if hasattr(obj, 'sign') and obj.sign:
+            return obj.sign
+        return "Ari"
+
+    # kerykeion v5에서는 mean_node가 기본 계산 대상이 아니어서 None이므로 true_node를 쓴다
+    node = getattr(subject, 'mean_node', None) or getattr(subject, 'true_node', None)
+    bodies = [("태양", subject.sun), ("달", subject.moon), ("수성", subject.mercury),
+              ("금성", subject.venus), ("화성", subject.mars), ("목성", subject.jupiter),
+              ("토성", subject.saturn)]
+    planets = {ko: (get_lon(obj), get_sign(obj)) for ko, obj in bodies}
+    return build_chart_data(name, get_sign(subject.first_house), planets, get_lon(node), get_sign(node))
+
+def chart_from_positions(name, positions):
+    """ephemeris.positions 결과(천체별 경도) → chart_data"""
+    from ephemeris import sign_of
+    planets = {ko: (positions[ko], sign_of(positions[ko])) for ko in PLANETS}
+    rahu_lon = positions["라후"]
+    return build_chart_data(name, sign_of(positions["상승궁"]), planets, rahu_lon, sign_of(rahu_lon))
+
+def fast_chart(name, year, month, day, hour, minute, lat, lon, tz_str):
+    """스위스 에페메리스로 필요한 천체와 상승궁만 직접 계산"""
+    import ephemeris
+    jd = ephemeris.julian_day(year, month, day, hour, minute, tz_str)
+    return chart_from_positions(name, ephemeris.positions(jd, lat, lon))
+
+_BACKENDS = {"fast": fast_chart, "kerykeion": kerykeion_chart}
+
+def calculate_chart(name, year, month, day, hour, minute, lat, lon, tz_str, backend=None):
+    """차트 계산 (같은 출생 시각/장소는 캐시에서 재사용, 실패 시 예외)"""
+    backend = backend or CHART_BACKEND
+    cache_key = chart_cache.chart_key(year, month, day, hour, minute, lat, lon, tz_str, backend=backend)
+    cached = chart_cache.get(cache_key, name)
+    if cached is not None:
+        return cached
+
+    with metrics.stage(f"chart_{backend}"):
+        chart_data = _BACKENDS[backend](name, year, month, day, hour, minute, lat, lon, tz_str)
+    chart_cache.put(cache_key, chart_data)
+    return chart_data
+
+def calculate_ashta_kuta(chart1, chart2):
+    """아쉬타쿠타 점수 계산 (미리 계산된 파다 조합 점수표 조회)"""
+    import kuta_table  # numpy와 점수표 생성은 첫 점수 계산 때
+    return kuta_table.lookup(chart1["moon_lon"], chart2["moon_lon"])
+
+def parse_birth_time(text):
+    """출생 시간 문자열("14:30", "14 30", "14") → (시, 분), 형식이 틀리면 ValueError"""
+    parts = text.replace(":", " ").split()
+    if not parts:
+        raise ValueError(f"출생 시간이 비어 있습니다: {text!r}")
+    return int(parts[0]), int(parts[1]) if len(parts) > 1 else 0
@@ -0,0 +1,70 @@
+import importlib
+import os
+import threading
+import time
+
+# 무거운 의존성 백그라운드 예열 - 앱은 첫 화면을 그릴 때 Streamlit과 가벼운 모듈만 임포트하고,
+# 첫 화면을 보낸 뒤 이 스레드가 첫 클릭에 필요한 모듈(openai, numpy 점수표, 스위스 에페메리스,
+# TimezoneFinder 데이터, geopy, pytz)을 미리 올린다. 예열 중에 클릭이 오면 그쪽 스레드가
+# 같은 임포트를 기다릴 뿐 결과는 같다. VEDIC_WARMUP=0 이면 끈다.
+ENABLED = os.environ.get("VEDIC_WARMUP", "1") != "0"
+
+
+def _import(name):
+    return lambda: importlib.import_module(name)
+
+
+def _timezone_finder():
+    from timezones import get_finder
+    get_finder()
+
+
+def _geocoder():
+    from geocoding import get_geocoder
+    get_geocoder()
+
+
+# (이름, 작업) - 첫 클릭 경로에서 먼저 쓰이는 순서
+TASKS = [
+    ("pytz", _import("pytz")),
+    ("geopy", _geocoder),
+    ("timezonefinder", _timezone_finder),
+    ("ephemeris", _import("ephemeris")),
+    ("kuta_table", _import("kuta_table")),
+    ("openai", _import("openai")),
+]
+
+timings = {}
+errors = {}
+_thread = None
+_lock = threading.Lock()
+
+
+def _run():
+    for name, task in TASKS:
+        start = time.perf_counter()
+        try:
+            task()
+        except Exception as e:
+            errors[name] = f"{type(e).__name__}: {e}"
+        timings[name] = time.perf_counter() - start
+
+
+def start():
+    """프로세스당 한 번 예열 스레드 시작 (꺼져 있거나 이미 시작했으면 아무것도 안 함)"""
+    global _thread
+    if not ENABLED or _thread is not None:
+        return _thread
+    with _lock:
+        if _thread is None:
+            _thread = threading.Thread(target=_run, name="vedic-warmup", daemon=True)
+            _thread.start()
+    return _thread
+
+
+def wait(timeout=None):
+    """예열이 끝날 때까지 대기 (측정/테스트용), 끝났으면 True"""
+    if _thread is None:
+        return not ENABLED
+    _thread.join(timeout)
+    return not _thread.is_alive()